@@ -1,190 +1,249 @@
 from flask import Flask, render_template, request, redirect, url_for, session, jsonify
 import json
 import os
+import threading
+import uuid
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+
+from career_journal import CareerJournal, new_career_id
+from data_pack import DataPack
+from fixture_index import FixtureIndexCache
+
+from league_table import LeagueTable, new_table_row
+from lineup_optimizer import LineupCache, best_lineup, optimal_lineup
+from match_engine import EVENT_GOAL, new_match_data, play_minute, simulate_match
+from match_stream import MINUTE_INTERVAL, FrameRecorder, is_paused, resume_minute, stream_frames
+from metrics import Metrics, init_app as init_metrics
+from player_registry import PlayerRegistry
+from rng_streams import derive_seed, new_career_seed, numpy_stream, stream
+from save_catalog import SaveCatalog
+from save_format import EXTENSION as SAVE_EXTENSION, SaveFormatError, read_save, write_save
+from sampling import WeightedSampler
+from scheduler import round_robin
+from season_stats import new_season_stats, record_goal, record_result, get_top_scorers
+from session_store import create_session_interface
+from team_strength import DEFAULT_FORMATION, TeamStrengthCache
 
 app = Flask(__name__)
 app.secret_key = 'football_manager_secret_key_2024'
 
+# Где хранить состояние игры: 'cookie' (подписанная cookie Flask), 'memory',
+# 'sqlite' или 'file'. На Vercel файловая система недолговечна, поэтому там cookie.
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cookie' if os.environ.get('VERCEL') == '1' else 'sqlite')
+SESSION_STORE_PATH = os.environ.get('SESSION_STORE_PATH')
+
+# Прогноз сезона: число процессов (по умолчанию - все ядра, на Vercel - без пула)
+# и предел симуляций на запрос
+PROJECTION_WORKERS = int(os.environ.get('PROJECTION_WORKERS', '1' if os.environ.get('VERCEL') == '1' else '0')) or None
+MAX_PROJECTION_SEASONS = 100000
+if SESSION_BACKEND != 'cookie':
+    app.session_interface = create_session_interface(
+        SESSION_BACKEND,
+        ttl=app.permanent_session_lifetime.total_seconds(),
+        path=SESSION_STORE_PATH
+    )
+
+# Метрики запросов для Prometheus (/metrics)
+METRICS = init_metrics(app, Metrics())
+# Действия POST /match_action; трансляции /match_stream считаются отдельно (action="stream")
+MATCH_ACTIONS = ('tick', 'simulate', 'start_second_half', 'end_match')
+# Секунд на игровую минуту в трансляции /match_stream (0 - без пауз)
+MATCH_STREAM_INTERVAL = float(os.environ.get('MATCH_STREAM_INTERVAL', MINUTE_INTERVAL))
+
+# Локальные сохранения и их каталог для /load_game
+SAVE_DIR = 'saves'
+SAVE_CATALOG = SaveCatalog(SAVE_DIR, read_save, extensions=('.json', SAVE_EXTENSION))
+# Сжатие новых сохранений: 'gzip', 'lzma' или 'none'
+SAVE_COMPRESSION = os.environ.get('SAVE_COMPRESSION', 'gzip')
+# Журнал карьеры: события дописываются в saves/journal (на Vercel диска нет)
+# (после end_match таблица и место не пишутся - они восстанавливаются из счетов тура)
+JOURNAL = CareerJournal(
+    os.path.join(SAVE_DIR, 'journal'),
+    apply_results=lambda game_data, results: apply_league_results(game_data, [
+        {'home_team': home, 'away_team': away, 'home_score': home_score, 'away_score': away_score}
+        for home, away, home_score, away_score in results
+    ]),
+    derived_keys=('table', 'position')
+) if os.environ.get('CAREER_JOURNAL', '0' if os.environ.get('VERCEL') == '1' else '1') == '1' else None
+SAVES_PER_PAGE = 20
+RECENT_CAREERS = 10  # Сколько последних карьер из журнала показывать на /load_game
+
+# Известные вратари (Только GK)
+GOALKEEPERS = [
+    "Manuel Almunia", "Jens Lehmann", "Scott Carson", "Stuart Taylor", "Maik Taylor", "Colin Doyle",
+    "Petr Cech", "Carlo Cudicini", "Paul Robinson", "Chris Kirkland", "Brad Friedel", "Thomas Sorensen",
+    "Jussi Jaaskelainen", "Ali Al Habsi", "Mark Schwarzer", "Robert Green", "Roy Carroll",
+    "Marton Fulop", "Boaz Myhill", "Luke Steele", "Heurelho Gomes", "Craig Gordon", "David James",
+    "Shay Given", "Steve Harper", "Joe Hart", "Ben Foster", "Wayne Hennessey"
+]
+
+# Известные защитники (Только DEF)
+DEFENDERS = [
+    # Arsenal
+    "Gael Clichy", "Kolo Toure", "William Gallas", "Philippe Senderos", "Bacary Sagna", "Emmanuel Eboue",
+    # Aston Villa
+    "Olof Mellberg", "Martin Laursen", "Zat Knight", "Curtis Davies", "Wilfred Bouma", "Nicky Shorey",
+    # Birmingham
+    "Stephen Kelly", "Liam Ridgewell", "Radhi Jaidi", "Martin Taylor", "Franck Queudrue", "Stuart Parnaby",
+    # Blackburn
+    "Andre Ooijer", "Christopher Samba", "Brett Emerton", "Stephen Warnock", "Ryan Nelsen", "Lucas Neill",
+    # Bolton
+    "Jlloyd Samuel", "Abdoulaye Meite", "Gricel Ndo", "Kevin Nolan", "Ivan Campo", "Abdoulaye Faye",
+    # Chelsea
+    "John Terry", "Paulo Ferreira", "Ashley Cole", "Wayne Bridge", "Juliano Belletti", "Ricardo Carvalho",
+    # Derby
+    "Darren Moore", "Claude Davis", "Dean Leacock", "Andy Todd", "Marc Edworthy", "Tyrone Mears",
+    # Everton
+    "Joseph Yobo", "Alan Stubbs", "David Weir", "Leighton Baines", "Joleon Lescott", "Tony Hibbert",
+    # Fulham
+    "Ian Pearce", "Brede Hangeland", "Paul Konchesky", "Carlos Bocanegra", "Dejan Stefanovic", "Liam Rosenior",
+    # Liverpool
+    "Jamie Carragher", "Daniel Agger", "Alvaro Arbeloa", "John Arne Riise", "Steve Finnan", "Fabio Aurelio",
+    # Man City
+    "Richard Dunne", "Sylvain Distin", "Michael Ball", "Javier Garrido", "Vedran Corluka", "Michael Johnson",
+    # Man Utd
+    "Rio Ferdinand", "Nemanja Vidic", "Patrice Evra", "Gary Neville", "Mikael Silvestre", "Wes Brown",
+    "John O'Shea", "Gerard Pique", "Rafael", "Fabio",
+    # Middlesbrough
+    "David Wheater", "Robert Huth", "Emanuel Pogatetz", "Jonathan Woodgate", "Luke Young", "Andrew Taylor",
+    # Newcastle
+    "Steve Harper", "Titus Bramble", "Emile Heskey", "Matthew Taylor", "Paul Stalteri", "Hayden Foxe",
+    # Portsmouth
+    "Sol Campbell", "Sylvain Distin", "Glen Johnson", "Hermann Hreidarsson", "Noe Pamarot", "Lassana Diarra",
+    # Reading
+    "Ibrahima Sonko", "Michael Duberry", "Nick Shorey", "Graeme Murty", "Liam Rosenior", "James Harper",
+    # Sunderland
+    "Paul McShane", "Danny Collins", "Dean Whitehead", "Ian Harte", "Nyron Nosworthy", "Anthony Stokes",
+    # Tottenham
+    "Ledley King", "Michael Dawson", "Younes Kaboul", "Gareth Bale", "Pascal Chimbonda", "Alan Hutton",
+    # West Ham
+    "Anton Ferdinand", "Matthew Upson", "Lucas Neill", "George McCartney", "Jonathan Spector", "Mark Noble",
+    # Wigan
+    "Emile Heskey", "Titus Bramble", "Kevin Kilbane", "Paul Stalteri", "Maynor Figueroa", "Leighton Baines"
+]
+
+# Известные полузащитники (Только MID)
+MIDFIELDERS = [
+    # Arsenal
+    "Cesc Fabregas", "Gilberto Silva", "Tomas Rosicky", "Alexander Hleb", "Mathieu Flamini", "Denilson",
+    "Theo Walcott", "Abou Diaby", "Alexandre Song", "Justin Hoyte", "Armand Traore", "Lukasz Fabianski",
+    # Aston Villa
+    "Gareth Barry", "Nigel Reo-Coker", "Stiliyan Petrov", "Ashley Young", "Shaun Maloney", "Gabriel Agbonlahor",
+    # Birmingham
+    "Mehdi Nafti", "Fabrice Muamba", "Damien Johnson", "Sebastian Larsson", "Gary McSheffrey", "Olivier Kapo",
+    # Blackburn
+    "David Bentley", "Brett Emerton", "David Dunn", "Steven Reid", "Tugay Kerimoglu", "Paul Gallagher",
+    # Bolton
+    "Kevin Davies", "Ivan Campo", "Stelios Giannakopoulos", "Gary Speed", "Ricardo Gardner", "El Hadji Diouf",
+    # Chelsea
+    "Michael Essien", "Frank Lampard", "Claude Makelele", "Damien Duff", "Joe Cole", "Geremi",
+    "Shaun Wright-Phillips", "Steve Sidwell", "Michael Ballack", "Florent Malouda", "John Obi Mikel",
+    # Derby
+    "Matt Oakley", "Gary Teale", "Stephen Pearson", "Paul Thirlwell", "Michael Johnson", "Craig Fagan",
+    # Everton
+    "Miklos Feher", "Tim Cahill", "Phil Neville", "Leon Osman", "Kevin Kilbane", "Simon Davies",
+    # Fulham
+    "Michael Brown", "Steed Malbranque", "Jimmy Bullard", "Claus Jensen", "Brian McBride", "Collins John",
+    # Liverpool
+    "Steven Gerrard", "Xabi Alonso", "Javier Mascherano", "Lucas Leiva", "Yossi Benayoun", "Ryan Babel",
+    # Man City
+    "Stephen Ireland", "Elano", "Martin Petrov", "Darius Vassell", "Dietmar Hamann", "Gelson Fernandes",
+    # Man Utd
+    "Michael Carrick", "Paul Scholes", "Owen Hargreaves", "Anderson", "Ryan Giggs", "Ji-sung Park",
+    "Darren Fletcher", "Nani",
+    # Middlesbrough
+    "Stewart Downing", "Gary O'Neil", "Fabio Rochemback", "George Boateng", "Julio Arca", "Tuncay Sanli",
+    # Newcastle
+    "Kevin Nolan", "James Milner", "Charles N'Zogbia", "Nicky Butt", "Matthew Etherington", "Alan Smith",
+    # Portsmouth
+    "Papa Bouba Diop", "Sulley Muntari", "Niko Kranjcar", "John Utaka", "Pedro Mendes", "Richard Hughes",
+    # Reading
+    "Bobby Convey", "Stephen Hunt", "James Harper", "Leroy Lita", "John Oster", "Kevin Doyle",
+    # Sunderland
+    "Ross Wallace", "Grant Leadbitter", "Kenwyne Jones", "Carlos Edwards", "Andy Reid", "Rade Prica",
+    # Tottenham
+    "Jermaine Jenas", "Tom Huddlestone", "Didier Zokora", "Aaron Lennon", "Steed Malbranque", "Jamie O'Hara",
+    # West Ham
+    "Scott Parker", "Hayden Mullins", "Freddie Ljungberg", "Matthew Etherington", "Craig Bellamy", "Nolberto Solano",
+    # Wigan
+    "Paul Scharner", "Kevin Kilbane", "Jason Koumas", "Antonio Valencia", "Michael Brown", "David Cotterill"
+]
+
+# Известные нападающие (Только FWD)
+FORWARDS = [
+    # Arsenal
+    "Robin van Persie", "Emmanuel Adebayor", "Nicklas Bendtner", "Eduardo",
+    # Aston Villa
+    "John Carew", "Luke Moore", "Gabriel Agbonlahor",
+    # Birmingham
+    "Cameron Jerome", "Mikael Forssell", "James McFadden", "Garry O'Connor", "Daniel de Ridder", "Rafael Schmitz",
+    # Blackburn
+    "Benni McCarthy", "Jason Roberts", "Matt Derbyshire", "Paul Dickov", "Francis Jeffers",
+    # Bolton
+    "Nicolas Anelka", "Kevin Davies", "Heidar Helguson", "Grzegorz Rasiak", "Nolberto Solano",
+    # Chelsea
+    "Didier Drogba", "Andriy Shevchenko", "Salomon Kalou",
+    # Derby
+    "Steve Howard", "Jon Stead", "Kenny Miller", "Gary Teale", "Artur Boruc",
+    # Everton
+    "Andrew Johnson", "James Vaughan", "Victor Anichebe", "James McFadden", "Yakubu Aiyegbeni",
+    # Fulham
+    "Brian McBride", "Heidar Helguson", "David Healy", "Collins John", "Diomansy Kamara",
+    # Liverpool
+    "Fernando Torres", "Peter Crouch", "Dirk Kuyt", "Craig Bellamy", "Andriy Voronin",
+    # Man City
+    "Valeri Bojinov", "Georgios Samaras", "Rolando Bianchi", "Felipe Caicedo", "Geovanni",
+    # Man Utd
+    "Cristiano Ronaldo", "Wayne Rooney", "Carlos Tevez", "Louis Saha", "Alan Smith", "Ole Gunnar Solskjaer",
+    # Middlesbrough
+    "Mark Viduka", "Afonso Alves", "Jeremie Aliadiere", "Dong-Gook Lee", "Tom Craddock",
+    # Newcastle
+    "Michael Owen", "Mark Viduka", "Alan Smith", "Shola Ameobi", "Obafemi Martins",
+    # Portsmouth
+    "Jermain Defoe", "Dave Nugent", "Benjani", "Nwankwo Kanu",
+    # Reading
+    "Shane Long", "Kevin Doyle", "Dave Kitson", "Leroy Lita",
+    # Sunderland
+    "Kenwyne Jones", "Daryl Murphy", "Grant Leadbitter", "Rade Prica", "Carlos Edwards",
+    # Tottenham
+    "Robbie Keane", "Dimitar Berbatov", "Darren Bent",
+    # West Ham
+    "Dean Ashton", "Carlton Cole", "Bobby Zamora",
+    # Wigan
+    "Emile Heskey", "Marcus Bent", "Henri Camara", "Julio Baptista"
+]
+
+# Индекс имя игрока -> позиция. Порядок заполнения повторяет приоритет проверок
+# (вратари важнее защитников и т.д.), поэтому игроки из нескольких списков
+# получают ту же позицию, что и раньше.
+PLAYER_POSITIONS = {}
+for _position, _names in (('FWD', FORWARDS), ('MID', MIDFIELDERS), ('DEF', DEFENDERS), ('GK', GOALKEEPERS)):
+    for _name in _names:
+        PLAYER_POSITIONS[_name] = _position
+
 # Функция для определения позиции игрока
 def get_player_position(team_name, player_index):
     """Определяет позицию игрока по его месту в составе с учетом реальных позиций"""
-    if team_name in SQUADS_2007_08:
-        squad = SQUADS_2007_08[team_name]
-
-        # Если индекс выходит за пределы, возвращаем по умолчанию
-        if player_index >= len(squad):
-            return 'MID'
-
-        player_data = squad[player_index]
-        player_name = player_data[0] if isinstance(player_data, tuple) else player_data
-
-        # Известные вратари (Только GK)
-        goalkeepers = [
-            "Manuel Almunia", "Jens Lehmann", "Scott Carson", "Stuart Taylor", "Maik Taylor", "Colin Doyle",
-            "Petr Cech", "Carlo Cudicini", "Paul Robinson", "Chris Kirkland", "Brad Friedel", "Thomas Sorensen",
-            "Jussi Jaaskelainen", "Ali Al Habsi", "Mark Schwarzer", "Robert Green", "Roy Carroll",
-            "Marton Fulop", "Boaz Myhill", "Luke Steele", "Heurelho Gomes", "Craig Gordon", "David James",
-            "Shay Given", "Steve Harper", "Joe Hart", "Ben Foster", "Wayne Hennessey"
-        ]
-
-        # Известные защитники (Только DEF)
-        defenders = [
-            # Arsenal
-            "Gael Clichy", "Kolo Toure", "William Gallas", "Philippe Senderos", "Bacary Sagna", "Emmanuel Eboue",
-            # Aston Villa
-            "Olof Mellberg", "Martin Laursen", "Zat Knight", "Curtis Davies", "Wilfred Bouma", "Nicky Shorey",
-            # Birmingham
-            "Stephen Kelly", "Liam Ridgewell", "Radhi Jaidi", "Martin Taylor", "Franck Queudrue", "Stuart Parnaby",
-            # Blackburn
-            "Andre Ooijer", "Christopher Samba", "Brett Emerton", "Stephen Warnock", "Ryan Nelsen", "Lucas Neill",
-            # Bolton
-            "Jlloyd Samuel", "Abdoulaye Meite", "Gricel Ndo", "Kevin Nolan", "Ivan Campo", "Abdoulaye Faye",
-            # Chelsea
-            "John Terry", "Paulo Ferreira", "Ashley Cole", "Wayne Bridge", "Juliano Belletti", "Ricardo Carvalho",
-            # Derby
-            "Darren Moore", "Claude Davis", "Dean Leacock", "Andy Todd", "Marc Edworthy", "Tyrone Mears",
-            # Everton
-            "Joseph Yobo", "Alan Stubbs", "David Weir", "Leighton Baines", "Joleon Lescott", "Tony Hibbert",
-            # Fulham
-            "Ian Pearce", "Brede Hangeland", "Paul Konchesky", "Carlos Bocanegra", "Dejan Stefanovic", "Liam Rosenior",
-            # Liverpool
-            "Jamie Carragher", "Daniel Agger", "Alvaro Arbeloa", "John Arne Riise", "Steve Finnan", "Fabio Aurelio",
-            # Man City
-            "Richard Dunne", "Sylvain Distin", "Michael Ball", "Javier Garrido", "Vedran Corluka", "Michael Johnson",
-            # Man Utd
-            "Rio Ferdinand", "Nemanja Vidic", "Patrice Evra", "Gary Neville", "Mikael Silvestre", "Wes Brown",
-            "John O'Shea", "Gerard Pique", "Rafael", "Fabio",
-            # Middlesbrough
-            "David Wheater", "Robert Huth", "Emanuel Pogatetz", "Jonathan Woodgate", "Luke Young", "Andrew Taylor",
-            # Newcastle
-            "Steve Harper", "Titus Bramble", "Emile Heskey", "Matthew Taylor", "Paul Stalteri", "Hayden Foxe",
-            # Portsmouth
-            "Sol Campbell", "Sylvain Distin", "Glen Johnson", "Hermann Hreidarsson", "Noe Pamarot", "Lassana Diarra",
-            # Reading
-            "Ibrahima Sonko", "Michael Duberry", "Nick Shorey", "Graeme Murty", "Liam Rosenior", "James Harper",
-            # Sunderland
-            "Paul McShane", "Danny Collins", "Dean Whitehead", "Ian Harte", "Nyron Nosworthy", "Anthony Stokes",
-            # Tottenham
-            "Ledley King", "Michael Dawson", "Younes Kaboul", "Gareth Bale", "Pascal Chimbonda", "Alan Hutton",
-            # West Ham
-            "Anton Ferdinand", "Matthew Upson", "Lucas Neill", "George McCartney", "Jonathan Spector", "Mark Noble",
-            # Wigan
-            "Emile Heskey", "Titus Bramble", "Kevin Kilbane", "Paul Stalteri", "Maynor Figueroa", "Leighton Baines"
-        ]
-
-        # Известные полузащитники (Только MID)
-        midfielders = [
-            # Arsenal
-            "Cesc Fabregas", "Gilberto Silva", "Tomas Rosicky", "Alexander Hleb", "Mathieu Flamini", "Denilson",
-            "Theo Walcott", "Abou Diaby", "Alexandre Song", "Justin Hoyte", "Armand Traore", "Lukasz Fabianski",
-            # Aston Villa
-            "Gareth Barry", "Nigel Reo-Coker", "Stiliyan Petrov", "Ashley Young", "Shaun Maloney", "Gabriel Agbonlahor",
-            # Birmingham
-            "Mehdi Nafti", "Fabrice Muamba", "Damien Johnson", "Sebastian Larsson", "Gary McSheffrey", "Olivier Kapo",
-            # Blackburn
-            "David Bentley", "Brett Emerton", "David Dunn", "Steven Reid", "Tugay Kerimoglu", "Paul Gallagher",
-            # Bolton
-            "Kevin Davies", "Ivan Campo", "Stelios Giannakopoulos", "Gary Speed", "Ricardo Gardner", "El Hadji Diouf",
-            # Chelsea
-            "Michael Essien", "Frank Lampard", "Claude Makelele", "Damien Duff", "Joe Cole", "Geremi",
-            "Shaun Wright-Phillips", "Steve Sidwell", "Michael Ballack", "Florent Malouda", "John Obi Mikel",
-            # Derby
-            "Matt Oakley", "Gary Teale", "Stephen Pearson", "Paul Thirlwell", "Michael Johnson", "Craig Fagan",
-            # Everton
-            "Miklos Feher", "Tim Cahill", "Phil Neville", "Leon Osman", "Kevin Kilbane", "Simon Davies",
-            # Fulham
-            "Michael Brown", "Steed Malbranque", "Jimmy Bullard", "Claus Jensen", "Brian McBride", "Collins John",
-            # Liverpool
-            "Steven Gerrard", "Xabi Alonso", "Javier Mascherano", "Lucas Leiva", "Yossi Benayoun", "Ryan Babel",
-            # Man City
-            "Stephen Ireland", "Elano", "Martin Petrov", "Darius Vassell", "Dietmar Hamann", "Gelson Fernandes",
-            # Man Utd
-            "Michael Carrick", "Paul Scholes", "Owen Hargreaves", "Anderson", "Ryan Giggs", "Ji-sung Park",
-            "Darren Fletcher", "Nani",
-            # Middlesbrough
-            "Stewart Downing", "Gary O'Neil", "Fabio Rochemback", "George Boateng", "Julio Arca", "Tuncay Sanli",
-            # Newcastle
-            "Kevin Nolan", "James Milner", "Charles N'Zogbia", "Nicky Butt", "Matthew Etherington", "Alan Smith",
-            # Portsmouth
-            "Papa Bouba Diop", "Sulley Muntari", "Niko Kranjcar", "John Utaka", "Pedro Mendes", "Richard Hughes",
-            # Reading
-            "Bobby Convey", "Stephen Hunt", "James Harper", "Leroy Lita", "John Oster", "Kevin Doyle",
-            # Sunderland
-            "Ross Wallace", "Grant Leadbitter", "Kenwyne Jones", "Carlos Edwards", "Andy Reid", "Rade Prica",
-            # Tottenham
-            "Jermaine Jenas", "Tom Huddlestone", "Didier Zokora", "Aaron Lennon", "Steed Malbranque", "Jamie O'Hara",
-            # West Ham
-            "Scott Parker", "Hayden Mullins", "Freddie Ljungberg", "Matthew Etherington", "Craig Bellamy", "Nolberto Solano",
-            # Wigan
-            "Paul Scharner", "Kevin Kilbane", "Jason Koumas", "Antonio Valencia", "Michael Brown", "David Cotterill"
-        ]
-
-        # Известные нападающие (Только FWD)
-        forwards = [
-            # Arsenal
-            "Robin van Persie", "Emmanuel Adebayor", "Nicklas Bendtner", "Eduardo",
-            # Aston Villa
-            "John Carew", "Luke Moore", "Gabriel Agbonlahor",
-            # Birmingham
-            "Cameron Jerome", "Mikael Forssell", "James McFadden", "Garry O'Connor", "Daniel de Ridder", "Rafael Schmitz",
-            # Blackburn
-            "Benni McCarthy", "Jason Roberts", "Matt Derbyshire", "Paul Dickov", "Francis Jeffers",
-            # Bolton
-            "Nicolas Anelka", "Kevin Davies", "Heidar Helguson", "Grzegorz Rasiak", "Nolberto Solano",
-            # Chelsea
-            "Didier Drogba", "Andriy Shevchenko", "Salomon Kalou",
-            # Derby
-            "Steve Howard", "Jon Stead", "Kenny Miller", "Gary Teale", "Artur Boruc",
-            # Everton
-            "Andrew Johnson", "James Vaughan", "Victor Anichebe", "James McFadden", "Yakubu Aiyegbeni",
-            # Fulham
-            "Brian McBride", "Heidar Helguson", "David Healy", "Collins John", "Diomansy Kamara",
-            # Liverpool
-            "Fernando Torres", "Peter Crouch", "Dirk Kuyt", "Craig Bellamy", "Andriy Voronin",
-            # Man City
-            "Valeri Bojinov", "Georgios Samaras", "Rolando Bianchi", "Felipe Caicedo", "Geovanni",
-            # Man Utd
-            "Cristiano Ronaldo", "Wayne Rooney", "Carlos Tevez", "Louis Saha", "Alan Smith", "Ole Gunnar Solskjaer",
-            # Middlesbrough
-            "Mark Viduka", "Afonso Alves", "Jeremie Aliadiere", "Dong-Gook Lee", "Tom Craddock",
-            # Newcastle
-            "Michael Owen", "Mark Viduka", "Alan Smith", "Shola Ameobi", "Obafemi Martins",
-            # Portsmouth
-            "Jermain Defoe", "Dave Nugent", "Benjani", "Nwankwo Kanu",
-            # Reading
-            "Shane Long", "Kevin Doyle", "Dave Kitson", "Leroy Lita",
-            # Sunderland
-            "Kenwyne Jones", "Daryl Murphy", "Grant Leadbitter", "Rade Prica", "Carlos Edwards",
-            # Tottenham
-            "Robbie Keane", "Dimitar Berbatov", "Darren Bent",
-            # West Ham
-            "Dean Ashton", "Carlton Cole", "Bobby Zamora",
-            # Wigan
-            "Emile Heskey", "Marcus Bent", "Henri Camara", "Julio Baptista"
-        ]
-
-        # Проверяем по имени
-        if player_name in goalkeepers:
-            return 'GK'
-        elif player_name in defenders:
-            return 'DEF'
-        elif player_name in midfielders:
-            return 'MID'
-        elif player_name in forwards:
-            return 'FWD'
-        else:
-            # Fallback на позицию по индексу для неизвестных игроков
-            if player_index < 2:
-                return 'GK'
-            elif player_index < 8:
-                return 'DEF'
-            elif player_index < 14:
-                return 'MID'
-            else:
-                return 'FWD'
-
-    return 'MID'  # По умолчанию
+    # Позиции всех игроков считаются один раз вместе с реестром игроков
+    return PLAYER_REGISTRY.positions.get((team_name, player_index), 'MID')  # По умолчанию
+
+def classify_player_position(player_name, player_index):
+    """Определяет позицию игрока по спискам известных игроков, иначе по индексу"""
+    position = PLAYER_POSITIONS.get(player_name)
+    if position is not None:
+        return position
+
+    # Fallback на позицию по индексу для неизвестных игроков
+    if player_index < 2:
+        return 'GK'
+    elif player_index < 8:
+        return 'DEF'
+    elif player_index < 14:
+        return 'MID'
+    else:
+        return 'FWD'
 
 def sort_squad_by_positions(squad, team_name):
     """Сортирует состав команды по позициям: GK, DEF, MID, FWD"""
@@ -196,11 +255,8 @@ def sort_squad_by_positions(squad, team_name):
             print(f"WARNING: team {team_name} not in SQUADS_2007_08, returning unsorted squad")
             return squad
 
-        # Создаем словарь имя игрока -> оригинальный индекс
-        name_to_index = {}
-        for i, player_data in enumerate(SQUADS_2007_08[team_name]):
-            player_name = player_data[0] if isinstance(player_data, tuple) else player_data
-            name_to_index[player_name] = i
+        # Словарь имя игрока -> оригинальный индекс (построен при импорте)
+        name_to_index = PLAYER_REGISTRY.name_indexes[team_name]
 
         # Разделяем игроков по позициям
         gk_players = []
@@ -209,8 +265,11 @@ def sort_squad_by_positions(squad, team_name):
         fwd_players = []
 
         for player in squad:
-            original_index = name_to_index.get(player['name'], 0)
-            position = get_player_position(team_name, original_index)
+            # Запись реестра знает свою позицию, у словаря - по индексу имени в составе
+            if isinstance(player, dict):
+                position = get_player_position(team_name, name_to_index.get(player['name'], 0))
+            else:
+                position = player.position
             if position == 'GK':
                 gk_players.append(player)
             elif position == 'DEF':
@@ -234,96 +293,16 @@ def sort_squad_by_positions(squad, team_name):
 def create_optimal_lineup(squad, team_name, target_gk=1, target_def=4, target_mid=4, target_fwd=2):
     """Создает оптимальный состав команды с заданным количеством игроков по позициям"""
     try:
-        # Получаем отсортированный состав
-        sorted_squad = sort_squad_by_positions(squad, team_name)
+        # Словарь имя игрока -> оригинальный индекс для определения позиций
+        name_to_index = PLAYER_REGISTRY.name_indexes.get(team_name, {})
 
-        # Создаем словарь имя игрока -> оригинальный индекс для определения позиций
-        name_to_index = {}
-        for i, player_data in enumerate(SQUADS_2007_08[team_name]):
-            player_name = player_data[0] if isinstance(player_data, tuple) else player_data
-            name_to_index[player_name] = i
-
-        # Разделяем игроков по позициям
-        gk_players = []
-        def_players = []
-        mid_players = []
-        fwd_players = []
-
-        for player in sorted_squad:
-            original_index = name_to_index.get(player['name'], 0)
-            position = get_player_position(team_name, original_index)
-            if position == 'GK':
-                gk_players.append(player)
-            elif position == 'DEF':
-                def_players.append(player)
-            elif position == 'FWD':
-                fwd_players.append(player)
-            else:  # MID и остальные
-                mid_players.append(player)
+        def position_of(player):
+            # Запись реестра знает свою позицию, у словаря - по индексу имени в составе
+            if isinstance(player, dict):
+                return get_player_position(team_name, name_to_index.get(player['name'], 0))
+            return player.position
 
-        # Формируем оптимальный состав
-        lineup = []
-
-        # Добавляем GK
-        for i in range(min(target_gk, len(gk_players))):
-            lineup.append({**gk_players[i], 'position': 'В'})
-
-        # Добавляем DEF
-        for i in range(min(target_def, len(def_players))):
-            lineup.append({**def_players[i], 'position': 'З'})
-
-        # Добавляем MID
-        for i in range(min(target_mid, len(mid_players))):
-            lineup.append({**mid_players[i], 'position': 'П'})
-
-        # Добавляем FWD
-        for i in range(min(target_fwd, len(fwd_players))):
-            lineup.append({**fwd_players[i], 'position': 'Н'})
-
-        # Если не хватает до 11 игроков, добавляем из оставшихся
-        while len(lineup) < 11:
-            added = False
-
-            # Проверяем GK
-            if len(gk_players) > target_gk:
-                for gk in gk_players[target_gk:]:
-                    if gk not in [p for p in lineup if p['name'] == gk['name']]:
-                        lineup.append({**gk, 'position': 'В'})
-                        added = True
-                        break
-                target_gk += 1
-
-            # Проверяем DEF
-            if not added and len(def_players) > target_def:
-                for df in def_players[target_def:]:
-                    if df not in [p for p in lineup if p['name'] == df['name']]:
-                        lineup.append({**df, 'position': 'З'})
-                        added = True
-                        break
-                target_def += 1
-
-            # Проверяем MID
-            if not added and len(mid_players) > target_mid:
-                for md in mid_players[target_mid:]:
-                    if md not in [p for p in lineup if p['name'] == md['name']]:
-                        lineup.append({**md, 'position': 'П'})
-                        added = True
-                        break
-                target_mid += 1
-
-            # Проверяем FWD
-            if not added and len(fwd_players) > target_fwd:
-                for fw in fwd_players[target_fwd:]:
-                    if fw not in [p for p in lineup if p['name'] == fw['name']]:
-                        lineup.append({**fw, 'position': 'Н'})
-                        added = True
-                        break
-                target_fwd += 1
-
-            if not added:
-                break  # Не можем добавить больше игроков
-
-        return lineup[:11]  # Гарантируем ровно 11 игроков
+        return best_lineup(squad, (target_gk, target_def, target_mid, target_fwd), position_of)
 
     except Exception as e:
         print(f"ERROR in create_optimal_lineup for {team_name}: {e}")
@@ -332,155 +311,122 @@ def create_optimal_lineup(squad, team_name, target_gk=1, target_def=4, target_mi
         # Возвращаем первые 11 игроков в случае ошибки
         return squad[:11]
 
-# Функция для выбора бомбардира из состава пользователя
-def select_goal_scorer(game_data, lineup, match_goals=None):
-    """Выбирает бомбардира с учетом позиций, рейтинга и предыдущих голов в матче для реализма"""
-    import random
-
-    if match_goals is None:
-        match_goals = []
-
-    # Подсчитываем, сколько голов уже забил каждый игрок в этом матче
-    scorer_counts = {}
-    for goal in match_goals:
-        if goal['team'] == game_data['team_name']:
-            scorer_counts[goal['scorer']] = scorer_counts.get(goal['scorer'], 0) + 1
-
-    # Создаем список игроков с весами
-    scorers_with_weights = []
+# Базовые веса бомбардиров по позициям
+SCORER_POSITION_WEIGHTS = {
+    'DEF': 3,  # Защитники забивают реже
+    'MID': 5,  # Полузащитники забивают чаще
+    'FWD': 8,  # Нападающие забивают чаще всего
+}
 
+def get_scorer_key(player):
+    """Бомбардир в голах: id игрока, а у игроков не из реестра - имя"""
+    player_id = player.get('id')
+    return player['name'] if player_id is None else player_id
+
+def build_scorer_table(team_name, lineup):
+    """Готовит таблицу бомбардиров состава: базовые веса и взвешенный выборщик.
+
+    Позиция берется по месту игрока в составе, как и раньше. Бонусы за голы
+    в матче применяются к выборщику по мере того, как игроки забивают.
+    Бомбардир - id игрока из реестра (имя для игроков не из реестра).
+    """
+    players = [get_scorer_key(player) for player in lineup]
+    scorers = []
+    base_weights = []
     for i, player in enumerate(lineup):
-        position = get_player_position(game_data['team_name'], i)
-        name = player['name']
-        rating = player.get('rating', 70)
+        position = get_player_position(team_name, i)
 
         # ВРАТАРИ НЕ МОГУТ ЗАБИВАТЬ ГОЛЫ!
         if position == 'GK':
             continue  # Пропускаем вратарей полностью
 
-        # Базовые веса по позициям
-        if position == 'DEF':
-            base_weight = 3  # Защитники забивают реже
-        elif position == 'MID':
-            base_weight = 5  # Полузащитники забивают чаще
-        elif position == 'FWD':
-            base_weight = 8  # Нападающие забивают чаще всего
-        else:
-            base_weight = 4  # По умолчанию
+        base_weight = SCORER_POSITION_WEIGHTS.get(position, 4)  # 4 - по умолчанию
 
         # Умножаем на рейтинг игрока (нормализуем к разумным значениям)
         # Рейтинг 60 = вес 0.8, рейтинг 90 = вес 1.4, рейтинг 99 = вес 1.6
+        rating = player.get('rating', 70)
         rating_multiplier = 0.8 + (rating - 60) * 0.01
         rating_multiplier = max(0.5, min(2.0, rating_multiplier))  # Ограничиваем диапазон
 
-        # Финальный вес = базовый вес × рейтинг × случайный фактор (для создания звезд)
-        final_weight = int(base_weight * rating_multiplier)
-
-        # БОНУС: если игрок уже забивал в этом матче, его шансы увеличиваются!
-        goals_in_match = scorer_counts.get(name, 0)
-        if goals_in_match >= 1:
-            # После первого гола шанс забить еще увеличивается
-            final_weight = int(final_weight * (1.5 + goals_in_match * 0.3))
-        elif goals_in_match >= 2:
-            # После второго гола шанс еще больше (хет-трик!)
-            final_weight = int(final_weight * (2.0 + goals_in_match * 0.5))
-
-        # Добавляем элемент удачи - некоторые игроки "горячие" в данный момент
-        luck_factor = random.random()
-        if luck_factor > 0.85:  # 15% игроков имеют повышенный шанс
-            final_weight = int(final_weight * 1.5)
-        elif luck_factor < 0.05:  # 5% игроков имеют пониженный шанс
-            final_weight = max(1, int(final_weight * 0.5))
-
-        final_weight = max(1, final_weight)  # Минимум 1
+        scorers.append(players[i])
+        base_weights.append(int(base_weight * rating_multiplier))
 
-        scorers_with_weights.extend([name] * final_weight)
+    indexes_by_scorer = {}
+    for i, scorer in enumerate(scorers):
+        indexes_by_scorer.setdefault(scorer, []).append(i)
 
-    if scorers_with_weights:
-        return random.choice(scorers_with_weights)
-    else:
-        # Если нет подходящих игроков, выбираем случайного полевого игрока
-        field_players = [p['name'] for i, p in enumerate(lineup)
-                        if get_player_position(game_data['team_name'], i) != 'GK']
-        if field_players:
-            return random.choice(field_players)
-        else:
-            return random.choice([p['name'] for p in lineup])
+    return {
+        'base_weights': base_weights,
+        'indexes_by_scorer': indexes_by_scorer,
+        'sampler': WeightedSampler(scorers, base_weights),
+        'goal_counts': {},
+        'applied_goals': [],
+        'players': players
+    }
 
-# Функция для выбора бомбардира соперника
-def select_opponent_goal_scorer(team_name, lineup, match_goals=None):
-    """Выбирает бомбардира соперника с учетом позиций, рейтинга и предыдущих голов в матче для реализма"""
+def scorer_goal_bonus(weight, goals_in_match):
+    """БОНУС: если игрок уже забивал в этом матче, его шансы увеличиваются!"""
+    if goals_in_match >= 1:
+        # После первого гола шанс забить еще увеличивается
+        return int(weight * (1.5 + goals_in_match * 0.3))
+    return weight
+
+def sync_scorer_goals(scorer_table, team_goals):
+    """Применяет к таблице бонусы за голы, забитые после прошлого вызова"""
+    applied = scorer_table['applied_goals']
+    if team_goals[:len(applied)] != applied:
+        # История голов не продолжает прежнюю (матч начат заново) - сбрасываем бонусы
+        sampler = scorer_table['sampler']
+        for i, weight in enumerate(scorer_table['base_weights']):
+            sampler.set_weight(i, weight)
+        scorer_table['goal_counts'] = {}
+        applied.clear()
+
+    goal_counts = scorer_table['goal_counts']
+    for scorer in team_goals[len(applied):]:
+        goal_counts[scorer] = goal_counts.get(scorer, 0) + 1
+        for i in scorer_table['indexes_by_scorer'].get(scorer, ()):
+            scorer_table['sampler'].set_weight(
+                i, scorer_goal_bonus(scorer_table['base_weights'][i], goal_counts[scorer]))
+        applied.append(scorer)
+
+def select_scorer_from_table(team_name, scorer_table, match_goals=None, rng=None):
+    """Выбирает бомбардира по таблице весов с учетом голов в матче и удачи"""
     import random
 
+    if rng is None:
+        rng = random
     if match_goals is None:
         match_goals = []
 
-    # Подсчитываем, сколько голов уже забил каждый игрок в этом матче
-    scorer_counts = {}
-    for goal in match_goals:
-        if goal['team'] == team_name:
-            scorer_counts[goal['scorer']] = scorer_counts.get(goal['scorer'], 0) + 1
-
-    # Создаем список игроков с весами
-    scorers_with_weights = []
-
-    for i, player in enumerate(lineup):
-        position = get_player_position(team_name, i)
-        name = player['name']
-        rating = player.get('rating', 70)
-
-        # ВРАТАРИ НЕ МОГУТ ЗАБИВАТЬ ГОЛЫ!
-        if position == 'GK':
-            continue  # Пропускаем вратарей полностью
-
-        # Базовые веса по позициям
-        if position == 'DEF':
-            base_weight = 3  # Защитники забивают реже
-        elif position == 'MID':
-            base_weight = 5  # Полузащитники забивают чаще
-        elif position == 'FWD':
-            base_weight = 8  # Нападающие забивают чаще всего
-        else:
-            base_weight = 4  # По умолчанию
-
-        # Умножаем на рейтинг игрока (нормализуем к разумным значениям)
-        # Рейтинг 60 = вес 0.8, рейтинг 90 = вес 1.4, рейтинг 99 = вес 1.6
-        rating_multiplier = 0.8 + (rating - 60) * 0.01
-        rating_multiplier = max(0.5, min(2.0, rating_multiplier))  # Ограничиваем диапазон
+    sync_scorer_goals(scorer_table, [goal['scorer'] for goal in match_goals if goal['team'] == team_name])
 
-        # Финальный вес = базовый вес × рейтинг × случайный фактор (для создания звезд)
-        final_weight = int(base_weight * rating_multiplier)
-
-        # БОНУС: если игрок уже забивал в этом матче, его шансы увеличиваются!
-        goals_in_match = scorer_counts.get(name, 0)
-        if goals_in_match >= 1:
-            # После первого гола шанс забить еще увеличивается
-            final_weight = int(final_weight * (1.5 + goals_in_match * 0.3))
-        elif goals_in_match >= 2:
-            # После второго гола шанс еще больше (хет-трик!)
-            final_weight = int(final_weight * (2.0 + goals_in_match * 0.5))
-
-        # Добавляем элемент удачи - некоторые игроки "горячие" в данный момент
-        luck_factor = random.random()
+    # Добавляем элемент удачи - некоторые игроки "горячие" в данный момент
+    def apply_luck(weight):
+        luck_factor = rng.random()
         if luck_factor > 0.85:  # 15% игроков имеют повышенный шанс
-            final_weight = int(final_weight * 1.5)
+            weight = int(weight * 1.5)
         elif luck_factor < 0.05:  # 5% игроков имеют пониженный шанс
-            final_weight = max(1, int(final_weight * 0.5))
+            weight = max(1, int(weight * 0.5))
+        return max(1, weight)  # Минимум 1
 
-        final_weight = max(1, final_weight)  # Минимум 1
+    scorer = scorer_table['sampler'].sample(rng, adjust=apply_luck)
+    if scorer is not None:
+        return scorer
+    else:
+        # Полевых игроков нет - выбираем любого игрока состава
+        return rng.choice(scorer_table['players'])
 
-        scorers_with_weights.extend([name] * final_weight)
+# Функция для выбора бомбардира из состава пользователя
+def select_goal_scorer(game_data, lineup, match_goals=None, rng=None):
+    """Выбирает бомбардира с учетом позиций, рейтинга и предыдущих голов в матче для реализма"""
+    team_name = game_data['team_name']
+    return select_scorer_from_table(team_name, build_scorer_table(team_name, lineup), match_goals, rng)
 
-    if scorers_with_weights:
-        return random.choice(scorers_with_weights)
-    else:
-        # Если нет подходящих игроков, выбираем случайного полевого игрока
-        field_players = [p['name'] for i, p in enumerate(lineup)
-                        if get_player_position(team_name, i) != 'GK']
-        if field_players:
-            return random.choice(field_players)
-        else:
-            return random.choice([p['name'] for p in lineup])
+# Функция для выбора бомбардира соперника
+def select_opponent_goal_scorer(team_name, lineup, match_goals=None, rng=None):
+    """Выбирает бомбардира соперника с учетом позиций, рейтинга и предыдущих голов в матче для реализма"""
+    return select_scorer_from_table(team_name, build_scorer_table(team_name, lineup), match_goals, rng)
 
 # Тактики игры
 TACTICS = {
@@ -524,44 +470,24 @@ TACTICS = {
 # Функция для получения среднего рейтинга команды
 def get_team_average_rating(team_name):
     """Вычисляет средний рейтинг команды"""
-    if team_name in SQUADS_2007_08:
-        squad = SQUADS_2007_08[team_name]
-        ratings = []
-        for player_data in squad[:18]:  # Берем первых 18 игроков (основной состав + запас)
-            if isinstance(player_data, tuple):
-                rating = player_data[1]
-            else:
-                rating = 70  # По умолчанию
-            ratings.append(rating)
-        return sum(ratings) / len(ratings) if ratings else 70
-    return 70  # По умолчанию для неизвестных команд
+    return TEAM_STRENGTH.get(team_name)['average']
 
 def get_starting_lineup_rating(team_name):
     """Вычисляет средний рейтинг стартового состава (первых 11 игроков)"""
-    if team_name in SQUADS_2007_08:
-        squad = SQUADS_2007_08[team_name]
-
-        # Создаём тестовый squad для получения оптимального состава
-        test_squad = []
-        for player_data in squad:
-            if isinstance(player_data, tuple):
-                player_name, rating = player_data
-            else:
-                player_name = player_data
-                rating = 70
-            test_squad.append({
-                'name': player_name,
-                'rating': rating
-            })
+    return TEAM_STRENGTH.get(team_name)['xi']
 
-        # Получаем оптимальный состав
-        starting_lineup = create_optimal_lineup(test_squad, team_name)
+def apply_league_results(game_data, round_results):
+    """Учитывает результаты тура в game_data['table'] и месте нашей команды"""
+    # Таблица пересчитывает только команды, сыгравшие в туре
+    table = LeagueTable(game_data['table'])
+    table.apply_results(round_results)
 
-        if starting_lineup:
-            ratings = [player['rating'] for player in starting_lineup]
-            return sum(ratings) / len(ratings) if ratings else 70
+    # Обновляем место нашей команды
+    position = table.rank(game_data['team_name'])
+    if position is not None:
+        game_data['position'] = position
 
-    return get_team_average_rating(team_name)  # Fallback к общему рейтингу
+    game_data['table'] = table.rows
 
 # Функция для обновления турнирной таблицы
 def update_league_table(round_results):
@@ -570,383 +496,146 @@ def update_league_table(round_results):
         return
 
     game_data = session['game_data']
-    table = game_data['table']
-
-    # Создаем словарь для быстрого доступа к командам
-    teams_dict = {team['team']: team for team in table}
-
-    # Обрабатываем каждый результат матча
-    for result in round_results:
-        home_team = result['home_team']
-        away_team = result['away_team']
-        home_score = result['home_score']
-        away_score = result['away_score']
-
-        # Обновляем статистику домашней команды
-        if home_team in teams_dict:
-            team = teams_dict[home_team]
-            team['played'] += 1
-            team['won'] += 1 if home_score > away_score else 0
-            team['drawn'] += 1 if home_score == away_score else 0
-            team['lost'] += 1 if home_score < away_score else 0
-            team['points'] = team['won'] * 3 + team['drawn']
-
-        # Обновляем статистику гостевой команды
-        if away_team in teams_dict:
-            team = teams_dict[away_team]
-            team['played'] += 1
-            team['won'] += 1 if away_score > home_score else 0
-            team['drawn'] += 1 if away_score == home_score else 0
-            team['lost'] += 1 if away_score < home_score else 0
-            team['points'] = team['won'] * 3 + team['drawn']
-
-    # Сортируем таблицу по очкам
-    table.sort(key=lambda x: (x['points'], x['won'], x['played']), reverse=True)
-
-    # Обновляем позиции
-    for i, team in enumerate(table, 1):
-        team['position'] = i
+    apply_league_results(game_data, round_results)
 
     # Сохраняем обновленную таблицу
-    game_data['table'] = table
     session['game_data'] = game_data
 
+# Статические данные сезона 2007-08 (команды, составы с рейтингами FIFA 08,
+# стадионы, логотипы) - в пакете data/, см. data_pack.py
+FOOTBALL_DATA = DataPack(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'premier_league_2007_08.json'))
+
 # Список команд
-TEAMS = [
-    "Arsenal", "Aston Villa", "Birmingham City", "Blackburn Rovers",
-    "Bolton Wanderers", "Chelsea", "Derby County", "Everton", "Fulham",
-    "Liverpool", "Manchester City", "Manchester United", "Middlesbrough",
-    "Newcastle United", "Portsmouth", "Reading", "Sunderland",
-    "Tottenham Hotspur", "West Ham United", "Wigan Athletic"
-]
+TEAMS = FOOTBALL_DATA.section('teams')
 
-# Генерация полного календаря АПЛ (38 туров, каждый играет с каждым 2 раза)
-def generate_full_schedule():
-    """Генерирует полный календарь чемпионата где каждая команда играет с каждой 2 раза"""
-    schedule = []
-
-    # Для 20 команд: 19 туров в круге, 2 круга (дома и в гостях) = 38 туров
-    # В каждом туре 10 матчей (20 команд / 2)
-
-    teams = TEAMS.copy()
-
-    # Первый круг
-    # Фиксируем первую команду, остальные будут циклически сдвигаться
-    fixed_team = teams[0]
-    rotating_teams = teams[1:]
-
-    for round_num in range(19):  # 19 туров в первом круге
-        round_matches = []
-
-        # Создаем пары для этого тура
-        # Матчи: rotating_teams[i] vs rotating_teams[18-i] (домашние матчи)
-        for i in range(9):  # 9 матчей в туре (18 команд / 2)
-            home = rotating_teams[i]
-            away = rotating_teams[17 - i]  # Симметричная позиция
-            round_matches.append((home, away))
-
-        # Последний матч: фиксированная команда vs последняя rotating команда
-        round_matches.append((fixed_team, rotating_teams[-1]))
-
-        schedule.append(round_matches)
-
-        # Циклический сдвиг rotating команд (последняя становится первой)
-        rotating_teams = [rotating_teams[-1]] + rotating_teams[:-1]
-
-    # Второй круг - те же матчи, но поменяны домашние/гостевые
-    first_round_schedule = schedule.copy()
-    for round_matches in first_round_schedule:
-        reversed_round = [(away, home) for home, away in round_matches]
-        schedule.append(reversed_round)
-
-    return schedule
-
-# Инициализируем календарь при запуске
-MATCH_SCHEDULE = generate_full_schedule()
-
-# Составы команд сезона 2007-08 с рейтингами FIFA 08
-SQUADS_2007_08 = {
-    "Arsenal": [
-        ("Manuel Almunia", 75), ("Jens Lehmann", 82), ("Gael Clichy", 78), ("Kolo Toure", 81), ("William Gallas", 84),
-        ("Philippe Senderos", 76), ("Bacary Sagna", 79), ("Emmanuel Eboue", 75), ("Cesc Fabregas", 85), ("Mathieu Flamini", 78),
-        ("Gilberto Silva", 80), ("Tomas Rosicky", 82), ("Alexander Hleb", 81), ("Theo Walcott", 72), ("Robin van Persie", 82),
-        ("Emmanuel Adebayor", 80), ("Nicklas Bendtner", 70), ("Eduardo", 78), ("Abou Diaby", 73), ("Denilson", 71),
-        ("Alexandre Song", 70), ("Justin Hoyte", 68), ("Armand Traore", 65), ("Lukasz Fabianski", 72)
-    ],
-    "Aston Villa": [
-        ("Scott Carson", 75), ("Stuart Taylor", 68), ("Olof Mellberg", 78), ("Martin Laursen", 79), ("Zat Knight", 73),
-        ("Curtis Davies", 74), ("Wilfred Bouma", 76), ("Nicky Shorey", 75), ("Gareth Barry", 81), ("Nigel Reo-Coker", 76),
-        ("Stiliyan Petrov", 78), ("Ashley Young", 77), ("Shaun Maloney", 74), ("Gabriel Agbonlahor", 75), ("John Carew", 78),
-        ("Marlon Harewood", 72), ("Luke Moore", 70), ("Craig Gardner", 68), ("Isaiah Osbourne", 65), ("Patrik Berger", 76),
-        ("Moustapha Salifou", 64), ("Wayne Routledge", 72), ("Nathan Delfouneso", 62)
-    ],
-    "Birmingham City": [
-        ("Maik Taylor", 72), ("Colin Doyle", 65), ("Stephen Kelly", 71), ("Liam Ridgewell", 72), ("Radhi Jaidi", 73),
-        ("Martin Taylor", 70), ("Franck Queudrue", 74), ("Stuart Parnaby", 69), ("Sebastian Larsson", 73), ("Fabrice Muamba", 72),
-        ("Damien Johnson", 73), ("Mehdi Nafti", 71), ("Gary McSheffrey", 72), ("Cameron Jerome", 71), ("Mikael Forssell", 74),
-        ("James McFadden", 75), ("Garry O'Connor", 72), ("Daniel de Ridder", 70), ("Olivier Kapo", 75), ("Rafael Schmitz", 71),
-        ("Marcus Bent", 72), ("David Murphy", 70), ("Johan Djourou", 71)
-    ],
-    "Blackburn Rovers": [
-        ("Brad Friedel", 82), ("Jason Brown", 68), ("Ryan Nelsen", 78), ("Christopher Samba", 75), ("Andre Ooijer", 76),
-        ("Zurab Khizanishvili", 73), ("Stephen Warnock", 74), ("Brett Emerton", 77), ("David Bentley", 78), ("Morten Gamst Pedersen", 77),
-        ("Tugay Kerimoglu", 76), ("Robbie Savage", 75), ("Steven Reid", 74), ("Benedict McCarthy", 76), ("Roque Santa Cruz", 80),
-        ("Jason Roberts", 73), ("Matt Derbyshire", 70), ("Aaron Mokoena", 72), ("David Dunn", 76), ("Maceo Rigters", 68),
-        ("Keith Treacy", 65), ("Martin Olsson", 66), ("Tony Kane", 63)
-    ],
-    "Bolton Wanderers": [
-        ("Jussi Jaaskelainen", 80), ("Ali Al Habsi", 72), ("Abdoulaye Meite", 74), ("Andy O'Brien", 73), ("Gretar Steinsson", 72),
-        ("Gavin McCann", 74), ("Kevin Nolan", 77), ("Ivan Campo", 76), ("Nicky Hunt", 71), ("Jlloyd Samuel", 73),
-        ("Ricardo Gardner", 75), ("Stelios Giannakopoulos", 74), ("El-Hadji Diouf", 76), ("Kevin Davies", 75), ("Nicolas Anelka", 82),
-        ("Heidar Helguson", 72), ("Daniel Braaten", 73), ("Tamir Cohen", 68), ("Danny Guthrie", 70), ("Joey O'Brien", 69),
-        ("Blazej Augustyn", 66), ("Lubomir Michalik", 68), ("James Sinclair", 64)
-    ],
-    "Chelsea": [
-        ("Petr Cech", 88), ("Carlo Cudicini", 80), ("John Terry", 88), ("Ricardo Carvalho", 85), ("Ashley Cole", 85),
-        ("Paulo Ferreira", 79), ("Wayne Bridge", 78), ("Michael Essien", 86), ("Frank Lampard", 87), ("Claude Makelele", 84),
-        ("Michael Ballack", 86), ("Joe Cole", 83), ("Shaun Wright-Phillips", 78), ("Florent Malouda", 82), ("Didier Drogba", 88),
-        ("Salomon Kalou", 78), ("Andriy Shevchenko", 82), ("John Obi Mikel", 78), ("Alex", 80), ("Hernan Crespo", 82),
-        ("Juliano Belletti", 78), ("Branislav Ivanovic", 77), ("Scott Sinclair", 68), ("Steve Sidwell", 75)
-    ],
-    "Derby County": [
-        ("Stephen Bywater", 70), ("Roy Carroll", 72), ("Darren Moore", 71), ("Claude Davis", 70), ("Dean Leacock", 69),
-        ("Andy Todd", 70), ("Marc Edworthy", 69), ("Tyrone Mears", 70), ("Matt Oakley", 72), ("Gary Teale", 71),
-        ("Eddie Lewis", 71), ("David Jones", 72), ("Stephen Pearson", 71), ("Giles Barnes", 70), ("Kenny Miller", 74),
-        ("Rob Earnshaw", 72), ("Steve Howard", 72), ("Emanuel Villa", 71), ("Hossam Ghaly", 72), ("Benny Feilhaber", 71),
-        ("Lewin Nyatanga", 68), ("Jay McEveley", 69), ("Mile Sterjovski", 70)
-    ],
-    "Everton": [
-        ("Tim Howard", 81), ("Stefan Wessels", 70), ("Joseph Yobo", 78), ("Joleon Lescott", 79), ("Phil Jagielka", 77),
-        ("Leighton Baines", 78), ("Tony Hibbert", 73), ("Phil Neville", 77), ("Mikel Arteta", 82), ("Leon Osman", 76),
-        ("Tim Cahill", 81), ("Steven Pienaar", 77), ("Andy Johnson", 77), ("Yakubu", 80), ("James Vaughan", 72),
-        ("Victor Anichebe", 71), ("James McFadden", 75), ("Lee Carsley", 75), ("Thomas Gravesen", 74), ("Manuel Fernandes", 75),
-        ("Nuno Valente", 74), ("Alan Stubbs", 73), ("Lukas Jutkiewicz", 68)
-    ],
-    "Fulham": [
-        ("Antti Niemi", 78), ("Kasey Keller", 76), ("Carlos Bocanegra", 76), ("Aaron Hughes", 77), ("Brede Hangeland", 78),
-        ("Dejan Stefanovic", 74), ("Paul Konchesky", 75), ("Moritz Volz", 73), ("Simon Davies", 76), ("Clint Dempsey", 77),
-        ("Danny Murphy", 78), ("Jimmy Bullard", 77), ("Steven Davis", 74), ("Hameur Bouazza", 73), ("Diomansy Kamara", 75),
-        ("David Healy", 75), ("Brian McBride", 77), ("Erik Nevland", 73), ("Seol Ki-Hyeon", 74), ("Alexey Smertin", 73),
-        ("Chris Baird", 73), ("Tony Kallio", 71), ("Eddie Johnson", 72)
-    ],
-    "Liverpool": [
-        ("Pepe Reina", 85), ("Charles Itandje", 72), ("Jamie Carragher", 85), ("Daniel Agger", 80), ("Sami Hyypia", 81),
-        ("John Arne Riise", 79), ("Steve Finnan", 78), ("Alvaro Arbeloa", 77), ("Fabio Aurelio", 77), ("Steven Gerrard", 88),
-        ("Xabi Alonso", 84), ("Javier Mascherano", 83), ("Lucas Leiva", 75), ("Yossi Benayoun", 79), ("Ryan Babel", 78),
-        ("Fernando Torres", 87), ("Dirk Kuyt", 81), ("Peter Crouch", 78), ("Andriy Voronin", 76), ("Jermaine Pennant", 76),
-        ("Harry Kewell", 79), ("Mohamed Sissoko", 77), ("Martin Skrtel", 78), ("Emiliano Insua", 70)
-    ],
-    "Manchester City": [
-        ("Joe Hart", 73), ("Andreas Isaksson", 77), ("Richard Dunne", 79), ("Micah Richards", 78), ("Nedum Onuoha", 74),
-        ("Michael Ball", 72), ("Javier Garrido", 74), ("Vedran Corluka", 77), ("Michael Johnson", 75), ("Stephen Ireland", 78),
-        ("Elano", 82), ("Martin Petrov", 80), ("Darius Vassell", 75), ("Rolando Bianchi", 76), ("Emile Mpenza", 74),
-        ("Valeri Bojinov", 76), ("Felipe Caicedo", 73), ("Geovanni", 78), ("Dietmar Hamann", 77), ("Gelson Fernandes", 73),
-        ("Sun Jihai", 72), ("Danny Mills", 73), ("Kelvin Etuhu", 68)
-    ],
-    "Manchester United": [
-        ("Edwin van der Sar", 86), ("Tomasz Kuszczak", 76), ("Rio Ferdinand", 87), ("Nemanja Vidic", 85), ("Patrice Evra", 84),
-        ("Gary Neville", 81), ("Wes Brown", 78), ("John O'Shea", 77), ("Mikael Silvestre", 80), ("Gerard Pique", 82),
-        ("Michael Carrick", 83), ("Paul Scholes", 86), ("Owen Hargreaves", 82), ("Anderson", 79), ("Ryan Giggs", 84),
-        ("Cristiano Ronaldo", 91), ("Wayne Rooney", 88), ("Carlos Tevez", 85), ("Louis Saha", 81), ("Alan Smith", 78),
-        ("Ole Gunnar Solskjaer", 82), ("Ji-sung Park", 79), ("Nani", 80), ("Darren Fletcher", 78), ("Danny Welbeck", 65),
-        ("Rafael", 70), ("Fabio", 70), ("John O'Shea", 77)
-    ],
-    "Middlesbrough": [
-        ("Mark Schwarzer", 79), ("Ross Turnbull", 68), ("David Wheater", 73), ("Robert Huth", 77), ("Emanuel Pogatetz", 75),
-        ("Jonathan Woodgate", 79), ("Luke Young", 77), ("Andrew Taylor", 71), ("Stewart Downing", 78), ("Gary O'Neil", 75),
-        ("Fabio Rochemback", 75), ("George Boateng", 77), ("Julio Arca", 75), ("Tuncay Sanli", 77), ("Jeremie Aliadiere", 74),
-        ("Mido", 78), ("Dong-Gook Lee", 72), ("Tom Craddock", 66), ("Adam Johnson", 72), ("Lee Cattermole", 71),
-        ("Matthew Bates", 70), ("Chris Riggott", 73), ("Seventh Hines", 65)
-    ],
-    "Newcastle United": [
-        ("Steve Harper", 75), ("Shay Given", 82), ("Steven Taylor", 75), ("Habib Beye", 76), ("Jose Enrique", 77),
-        ("Charles N'Zogbia", 77), ("Geremi", 76), ("Nicky Butt", 76), ("Joey Barton", 78), ("James Milner", 77),
-        ("Damien Duff", 79), ("Obafemi Martins", 80), ("Michael Owen", 82), ("Mark Viduka", 78), ("Alan Smith", 75),
-        ("Shola Ameobi", 73), ("Peter Lovenkrands", 74), ("Andy Carroll", 68), ("David Edgar", 69), ("Fabricio Coloccini", 79),
-        ("Jonas Gutierrez", 77), ("Danny Guthrie", 72), ("Sebastien Bassong", 73)
-    ],
-    "Portsmouth": [
-        ("David James", 80), ("Jamie Ashdown", 69), ("Sol Campbell", 82), ("Sylvain Distin", 79), ("Glen Johnson", 78),
-        ("Hermann Hreidarsson", 75), ("Noe Pamarot", 73), ("Lassana Diarra", 81), ("Sulley Muntari", 79), ("Papa Bouba Diop", 77),
-        ("Niko Kranjcar", 80), ("John Utaka", 77), ("Benjani", 76), ("Jermain Defoe", 81), ("Dave Nugent", 73),
-        ("Nwankwo Kanu", 76), ("Matthew Taylor", 75), ("Sean Davis", 75), ("Richard Hughes", 74), ("Pedro Mendes", 76),
-        ("Glen Little", 72), ("Djimi Traore", 73), ("Lauren", 75)
-    ],
-    "Reading": [
-        ("Marcus Hahnemann", 77), ("Adam Federici", 70), ("Ibrahima Sonko", 74), ("Michael Duberry", 73), ("Nick Shorey", 76),
-        ("Graeme Murty", 73), ("Liam Rosenior", 72), ("James Harper", 75), ("Stephen Hunt", 75), ("Bobby Convey", 74),
-        ("John Oster", 73), ("Kevin Doyle", 77), ("Dave Kitson", 75), ("Leroy Lita", 74), ("Shane Long", 72),
-        ("Nicky Forster", 72), ("Kalifa Cisse", 73), ("Brynjar Gunnarsson", 73), ("Andre Bikey", 74), ("Emerse Fae", 75),
-        ("Ulises de la Cruz", 72), ("Glen Little", 72), ("Marek Matejovsky", 74)
-    ],
-    "Sunderland": [
-        ("Craig Gordon", 79), ("Darren Ward", 70), ("Nyron Nosworthy", 72), ("Jonny Evans", 74), ("Danny Collins", 72),
-        ("Paul McShane", 72), ("Greg Halford", 70), ("Liam Miller", 73), ("Dean Whitehead", 73), ("Kieran Richardson", 76),
-        ("Carlos Edwards", 73), ("Daryl Murphy", 71), ("Kenwyne Jones", 76), ("Michael Chopra", 73), ("Roy O'Donovan", 70),
-        ("Anthony Stokes", 71), ("Dwight Yorke", 75), ("Grant Leadbitter", 72), ("Ross Wallace", 72), ("Andy Reid", 75),
-        ("David Connolly", 73), ("Marton Fulop", 72), ("Phil Bardsley", 72)
-    ],
-    "Tottenham Hotspur": [
-        ("Paul Robinson", 80), ("Radek Cerny", 72), ("Ledley King", 82), ("Michael Dawson", 78), ("Younes Kaboul", 75),
-        ("Gareth Bale", 72), ("Pascal Chimbonda", 78), ("Alan Hutton", 75), ("Jermaine Jenas", 79), ("Tom Huddlestone", 76),
-        ("Didier Zokora", 77), ("Aaron Lennon", 80), ("Steed Malbranque", 78), ("Robbie Keane", 82), ("Dimitar Berbatov", 85),
-        ("Darren Bent", 79), ("Adel Taarabt", 70), ("Teemu Tainio", 74), ("Jamie O'Hara", 72), ("Giovani dos Santos", 75),
-        ("Heurelho Gomes", 78)
-    ],
-    "West Ham United": [
-        ("Robert Green", 79), ("Richard Wright", 73), ("Anton Ferdinand", 76), ("Matthew Upson", 78), ("Lucas Neill", 77),
-        ("George McCartney", 75), ("Jonathan Spector", 72), ("Mark Noble", 75), ("Scott Parker", 79), ("Hayden Mullins", 73),
-        ("Freddie Ljungberg", 79), ("Matthew Etherington", 76), ("Craig Bellamy", 79), ("Dean Ashton", 78), ("Carlton Cole", 75),
-        ("Bobby Zamora", 75), ("Henri Camara", 73), ("Nolberto Solano", 77), ("Julien Faubert", 76), ("Kieron Dyer", 77),
-        ("Lee Bowyer", 75), ("Nigel Quashie", 73), ("Calum Davenport", 72)
-    ],
-    "Wigan Athletic": [
-        ("Chris Kirkland", 77), ("Mike Pollitt", 69), ("Titus Bramble", 73), ("Paul Scharner", 76), ("Mario Melchiot", 76),
-        ("Emmerson Boyce", 72), ("Kevin Kilbane", 75), ("Antonio Valencia", 78), ("Jason Koumas", 77), ("Michael Brown", 74),
-        ("Ryan Taylor", 72), ("Emile Heskey", 76), ("Marlon King", 74), ("Marcus Bent", 72), ("Julius Aghahowa", 73),
-        ("Amr Zaki", 75), ("Henri Camara", 73), ("Daniel de Ridder", 71), ("Tomasz Cywka", 68), ("Erik Edman", 73),
-        ("Andreas Granqvist", 73), ("Lewis Montrose", 65)
-    ]
-}
+# Индексы календарей: матч команды в туре без перебора пар (кэш по содержимому календаря)
+FIXTURE_INDEXES = FixtureIndexCache()
 
-# Названия стадионов команд сезона 2007-08
-STADIUMS_2007_08 = {
-    "Arsenal": "Emirates Stadium",
-    "Aston Villa": "Villa Park",
-    "Birmingham City": "St. Andrew's",
-    "Blackburn Rovers": "Ewood Park",
-    "Bolton Wanderers": "Reebok Stadium",
-    "Chelsea": "Stamford Bridge",
-    "Derby County": "Pride Park Stadium",
-    "Everton": "Goodison Park",
-    "Fulham": "Craven Cottage",
-    "Liverpool": "Anfield",
-    "Manchester City": "City of Manchester Stadium",
-    "Manchester United": "Old Trafford",
-    "Middlesbrough": "Riverside Stadium",
-    "Newcastle United": "St. James' Park",
-    "Portsmouth": "Fratton Park",
-    "Reading": "Madejski Stadium",
-    "Sunderland": "Stadium of Light",
-    "Tottenham Hotspur": "White Hart Lane",
-    "West Ham United": "Upton Park",
-    "Wigan Athletic": "JJB Stadium"
-}
+# Календарь АПЛ: 38 туров, каждый играет с каждым дома и в гостях,
+# не больше двух домашних или гостевых матчей подряд
+SCHEDULE_VERSION = 2
 
-# Вместимость стадионов (примерные данные сезона 2007-08)
-STADIUM_CAPACITIES_2007_08 = {
-    "Arsenal": 60432,
-    "Aston Villa": 42640,
-    "Birmingham City": 30016,
-    "Blackburn Rovers": 31367,
-    "Bolton Wanderers": 28723,
-    "Chelsea": 42449,
-    "Derby County": 33597,
-    "Everton": 40157,
-    "Fulham": 19359,
-    "Liverpool": 45362,
-    "Manchester City": 47726,
-    "Manchester United": 76212,
-    "Middlesbrough": 35049,
-    "Newcastle United": 52387,
-    "Portsmouth": 20599,
-    "Reading": 24161,
-    "Sunderland": 48707,
-    "Tottenham Hotspur": 36240,
-    "West Ham United": 35447,
-    "Wigan Athletic": 25138
-}
+@lru_cache(maxsize=None)
+def get_match_fixtures():
+    """Индекс текущего календаря (строится при первом обращении)"""
+    return FIXTURE_INDEXES.get(round_robin(TEAMS).rounds)
 
-# Логотипы команд АПЛ 2007-08 (множественные источники)
-TEAM_LOGOS = {
-    "Arsenal": "https://upload.wikimedia.org/wikipedia/en/thumb/5/53/Arsenal_FC.svg/200px-Arsenal_FC.svg.png",
-    "Aston Villa": "https://a.espncdn.com/i/teamlogos/soccer/500/362.png",
-    "Birmingham City": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/soccer/500/392.png",
-    "Blackburn Rovers": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/soccer/500/365.png",
-    "Bolton Wanderers": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/soccer/500/358.png",
-    "Chelsea": "https://upload.wikimedia.org/wikipedia/en/thumb/c/cc/Chelsea_FC.svg/200px-Chelsea_FC.svg.png",
-    "Derby County": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/soccer/500/374.png",
-    "Everton": "https://upload.wikimedia.org/wikipedia/en/thumb/7/7c/Everton_FC_logo.svg/200px-Everton_FC_logo.svg.png",
-    "Fulham": "https://upload.wikimedia.org/wikipedia/en/thumb/e/eb/Fulham_FC_%28shield%29.svg/200px-Fulham_FC_%28shield%29.svg.png",
-    "Liverpool": "https://upload.wikimedia.org/wikipedia/en/thumb/0/0c/Liverpool_FC.svg/200px-Liverpool_FC.svg.png",
-    "Manchester City": "https://upload.wikimedia.org/wikipedia/en/thumb/e/eb/Manchester_City_FC_badge.svg/200px-Manchester_City_FC_badge.svg.png",
-    "Manchester United": "https://upload.wikimedia.org/wikipedia/en/thumb/7/7a/Manchester_United_FC_crest.svg/200px-Manchester_United_FC_crest.svg.png",
-    "Middlesbrough": "https://upload.wikimedia.org/wikipedia/en/thumb/2/2c/Middlesbrough_FC_crest.svg/200px-Middlesbrough_FC_crest.svg.png",
-    "Newcastle United": "https://upload.wikimedia.org/wikipedia/en/thumb/5/56/Newcastle_United_Logo.svg/200px-Newcastle_United_Logo.svg.png",
-    "Portsmouth": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/soccer/500/385.png",
-    "Reading": "https://upload.wikimedia.org/wikipedia/en/thumb/1/11/Reading_FC.svg/200px-Reading_FC.svg.png",
-    "Sunderland": "https://a.espncdn.com/i/teamlogos/soccer/500/366.png",
-    "Tottenham Hotspur": "https://upload.wikimedia.org/wikipedia/en/thumb/b/b4/Tottenham_Hotspur.svg/200px-Tottenham_Hotspur.svg.png",
-    "West Ham United": "https://a.espncdn.com/i/teamlogos/soccer/500/371.png",
-    "Wigan Athletic": "https://upload.wikimedia.org/wikipedia/en/thumb/4/43/Wigan_Athletic.svg/200px-Wigan_Athletic.svg.png"
-}
+@lru_cache(maxsize=None)
+def get_legacy_fixtures():
+    """Индекс календаря карьер, начатых до SCHEDULE_VERSION 2 (без чередования
+    хозяев) - их оставшиеся туры не меняются. Строится, только если такая карьера загружена"""
+    return FIXTURE_INDEXES.get(round_robin(TEAMS, balanced=False).rounds)
+
+# Составы команд: команда -> [(имя, рейтинг)]
+SQUADS_2007_08 = FOOTBALL_DATA.section('squads')
+
+# Стадионы и их вместимость нужны только финансам - загружаются при первом обращении
+STADIUMS_2007_08 = FOOTBALL_DATA.lazy('stadiums')
+STADIUM_CAPACITIES_2007_08 = FOOTBALL_DATA.lazy('stadium_capacities')
+
+# Реестр игроков: записи со стабильными id и индексы составов (позиции,
+# имя -> индекс в составе) строятся один раз при первом обращении
+PLAYER_REGISTRY = PlayerRegistry(SQUADS_2007_08, classify_player_position)
+
+# Сила команд (рейтинг стартового состава, средний, по линиям) по схемам -
+# по составам реестра, как и составы команд ИИ
+TEAM_STRENGTH = TeamStrengthCache(PLAYER_REGISTRY.squad, optimal_lineup)
 
-# Запасные логотипы (PNG вместо SVG для лучшей совместимости)
-TEAM_LOGOS_FALLBACK = {
-    "Arsenal": "https://upload.wikimedia.org/wikipedia/en/thumb/5/53/Arsenal_FC.svg/120px-Arsenal_FC.svg.png",
-    "Aston Villa": "https://upload.wikimedia.org/wikipedia/en/thumb/f/f9/Aston_Villa_FC_crest.svg/120px-Aston_Villa_FC_crest.svg.png",
-    "Birmingham City": "https://upload.wikimedia.org/wikipedia/en/thumb/6/6c/Birmingham_City_FC_logo.svg/120px-Birmingham_City_FC_logo.svg.png",
-    "Blackburn Rovers": "https://upload.wikimedia.org/wikipedia/en/thumb/0/0f/Blackburn_Rovers_FC_logo.svg/120px-Blackburn_Rovers_FC_logo.svg.png",
-    "Bolton Wanderers": "https://upload.wikimedia.org/wikipedia/en/thumb/3/37/Bolton_Wanderers_FC_logo.svg/120px-Bolton_Wanderers_FC_logo.svg.png",
-    "Chelsea": "https://upload.wikimedia.org/wikipedia/en/thumb/c/cc/Chelsea_FC.svg/120px-Chelsea_FC.svg.png",
-    "Derby County": "https://upload.wikimedia.org/wikipedia/en/thumb/4/4c/Derby_County_crest.svg/120px-Derby_County_crest.svg.png",
-    "Everton": "https://upload.wikimedia.org/wikipedia/en/thumb/7/7c/Everton_FC_logo.svg/120px-Everton_FC_logo.svg.png",
-    "Fulham": "https://upload.wikimedia.org/wikipedia/en/thumb/e/eb/Fulham_FC_%28shield%29.svg/120px-Fulham_FC_%28shield%29.svg.png",
-    "Liverpool": "https://upload.wikimedia.org/wikipedia/en/thumb/0/0c/Liverpool_FC.svg/120px-Liverpool_FC.svg.png",
-    "Manchester City": "https://upload.wikimedia.org/wikipedia/en/thumb/e/eb/Manchester_City_FC_badge.svg/120px-Manchester_City_FC_badge.svg.png",
-    "Manchester United": "https://upload.wikimedia.org/wikipedia/en/thumb/7/7a/Manchester_United_FC_crest.svg/120px-Manchester_United_FC_crest.svg.png",
-    "Middlesbrough": "https://upload.wikimedia.org/wikipedia/en/thumb/2/2c/Middlesbrough_FC_crest.svg/120px-Middlesbrough_FC_crest.svg.png",
-    "Newcastle United": "https://upload.wikimedia.org/wikipedia/en/thumb/5/56/Newcastle_United_Logo.svg/120px-Newcastle_United_Logo.svg.png",
-    "Portsmouth": "https://upload.wikimedia.org/wikipedia/en/thumb/4/40/Portsmouth_FC_crest.svg/120px-Portsmouth_FC_crest.svg.png",
-    "Reading": "https://upload.wikimedia.org/wikipedia/en/thumb/1/11/Reading_FC.svg/120px-Reading_FC.svg.png",
-    "Sunderland": "https://upload.wikimedia.org/wikipedia/en/thumb/2/2b/Sunderland_AFC_crest.svg/120px-Sunderland_AFC_crest.svg.png",
-    "Tottenham Hotspur": "https://upload.wikimedia.org/wikipedia/en/thumb/b/b4/Tottenham_Hotspur.svg/120px-Tottenham_Hotspur.svg.png",
-    "West Ham United": "https://upload.wikimedia.org/wikipedia/en/thumb/c/c2/West_Ham_United_FC_badge.svg/120px-West_Ham_United_FC_badge.svg.png",
-    "Wigan Athletic": "https://upload.wikimedia.org/wikipedia/en/thumb/4/43/Wigan_Athletic.svg/120px-Wigan_Athletic.svg.png"
+# Составы команд ИИ по схемам: собираются один раз на (команда, схема)
+AI_LINEUPS = LineupCache(PLAYER_REGISTRY.squad)
+
+def invalidate_squad_caches(team_name=None):
+    """Сбрасывает силу и составы команды (или всех команд) после изменения состава"""
+    TEAM_STRENGTH.invalidate(team_name)
+    AI_LINEUPS.invalidate(team_name)
+
+@lru_cache(maxsize=None)
+def get_round_simulator():
+    """Симулятор остальных матчей тура: бомбардиром (id игрока) становится любой полевой игрок.
+
+    Строится с первым туром - вместе с ним загружается NumPy.
+    """
+    from round_simulator import RoundSimulator
+
+    return RoundSimulator({
+        team: [(player.id, 0 if player.position == 'GK' else 1) for player in PLAYER_REGISTRY.squad(team)]
+        for team in SQUADS_2007_08
+    })
+
+# Календари и симулятор тура строятся при первом обращении; прежние имена
+# модуля (app.MATCH_SCHEDULE и т.д.) остаются для скриптов и бенчмарков
+_LAZY_GLOBALS = {
+    'MATCH_FIXTURES': get_match_fixtures,
+    'MATCH_SCHEDULE': lambda: get_match_fixtures().schedule,
+    'LEGACY_FIXTURES': get_legacy_fixtures,
+    'ROUND_SIMULATOR': get_round_simulator,
 }
 
+def __getattr__(name):
+    if name in _LAZY_GLOBALS:
+        return _LAZY_GLOBALS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_stat_key(team_name, scorer):
+    """Ключ игрока в статистике сезона: id игрока или 'команда|имя' для неизвестных"""
+    player_id = PLAYER_REGISTRY.key_of(team_name, scorer)
+    if isinstance(player_id, int):
+        return str(player_id)
+    return f"{team_name}|{scorer}"
+
+def get_stat_player(player_key):
+    """Обратное к get_stat_key: возвращает (команда, имя)"""
+    if player_key.isdigit():
+        player = PLAYER_REGISTRY[int(player_key)]
+        return player.team, player.name
+    team_name, _, player_name = player_key.partition('|')
+    return team_name, player_name
+
+def record_round_stats(season_stats, round_number, round_results, schedule):
+    """Записывает счета и голы тура в статистику сезона"""
+    fixtures = FIXTURE_INDEXES.get(schedule)
+    for result in round_results:
+        slot = fixtures.slot(round_number, result['home_team'], result['away_team'])
+        if slot is not None:
+            slot, swapped = slot
+            if swapped:
+                record_result(season_stats, round_number, slot, result['away_score'], result['home_score'])
+            else:
+                record_result(season_stats, round_number, slot, result['home_score'], result['away_score'])
+        for goal in result.get('goals', []):
+            record_goal(season_stats, get_stat_key(goal['team'], goal['scorer']))
+
+# Логотипы команд (множественные источники) и запасные PNG - при первом обращении
+TEAM_LOGOS = FOOTBALL_DATA.lazy('team_logos')
+TEAM_LOGOS_FALLBACK = FOOTBALL_DATA.lazy('team_logos_fallback')
+
 # Генерация случайных данных для игры
-def generate_game_data(team_name):
-    import random
-    
+def generate_game_data(team_name, career_seed=None):
+    """Создает данные новой карьеры. Один career_seed дает одну и ту же игру"""
+    if career_seed is None:
+        career_seed = new_career_seed()
+    rng = stream(career_seed, 'game_data', team_name)
+
     # Используем реальный состав команды из сезона 2007-08 с рейтингами FIFA 08
+    # В game_data состав - id игроков из реестра
     squad = []
     if team_name in SQUADS_2007_08:
-        for player_data in SQUADS_2007_08[team_name]:
-            if isinstance(player_data, tuple):
-                player_name, rating = player_data
-            else:
-                # Fallback для старых данных
-                player_name = player_data
-                rating = 70
-            squad.append({
-                "name": player_name,
-                "rating": rating
-            })
-
         # Сортируем состав по позициям для реализма
-        squad = sort_squad_by_positions(squad, team_name)
+        squad = [player.id for player in sort_squad_by_positions(list(PLAYER_REGISTRY.squad(team_name)), team_name)]
     else:
         # Fallback на случайные имена, если команда не найдена
         first_names = ["John", "James", "Michael", "David", "Robert"]
         last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones"]
         for i in range(25):
             squad.append({
-                "name": f"{random.choice(first_names)} {random.choice(last_names)}",
-                "rating": random.randint(65, 85)
+                "name": f"{rng.choice(first_names)} {rng.choice(last_names)}",
+                "rating": rng.randint(65, 85)
             })
     
     # Генерируем турнирную таблицу - все команды начинают с 0 очков
     table = []
     for team in TEAMS:
-        table.append({
-            "team": team,
-            "played": 0,
-            "won": 0,
-            "drawn": 0,
-            "lost": 0,
-            "points": 0
-        })
+        table.append(new_table_row(team))
     
     # Сортируем по очкам
     table.sort(key=lambda x: x["points"], reverse=True)
@@ -959,59 +648,41 @@ def generate_game_data(team_name):
     next_opponent = None
     is_home_match = True  # По умолчанию дома
 
-    # Определяем какой календарь использовать
-    active_schedule = session.get('custom_schedule', MATCH_SCHEDULE)
+    # Новая карьера играет по текущему календарю (или календарю нового сезона из сессии)
+    active_fixtures = get_active_fixtures({'schedule_version': SCHEDULE_VERSION})
+    schedule_seed = None
 
     # Ищем матч с участием нашей команды в текущем туре
-    if current_round <= len(active_schedule):
-        round_matches = active_schedule[current_round - 1]
-        for home, away in round_matches:
-            if home == team_name:
-                next_opponent = away
-                is_home_match = True
-                break
-            elif away == team_name:
-                next_opponent = home
-                is_home_match = False
-                break
-
-    # Если команда не играет в этом туре (все 38 туров сыграны), начинаем новый сезон
-    if not next_opponent and current_round > len(active_schedule):
-        # Сбрасываем сезон - генерируем новый календарь
-        new_schedule = generate_full_schedule()
-        # Сохраняем новый календарь в сессии для этого пользователя
-        session['custom_schedule'] = new_schedule
+    fixture = active_fixtures.fixture(team_name, current_round)
+    if fixture is not None:
+        next_opponent, is_home_match, _ = fixture
+
+    # Если команда не играет в этом туре (все туры календаря сыграны), начинаем новый сезон
+    if not next_opponent and current_round > len(active_fixtures):
+        # Сбрасываем сезон - календарь нового сезона перемешан по seed карьеры;
+        # в game_data (а значит, в сохранениях и журнале) хранится только seed,
+        # календарь строится один раз на процесс
+        schedule_seed = derive_seed(career_seed, 'schedule')
+        new_fixtures = get_seeded_fixtures(schedule_seed)
+        session.pop('schedule_seed', None)
+        session.pop('custom_schedule', None)
+        session.pop('custom_schedule_key', None)
         session['current_round'] = 1
         current_round = 1
-        game_data['current_round'] = 1
 
         # Сбрасываем таблицу
         table = []
         for team in TEAMS:
-            table.append({
-                "team": team,
-                "played": 0,
-                "won": 0,
-                "drawn": 0,
-                "lost": 0,
-                "points": 0
-            })
+            table.append(new_table_row(team))
 
         # Ищем матч в первом туре нового сезона
-        round_matches = new_schedule[0]
-        for home, away in round_matches:
-            if home == team_name:
-                next_opponent = away
-                is_home_match = True
-                break
-            elif away == team_name:
-                next_opponent = home
-                is_home_match = False
-                break
+        fixture = new_fixtures.fixture(team_name, 1)
+        if fixture is not None:
+            next_opponent, is_home_match, _ = fixture
 
     # Если все еще не нашли (редкий случай), выбираем случайного соперника
     if not next_opponent:
-        next_opponent = random.choice([t for t in TEAMS if t != team_name])
+        next_opponent = rng.choice([t for t in TEAMS if t != team_name])
     
     # Получаем название стадиона
     stadium_name = STADIUMS_2007_08.get(team_name, f"{team_name} Stadium")
@@ -1023,10 +694,10 @@ def generate_game_data(team_name):
     base_capacity = total_capacity // 4
     variation = int(total_capacity * 0.1)  # 10% вариация
     stadium_capacity = {
-        "north": base_capacity + random.randint(-variation, variation),
-        "south": base_capacity + random.randint(-variation, variation),
-        "west": base_capacity + random.randint(-variation, variation),
-        "east": base_capacity + random.randint(-variation, variation)
+        "north": base_capacity + rng.randint(-variation, variation),
+        "south": base_capacity + rng.randint(-variation, variation),
+        "west": base_capacity + rng.randint(-variation, variation),
+        "east": base_capacity + rng.randint(-variation, variation)
     }
     # Корректируем, чтобы сумма была близка к общей вместимости
     current_sum = sum(stadium_capacity.values())
@@ -1037,19 +708,19 @@ def generate_game_data(team_name):
         stadium_capacity["west"] += diff // 4
         stadium_capacity["east"] += diff - (diff // 4) * 3
     
-    ticket_price = random.randint(20, 50)
+    ticket_price = rng.randint(20, 50)
     
     # Генерируем финансовые данные
-    match_revenue = random.randint(50000, 200000)
-    tv_revenue = random.randint(100000, 500000)
-    sponsor_revenue = random.randint(200000, 800000)
-    player_wages = random.randint(300000, 800000)
-    coach_wage = random.randint(50000, 150000)
-    debts = random.randint(0, 500000)
+    match_revenue = rng.randint(50000, 200000)
+    tv_revenue = rng.randint(100000, 500000)
+    sponsor_revenue = rng.randint(200000, 800000)
+    player_wages = rng.randint(300000, 800000)
+    coach_wage = rng.randint(50000, 150000)
+    debts = rng.randint(0, 500000)
     
     total_income = match_revenue + tv_revenue + sponsor_revenue
     total_expenses = player_wages + coach_wage + debts
-    bank_balance = total_income - total_expenses + random.randint(1000000, 5000000)
+    bank_balance = total_income - total_expenses + rng.randint(1000000, 5000000)
     
     # Инициализируем выбранный состав (пустой список)
     selected_players = []
@@ -1058,6 +729,7 @@ def generate_game_data(team_name):
     points = 0
 
     return {
+        "career_seed": career_seed,
         "team_name": team_name,
         "division": "Premier League",
         "position": position,
@@ -1070,6 +742,8 @@ def generate_game_data(team_name):
         "selected_players": selected_players,
         "table": table,
         "current_round": current_round,
+        "schedule_version": SCHEDULE_VERSION,
+        "schedule_seed": schedule_seed,
         "current_tactic": "balanced",  # По умолчанию нейтральная тактика
         "stadium_data": {
             "north": stadium_capacity["north"],
@@ -1092,6 +766,272 @@ def generate_game_data(team_name):
         }
     }
 
+# Контексты идущих матчей: match_id -> составы и таблицы бомбардиров.
+# Хранятся в памяти процесса, самые старые вытесняются при превышении лимита.
+MATCH_CONTEXTS = OrderedDict()
+MAX_MATCH_CONTEXTS = 1000
+_match_contexts_lock = threading.Lock()
+
+def get_player_keys(team_name, entries):
+    """Ключи игроков (id, а для игроков не из реестра - имена) для записей состава"""
+    return [PLAYER_REGISTRY.key_of(team_name, entry) for entry in entries]
+
+def get_squad_keys(game_data):
+    """Ключи игроков состава; состав старых сохранений (словари с именами) переводится на id"""
+    squad = game_data['squad']
+    keys = get_player_keys(game_data['team_name'], squad)
+    if keys != squad and all(isinstance(key, int) for key in keys):
+        squad[:] = keys
+    return keys
+
+def get_selected_keys(game_data):
+    """Выбранный состав как ключи игроков; список в game_data обновляется на месте"""
+    selected_players = game_data.setdefault('selected_players', [])
+    keys = get_player_keys(game_data['team_name'], selected_players)
+    if keys != selected_players:
+        selected_players[:] = keys
+    return selected_players
+
+def resolve_player(game_data, key):
+    """Игрок по ключу: запись реестра или словарь {'name', 'rating'} из состава game_data"""
+    if isinstance(key, int):
+        return PLAYER_REGISTRY[key]
+    for player in game_data['squad']:
+        if isinstance(player, dict) and player.get('name') == key:
+            return player
+    return PLAYER_REGISTRY.resolve(game_data['team_name'], key)
+
+def upgrade_player_refs(game_data):
+    """Переводит состав и выбранных игроков сохранений старого формата с имен на id"""
+    if 'squad' in game_data and 'team_name' in game_data:
+        get_squad_keys(game_data)
+        get_selected_keys(game_data)
+    return game_data
+
+def build_user_lineup(game_data, rng=None):
+    """Собирает стартовый состав пользователя (если выбрано меньше 11, добирает случайных)"""
+    import random
+
+    if rng is None:
+        rng = random
+    my_squad = get_squad_keys(game_data)
+    selected_players = get_selected_keys(game_data)
+
+    if len(selected_players) < 11:
+        available_players = [key for key in my_squad if key not in selected_players]
+        needed = 11 - len(selected_players)
+        selected_players.extend(rng.sample(available_players, min(needed, len(available_players))))
+
+    in_squad = set(my_squad)
+    return [resolve_player(game_data, key) for key in selected_players[:11] if key in in_squad]
+
+def build_opponent_lineup(team_name, formation=DEFAULT_FORMATION):
+    """Оптимальный состав команды ИИ для схемы (по умолчанию 4-4-2) из кэша составов"""
+    return AI_LINEUPS.get(team_name, formation)
+
+def create_match_context(game_data):
+    """Создает контекст матча (составы и таблицы бомбардиров) и сохраняет его"""
+    my_team = game_data['team_name']
+    opponent_team = game_data['next_opponent']
+    lineup_rng = stream(get_career_seed(game_data), 'lineup', game_data.get('current_round', 1))
+    my_lineup = build_user_lineup(game_data, lineup_rng)
+    opponent_lineup = build_opponent_lineup(opponent_team)
+
+    context = {
+        'match_id': uuid.uuid4().hex,
+        'my_team': my_team,
+        'opponent_team': opponent_team,
+        'my_lineup': my_lineup,
+        'opponent_lineup': opponent_lineup,
+        'my_scorers': build_scorer_table(my_team, my_lineup),
+        'opponent_scorers': build_scorer_table(opponent_team, opponent_lineup)
+    }
+
+    with _match_contexts_lock:
+        MATCH_CONTEXTS[context['match_id']] = context
+        while len(MATCH_CONTEXTS) > MAX_MATCH_CONTEXTS:
+            MATCH_CONTEXTS.popitem(last=False)
+
+    return context
+
+def get_match_context(match_id):
+    """Возвращает контекст матча по id или None"""
+    if not match_id:
+        return None
+    with _match_contexts_lock:
+        context = MATCH_CONTEXTS.get(match_id)
+        if context is not None:
+            MATCH_CONTEXTS.move_to_end(match_id)
+        return context
+
+def drop_match_context(match_id):
+    """Удаляет контекст завершенного матча"""
+    if match_id:
+        with _match_contexts_lock:
+            MATCH_CONTEXTS.pop(match_id, None)
+
+@app.template_filter('player_name')
+def player_name(scorer):
+    """Имя игрока по id из реестра (строки - имена старых версий - как есть)"""
+    return PLAYER_REGISTRY.name(scorer)
+
+def named_match_data(match_data):
+    """Копия match_data для клиента: в голах вместо id игроков имена"""
+    return {**match_data, 'goals': [{**goal, 'scorer': player_name(goal['scorer'])} for goal in match_data['goals']]}
+
+def named_timeline(timeline):
+    """Таймлайн для клиента: в событиях голов вместо id игроков имена"""
+    return [
+        [minute, [[event[0], event[1], player_name(event[2])] if event[0] == EVENT_GOAL else event
+                  for event in events]]
+        for minute, events in timeline
+    ]
+
+def start_career_journal(game_data):
+    """Новый id карьеры в сессии и журнал, начатый с game_data"""
+    session['career_id'] = new_career_id()
+    if JOURNAL is not None:
+        JOURNAL.start(session['career_id'], game_data)
+
+
+def journal_event(event, round_results=None):
+    """Дописывает в журнал карьеры изменения game_data после события.
+
+    round_results - результаты тура, по которым журнал сам пересчитает таблицу.
+    """
+    if JOURNAL is not None and 'career_id' in session:
+        results = None
+        if round_results is not None:
+            results = [[r['home_team'], r['away_team'], r['home_score'], r['away_score']] for r in round_results]
+        JOURNAL.record(session['career_id'], event, session['game_data'], results)
+
+
+def get_career_seed(game_data):
+    """Seed карьеры; сохранениям из старых версий назначается новый"""
+    if 'career_seed' not in game_data:
+        game_data['career_seed'] = new_career_seed()
+    return game_data['career_seed']
+
+def get_match_seed(career_seed, round_number, home, away):
+    """Seed матча: один и тот же при игре в /match и при доигрывании сезона"""
+    return derive_seed(career_seed, 'match', round_number, home, away)
+
+def get_next_match_seed(game_data):
+    """Seed следующего матча пользователя (по туру и сопернику из game_data)"""
+    my_team = game_data['team_name']
+    opponent_team = game_data['next_opponent']
+    home, away = (my_team, opponent_team) if game_data.get('is_home_match', True) else (opponent_team, my_team)
+    return get_match_seed(get_career_seed(game_data), game_data.get('current_round', 1), home, away)
+
+def get_seeded_fixtures(schedule_seed):
+    """Индекс календаря, перемешанного по schedule_seed"""
+    schedule = round_robin(TEAMS, schedule_seed)
+    return FIXTURE_INDEXES.get(schedule.rounds, schedule.key)
+
+def drop_session_schedule():
+    """Забывает календарь прежней карьеры в сессии: загруженная карьера берет свой из game_data"""
+    for key in ('custom_schedule', 'custom_schedule_key', 'schedule_seed'):
+        session.pop(key, None)
+
+def get_active_fixtures(game_data):
+    """Индекс календаря текущего сезона карьеры game_data"""
+    schedule_seed = game_data.get('schedule_seed')
+    if schedule_seed is None:
+        # Сессии, где seed календаря хранился вне game_data
+        schedule_seed = session.get('schedule_seed')
+    if schedule_seed is not None:
+        return get_seeded_fixtures(schedule_seed)
+    schedule = session.get('custom_schedule')
+    if schedule is None:
+        # Карьеры без schedule_version начаты до чередования хозяев
+        if game_data.get('schedule_version') == SCHEDULE_VERSION:
+            return get_match_fixtures()
+        return get_legacy_fixtures()
+    # Календарь нового сезона из сессий до schedule_seed
+    key = session.get('custom_schedule_key')
+    fixtures = FIXTURE_INDEXES.get(schedule, key)
+    if key is None:
+        # Календарь из старой сессии - запоминаем ключ, чтобы не считать его заново
+        session['custom_schedule_key'] = fixtures.key
+    return fixtures
+
+def get_round_fixture(schedule, round_number, team_name):
+    """Возвращает (соперник, играем ли дома) команды в туре или (None, True)"""
+    fixture = FIXTURE_INDEXES.get(schedule).fixture(team_name, round_number)
+    if fixture is None:
+        return None, True
+    return fixture[0], fixture[1]
+
+def simulate_user_fixture(game_data, home, away, my_lineup, seed=None, opponent_lineup=None):
+    """Матч пользователя без интерфейса: тот же движок и бомбардиры, что в /match"""
+    my_team = game_data['team_name']
+    opponent_team = away if home == my_team else home
+    if opponent_lineup is None:
+        opponent_lineup = build_opponent_lineup(opponent_team)
+    my_scorers = build_scorer_table(my_team, my_lineup)
+    opponent_scorers = build_scorer_table(opponent_team, opponent_lineup)
+
+    def pick_my_scorer(goals, rng):
+        return select_scorer_from_table(my_team, my_scorers, goals, rng)
+
+    def pick_opponent_scorer(goals, rng):
+        return select_scorer_from_table(opponent_team, opponent_scorers, goals, rng)
+
+    match_data = simulate_match(my_team, opponent_team, pick_my_scorer, pick_opponent_scorer,
+                                tactic=game_data.get('current_tactic', 'balanced'),
+                                seed=seed)['match_data']
+    if home == my_team:
+        home_score, away_score = match_data['my_score'], match_data['opponent_score']
+    else:
+        home_score, away_score = match_data['opponent_score'], match_data['my_score']
+
+    return {
+        'home_team': home,
+        'away_team': away,
+        'home_score': home_score,
+        'away_score': away_score,
+        'goals': match_data['goals'],
+        'is_user_match': True
+    }
+
+def simulate_season_to_end(game_data, season_stats, schedule, start_round, seed=None):
+    """Доигрывает все туры с start_round до конца расписания, включая матчи пользователя.
+
+    Изменяет game_data (таблица, место, тур) и season_stats на месте.
+    Возвращает (результаты последнего тура, season_end_data).
+    seed заменяет seed карьеры; без него матчи совпадают с сыгранными
+    через /match_action с действием 'simulate'.
+    """
+    career_seed = get_career_seed(game_data) if seed is None else seed
+    my_team = game_data['team_name']
+    my_lineup = build_user_lineup(game_data, stream(career_seed, 'lineup', start_round))
+    fixtures = FIXTURE_INDEXES.get(schedule)
+    # Составы всех соперников - одним вызовом на сезон
+    opponent_lineups = AI_LINEUPS.get_many(TEAMS)
+
+    round_results = []
+    for round_number in range(start_round, len(schedule) + 1):
+        round_results = []
+        fixture = fixtures.fixture(my_team, round_number)
+        if fixture is not None:
+            opponent, is_home, _ = fixture
+            home, away = (my_team, opponent) if is_home else (opponent, my_team)
+            match_seed = get_match_seed(career_seed, round_number, home, away)
+            round_results.append(simulate_user_fixture(game_data, home, away, my_lineup, seed=match_seed,
+                                                       opponent_lineup=opponent_lineups.get(opponent)))
+        other_matches = fixtures.other_fixtures(round_number, my_team)
+        round_results.extend(get_round_simulator().simulate(other_matches, numpy_stream(career_seed, 'round', round_number)))
+
+        record_round_stats(season_stats, round_number, round_results, schedule)
+        apply_league_results(game_data, round_results)
+
+    game_data['current_round'] = max(start_round, len(schedule) + 1)
+    season_end_data = {
+        'final_position': game_data.get('position'),
+        'team_name': my_team
+    }
+    return round_results, season_end_data
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -1133,15 +1073,20 @@ def start_game():
         # Очищаем старые данные тура для новой игры
         session.pop('current_round', None)
         session.pop('custom_schedule', None)
-        session.pop('match_results', None)  # Очищаем результаты предыдущих матчей
+        session.pop('custom_schedule_key', None)
+        session.pop('schedule_seed', None)
+        session.pop('match_results', None)  # Результаты матчей из старых версий игры
+        session.pop('season_stats', None)  # Очищаем статистику предыдущего сезона
         session.pop('last_round_results', None)  # Очищаем результаты последнего тура
 
         print(f"DEBUG start_game: calling generate_game_data for {team_name}")
-        game_data = generate_game_data(team_name)
+        # Необязательный seed карьеры - для воспроизводимых прогонов (QA)
+        game_data = generate_game_data(team_name, request.form.get('seed', type=int))
         print(f"DEBUG start_game: game_data generated successfully")
 
         session['game_data'] = game_data
         session['current_round'] = game_data['current_round']
+        start_career_journal(game_data)
 
         print(f"DEBUG start_game: redirecting to game_page")
         return redirect(url_for('game_page', page=1))
@@ -1179,17 +1124,18 @@ def game_page(page):
     # Для страницы состава: если нет выбранных игроков, берем первых 11
     if page == 3:
         if not game_data.get('selected_players'):
-            game_data['selected_players'] = [p['name'] for p in game_data['squad'][:11]]
+            game_data['selected_players'] = get_squad_keys(game_data)[:11]
             session['game_data'] = game_data
     
     if page == 1:
-        return render_template('game_page1.html', data=game_data)
+        return render_template('game_page1.html', data=game_data, total_rounds=len(get_active_fixtures(game_data)))
     elif page == 2:
         return render_template('game_page2.html', data=game_data)
     elif page == 3:
         # Вычисляем реальные позиции для всех игроков в составе
         squad_with_positions = []
-        for i, player in enumerate(game_data['squad']):
+        for i, key in enumerate(get_squad_keys(game_data)):
+            player = resolve_player(game_data, key)
             real_position = get_player_position(game_data['team_name'], i)
             # Преобразуем в русские обозначения
             if real_position == 'GK':
@@ -1203,12 +1149,11 @@ def game_page(page):
             else:
                 real_pos_display = 'В'  # fallback
 
-            player_copy = player.copy()
-            player_copy['real_position'] = real_pos_display
-            squad_with_positions.append(player_copy)
+            squad_with_positions.append({**player, 'key': key, 'real_position': real_pos_display})
 
         game_data_copy = game_data.copy()
         game_data_copy['squad'] = squad_with_positions
+        game_data_copy['selected_players'] = get_selected_keys(game_data)
 
         return render_template('game_page3.html', data=game_data_copy)
     elif page == 4:
@@ -1236,15 +1181,14 @@ def save_game():
         if 'game_data' not in session:
             return jsonify({"success": False, "message": "Нет данных для сохранения"})
 
-        save_dir = 'saves'
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
+        if not os.path.exists(SAVE_DIR):
+            os.makedirs(SAVE_DIR)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{save_dir}/save_{timestamp}.json"
+        filename = f"save_{timestamp}{SAVE_EXTENSION}"
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(session['game_data'], f, ensure_ascii=False, indent=2)
+        game_data = session['game_data']
+        SAVE_CATALOG.add(filename, game_data, lambda path: write_save(path, game_data, SAVE_COMPRESSION))
 
         return jsonify({"success": True, "message": "Игра сохранена!"})
 
@@ -1264,6 +1208,8 @@ def restore_game():
         # Убеждаемся, что selected_players определен
         if 'selected_players' not in game_data:
             game_data['selected_players'] = []
+        upgrade_player_refs(game_data)
+        start_career_journal(game_data)
 
         return jsonify({"success": True, "message": "Игра восстановлена успешно"})
 
@@ -1280,24 +1226,14 @@ def load_game():
         # На Vercel показываем пустой список - сохранения обрабатываются JavaScript
         return render_template('load_game.html', saves=[], is_vercel=True)
 
-    save_dir = 'saves'
-    if not os.path.exists(save_dir):
-        return render_template('load_game.html', saves=[])
-    
-    saves = []
-    for filename in os.listdir(save_dir):
-        if filename.endswith('.json'):
-            filepath = os.path.join(save_dir, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-                saves.append({
-                    "filename": filename,
-                    "team": save_data.get('team_name', 'Unknown'),
-                    "timestamp": filename.replace('save_', '').replace('.json', '')
-                })
-    
-    saves.sort(key=lambda x: x['timestamp'], reverse=True)
-    return render_template('load_game.html', saves=saves)
+    # Сведения о сохранениях берем из каталога, файлы целиком не читаем
+    page = request.args.get('page', 1, type=int)
+    saves, page, pages = SAVE_CATALOG.page(page, SAVES_PER_PAGE)
+    careers = [
+        (career_id, team, datetime.fromtimestamp(updated).strftime("%d.%m.%Y %H:%M"))
+        for career_id, team, updated in (JOURNAL.careers(RECENT_CAREERS) if JOURNAL is not None else [])
+    ]
+    return render_template('load_game.html', saves=saves, page=page, pages=pages, careers=careers)
 
 @app.route('/load_game_file/<filename>')
 def load_game_file(filename):
@@ -1314,6 +1250,8 @@ def load_game_file(filename):
                     # Инициализируем selected_players, если его нет в сохранении
                     if 'selected_players' not in game_data:
                         game_data['selected_players'] = []
+                    upgrade_player_refs(game_data)
+                    drop_session_schedule()
                     session['game_data'] = game_data
                     session['current_round'] = game_data.get('current_round', 1)
                     return redirect(url_for('game_page', page=1))
@@ -1321,35 +1259,63 @@ def load_game_file(filename):
         return redirect(url_for('load_game'))
     else:
         # Загружаем с диска (локально)
-        save_dir = 'saves'
-        filepath = os.path.join(save_dir, filename)
+        filepath = os.path.join(SAVE_DIR, filename)
 
         if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                game_data = json.load(f)
+            # Старые сохранения (JSON) и новые (.sav) различаются по заголовку
+            try:
+                game_data = read_save(filepath)
+            except (SaveFormatError, OSError) as e:
+                print(f"Error loading save {filename}: {e}")
+                return redirect(url_for('load_game'))
             # Инициализируем selected_players, если его нет в сохранении
             if 'selected_players' not in game_data:
                 game_data['selected_players'] = []
+            upgrade_player_refs(game_data)
+            drop_session_schedule()
             session['game_data'] = game_data
             session['current_round'] = game_data.get('current_round', 1)
+            start_career_journal(game_data)
             return redirect(url_for('game_page', page=1))
         else:
             return redirect(url_for('load_game'))
 
+@app.route('/resume_career/<career_id>')
+def resume_career(career_id):
+    """Продолжает карьеру с последнего состояния из журнала"""
+    if JOURNAL is None:
+        return redirect(url_for('load_game'))
+    try:
+        game_data = JOURNAL.load(career_id)
+    except ValueError:
+        game_data = None
+    if game_data is None:
+        return redirect(url_for('load_game'))
+
+    for key in ('match_data', 'custom_schedule', 'custom_schedule_key', 'schedule_seed', 'season_stats', 'last_round_results'):
+        session.pop(key, None)
+    drop_match_context(session.pop('match_id', None))
+    session['game_data'] = upgrade_player_refs(game_data)
+    session['current_round'] = game_data.get('current_round', 1)
+    session['career_id'] = career_id
+    return redirect(url_for('game_page', page=1))
+
 @app.route('/update_lineup', methods=['POST'])
 def update_lineup():
     if 'game_data' not in session:
         return jsonify({"success": False, "message": "Нет данных игры"})
     
     data = request.json
-    player_order = data.get('player_order', [])  # Список имен игроков в порядке
+    player_order = data.get('player_order', [])  # Список id игроков в порядке (или имен)
     
     game_data = session['game_data']
     
     # Обновляем порядок игроков (первые 11 - основной состав)
-    game_data['selected_players'] = player_order[:11]
+    player_order = [int(key) if isinstance(key, str) and key.isdigit() else key for key in player_order[:11]]
+    game_data['selected_players'] = get_player_keys(game_data['team_name'], player_order)
     
     session['game_data'] = game_data
+    journal_event('update_lineup')
     return jsonify({
         "success": True,
         "selected_count": len(game_data['selected_players']),
@@ -1361,25 +1327,28 @@ def pre_match():
     if 'game_data' not in session:
         return redirect(url_for('index'))
     
-    import random
     from datetime import datetime, timedelta
     game_data = session['game_data']
+    current_round = session.get('current_round', game_data.get('current_round', 1))
+    # Добор состава, время и посещаемость - из потока карьеры для этого тура
+    rng = stream(get_career_seed(game_data), 'pre_match', current_round)
     
     # Получаем состав своей команды
     my_team = game_data['team_name']
-    my_squad = game_data['squad']
-    selected_players = game_data.get('selected_players', [])
+    my_squad = get_squad_keys(game_data)
+    selected_players = get_selected_keys(game_data)
     
     # Если выбрано меньше 11 игроков, добавляем случайных
     if len(selected_players) < 11:
-        available_players = [p['name'] for p in my_squad if p['name'] not in selected_players]
+        available_players = [key for key in my_squad if key not in selected_players]
         needed = 11 - len(selected_players)
-        selected_players.extend(random.sample(available_players, min(needed, len(available_players))))
+        selected_players.extend(rng.sample(available_players, min(needed, len(available_players))))
     
     # Получаем информацию о выбранных игроках в том порядке, в котором они были расставлены
     my_lineup = []
-    for i, player_name in enumerate(selected_players[:11]):
-        player_info = next((p for p in my_squad if p['name'] == player_name), None)
+    in_squad = set(my_squad)
+    for i, key in enumerate(selected_players[:11]):
+        player_info = resolve_player(game_data, key) if key in in_squad else None
         if player_info:
             # Определяем позицию на основе места в списке: 1=В, 2-5=З, 6-9=П, 10-11=Н
             if i == 0:
@@ -1414,32 +1383,18 @@ def pre_match():
     
     # Генерируем состав соперника
     opponent_team = game_data['next_opponent']
-    opponent_squad = []
-    if opponent_team in SQUADS_2007_08:
-        for player_data in SQUADS_2007_08[opponent_team]:
-            if isinstance(player_data, tuple):
-                player_name, rating = player_data
-            else:
-                player_name = player_data
-                rating = 70
-            opponent_squad.append({
-                "name": player_name,
-                "rating": rating
-            })
-    
-    # Формируем оптимальный состав
-    opponent_lineup = create_optimal_lineup(opponent_squad, opponent_team)
+    opponent_lineup = build_opponent_lineup(opponent_team)
     
     # Генерируем информацию о матче
     stadium_name = game_data.get('stadium', f"{my_team} Stadium")
     stadium_capacity = game_data.get('stadium_data', {}).get('total', 50000)
     
     # Время начала матча (случайное между 15:00 и 20:00)
-    match_hour = random.randint(15, 20)
+    match_hour = rng.randint(15, 20)
     match_time = f"{match_hour}:00"
     
     # Посещаемость (70-95% от вместимости)
-    attendance_percent = random.randint(70, 95)
+    attendance_percent = rng.randint(70, 95)
     attendance = int(stadium_capacity * attendance_percent / 100)
     
     return render_template('pre_match.html', 
@@ -1459,64 +1414,20 @@ def match():
     if 'game_data' not in session:
         return redirect(url_for('index'))
     
-    import random
     game_data = session['game_data']
     
     my_team = game_data['team_name']
     opponent_team = game_data['next_opponent']
     
-    # Получаем составы
-    my_squad = game_data['squad']
-    selected_players = game_data.get('selected_players', [])
-    
-    # Если выбрано меньше 11 игроков, добавляем случайных
-    if len(selected_players) < 11:
-        available_players = [p['name'] for p in my_squad if p['name'] not in selected_players]
-        needed = 11 - len(selected_players)
-        selected_players.extend(random.sample(available_players, min(needed, len(available_players))))
-    
-    my_lineup = []
-    for player_name in selected_players[:11]:
-        player_info = next((p for p in my_squad if p['name'] == player_name), None)
-        if player_info:
-            my_lineup.append(player_info)
-    
-    # Генерируем состав соперника
-    opponent_squad = []
-    if opponent_team in SQUADS_2007_08:
-        for player_data in SQUADS_2007_08[opponent_team]:
-            if isinstance(player_data, tuple):
-                player_name, rating = player_data
-            else:
-                player_name = player_data
-                rating = 70
-            opponent_squad.append({
-                "name": player_name,
-                "rating": rating
-            })
-    
-    # Формируем оптимальный состав: 1 GK + 4 DEF + 4 MID + 2 FWD = 11 игроков
-    opponent_lineup = create_optimal_lineup(opponent_squad, opponent_team)
+    # Получаем составы и готовим контекст матча для тиков
+    context = create_match_context(game_data)
+    session['match_id'] = context['match_id']
+    my_lineup = context['my_lineup']
+    opponent_lineup = context['opponent_lineup']
     
     # Всегда создаем новые данные матча при заходе на страницу матча
     # Это гарантирует, что матч начинается с нуля
-    session['match_data'] = {
-        'my_team': my_team,
-        'opponent_team': opponent_team,
-        'my_score': 0,
-        'opponent_score': 0,
-        'goals': [],
-        'half': 1,
-        'minute': 0,
-        'possession_my': 50,
-        'possession_opponent': 50,
-        'shots_my': 0,
-        'shots_opponent': 0,
-        'shots_on_target_my': 0,
-        'shots_on_target_opponent': 0,
-        'xg_my': 0.0,
-        'xg_opponent': 0.0
-    }
+    session['match_data'] = new_match_data(my_team, opponent_team)
     
     match_data = session['match_data']
     
@@ -1536,6 +1447,7 @@ def match():
     return render_template('match.html',
                          my_team=my_team,
                          opponent_team=opponent_team,
+                         match_id=context['match_id'],
                          match_data=match_data,
                          my_lineup=my_lineup,
                          opponent_lineup=opponent_lineup,
@@ -1548,6 +1460,59 @@ def match():
                          TEAM_LOGOS=TEAM_LOGOS,
                          TEAM_LOGOS_FALLBACK=TEAM_LOGOS_FALLBACK)
 
+def get_scorer_pickers(context):
+    """Функции выбора бомбардиров (goals, rng) -> id для обеих команд матча"""
+    my_team = context['my_team']
+    opponent_team = context['opponent_team']
+
+    def pick_my_scorer(goals, rng):
+        return select_scorer_from_table(my_team, context['my_scorers'], goals, rng)
+
+    def pick_opponent_scorer(goals, rng):
+        return select_scorer_from_table(opponent_team, context['opponent_scorers'], goals, rng)
+
+    return pick_my_scorer, pick_opponent_scorer
+
+def simulate_context_match(context, game_data, seed=None, on_minute=None):
+    """Весь матч по контексту; без seed - seed следующего матча карьеры"""
+    if seed is None:
+        seed = get_next_match_seed(game_data)
+    pick_my_scorer, pick_opponent_scorer = get_scorer_pickers(context)
+    return simulate_match(context['my_team'], context['opponent_team'], pick_my_scorer, pick_opponent_scorer,
+                          tactic=game_data.get('current_tactic', 'balanced'), seed=seed, on_minute=on_minute)
+
+@app.route('/match_stream/<match_id>')
+def match_stream(match_id):
+    """Трансляция матча по минутам (Server-Sent Events), см. match_stream.py"""
+    if 'game_data' not in session or session.get('match_id') != match_id:
+        return jsonify({"success": False, "error": "Match not found"}), 404
+    context = get_match_context(match_id)
+    if context is None:
+        # Контекст потерян (перезапуск сервера или другой процесс) - клиент перейдет на 'simulate'
+        return jsonify({"success": False, "error": "Match not found"}), 404
+
+    broadcast = context.get('broadcast')
+    if broadcast is None:
+        # Матч разыгрывается один раз на все подключения зрителя
+        recorder = FrameRecorder(player_name)
+        result = simulate_context_match(context, session['game_data'], on_minute=recorder)
+        broadcast = context.setdefault('broadcast', {
+            'frames': recorder.frames,
+            'second_half': False
+        })
+        # Итог матча - в сессии, как после 'simulate': по нему считает end_match
+        session['match_data'] = result['match_data']
+
+    start_minute = resume_minute(request.headers.get('Last-Event-ID', request.args.get('last_event_id')))
+    if is_paused(start_minute, broadcast['second_half']):
+        return '', 204
+    METRICS.match_actions.inc('stream')
+    return app.response_class(
+        stream_frames(broadcast['frames'], start_minute, lambda: broadcast['second_half'], MATCH_STREAM_INTERVAL),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/match_action', methods=['POST'])
 def match_action():
     # Расширяем try блок на всю функцию для перехвата всех исключений
@@ -1556,8 +1521,6 @@ def match_action():
         if 'game_data' not in session or 'match_data' not in session:
             return jsonify({"success": False, "error": "Session not initialized"})
 
-        import random
-
         # Безопасно получаем JSON данные
         try:
             data = request.get_json()
@@ -1570,112 +1533,54 @@ def match_action():
         action = data.get('action')
         if not action:
             return jsonify({"success": False, "error": "No action provided"})
+        # Метка - только известные действия, иначе число рядов метрики не ограничено
+        METRICS.match_actions.inc(action if action in MATCH_ACTIONS else 'unknown')
 
         match_data = session['match_data']
         game_data = session['game_data']
 
-        if action == 'tick':
-            # Получаем составы команд (нужно для определения бомбардиров)
-            my_team = game_data['team_name']
-            opponent_team = game_data['next_opponent']
-
-        # Получаем состав пользователя
-        my_squad = game_data['squad']
-        selected_players = game_data.get('selected_players', [])
-
-        # Если выбрано меньше 11 игроков, добавляем случайных
-        if len(selected_players) < 11:
-            available_players = [p['name'] for p in my_squad if p['name'] not in selected_players]
-            needed = 11 - len(selected_players)
-            selected_players.extend(random.sample(available_players, min(needed, len(available_players))))
-
-        my_lineup = []
-        for player_name in selected_players[:11]:
-            player_info = next((p for p in my_squad if p['name'] == player_name), None)
-            if player_info:
-                my_lineup.append(player_info)
-
-        # Генерируем состав соперника
-        opponent_squad = []
-        if opponent_team in SQUADS_2007_08:
-            for player_data in SQUADS_2007_08[opponent_team]:
-                if isinstance(player_data, tuple):
-                    player_name, rating = player_data
-                else:
-                    player_name = player_data
-                    rating = 70
-                opponent_squad.append({
-                    "name": player_name,
-                    "rating": rating
+        if action in ('tick', 'simulate'):
+            # Составы и таблицы бомбардиров считаются один раз при открытии матча
+            context = get_match_context(session.get('match_id'))
+            if context is None:
+                # Контекст потерян (перезапуск сервера или другой процесс) - собираем заново
+                context = create_match_context(game_data)
+                session['match_id'] = context['match_id']
+
+            if action == 'simulate':
+                # Весь матч за один запрос: клиент проигрывает таймлайн сам
+                result = simulate_context_match(context, game_data, seed=data.get('seed'))
+                session['match_data'] = result['match_data']
+                return jsonify({
+                    "success": True,
+                    "seed": result['seed'],
+                    "timeline": named_timeline(result['timeline']),
+                    "match_data": named_match_data(result['match_data'])
                 })
 
-            # Формируем оптимальный состав: 1 GK + 4 DEF + 4 MID + 2 FWD = 11 игроков
-            opponent_lineup = create_optimal_lineup(opponent_squad, opponent_team)
-    
-            # Обновление таймера
+            # Обновление таймера и события одной минуты
             minute = data.get('minute', 0)
             half = data.get('half', 1)
-        
-            match_data['minute'] = minute
-            match_data['half'] = half
-        
-            # Генерируем события (голы, статистика) - каждую секунду
-            # Владение - медленно меняется
-            if minute % 5 == 0:
-                match_data['possession_my'] = max(30, min(70, match_data['possession_my'] + random.randint(-2, 2)))
-                match_data['possession_opponent'] = 100 - match_data['possession_my']
-
-            # Удары - случайно (увеличена вероятность)
-            if random.random() < 0.12:  # 12% вероятность каждую секунду
-                if random.random() < 0.5:
-                    match_data['shots_my'] += 1
-                    if random.random() < 0.5:  # 50% попаданий в створ
-                        match_data['shots_on_target_my'] += 1
-                        match_data['xg_my'] += round(random.uniform(0.08, 0.25), 2)
-                else:
-                    match_data['shots_opponent'] += 1
-                    if random.random() < 0.5:  # 50% попаданий в створ
-                        match_data['shots_on_target_opponent'] += 1
-                        match_data['xg_opponent'] += round(random.uniform(0.08, 0.25), 2)
-        
-            # Голы (вероятность зависит от xG и накопленного xG) - увеличена вероятность
-            goal_prob_my = min(0.08, match_data['xg_my'] * 0.4)  # Максимум 8% в секунду
-            if random.random() < goal_prob_my and match_data['xg_my'] > 0.15:  # Минимальный порог снижен до 0.15
-                match_data['my_score'] += 1
-                scorer = select_goal_scorer(game_data, my_lineup, match_data['goals'])
-                if not scorer or scorer == "":
-                    scorer = "Неизвестный игрок"  # Fallback
-                match_data['goals'].append({
-                    'team': match_data['my_team'],
-                    'scorer': scorer,
-                    'minute': minute
-                })
-                match_data['xg_my'] = 0.0  # Сбрасываем после гола
-
-            goal_prob_opp = min(0.08, match_data['xg_opponent'] * 0.4)  # Максимум 8% в секунду
-            if random.random() < goal_prob_opp and match_data['xg_opponent'] > 0.15:  # Минимальный порог снижен до 0.15
-                match_data['opponent_score'] += 1
-                scorer = select_opponent_goal_scorer(match_data['opponent_team'], opponent_lineup, match_data['goals'])
-                if not scorer or scorer == "":
-                    scorer = "Неизвестный игрок"  # Fallback
-                match_data['goals'].append({
-                    'team': match_data['opponent_team'],
-                    'scorer': scorer,
-                    'minute': minute
-                })
-                match_data['xg_opponent'] = 0.0
-        
+            # Своя последовательность на каждую минуту: повтор тиков дает тот же матч
+            minute_rng = stream(get_next_match_seed(game_data), 'minute', half, minute)
+            pick_my_scorer, pick_opponent_scorer = get_scorer_pickers(context)
+            play_minute(match_data, minute, half, pick_my_scorer, pick_opponent_scorer, minute_rng)
+
             # Сохраняем обновленные данные матча в сессии
             session['match_data'] = match_data
-            return jsonify({"success": True, "match_data": match_data})
+            return jsonify({"success": True, "match_data": named_match_data(match_data)})
 
         elif action == 'start_second_half':
             try:
                 match_data['half'] = 2
                 match_data['minute'] = 46
                 session['match_data'] = match_data
+                # Трансляция матча ждет в перерыве до этого действия
+                context = get_match_context(session.get('match_id'))
+                if context is not None and 'broadcast' in context:
+                    context['broadcast']['second_half'] = True
                 print(f"DEBUG start_second_half: half={match_data['half']}, minute={match_data['minute']}")
-                return jsonify({"success": True, "match_data": match_data})
+                return jsonify({"success": True, "match_data": named_match_data(match_data)})
             except Exception as e:
                 print(f"ERROR in start_second_half: {e}")
                 import traceback
@@ -1683,10 +1588,6 @@ def match_action():
                 return jsonify({"success": False, "error": f"Ошибка при начале второго тайма: {str(e)}"})
     
         elif action == 'end_match':
-            # Сохраняем результаты всего тура
-            if 'match_results' not in session:
-                session['match_results'] = []
-
             # Используем session['current_round'] как источник истины
             current_round = session.get('current_round', game_data.get('current_round', 1))
             round_results = []
@@ -1703,93 +1604,24 @@ def match_action():
             round_results.append(my_result)
 
             # Генерируем результаты остальных матчей тура
-            active_schedule = session.get('custom_schedule', MATCH_SCHEDULE)
+            active_fixtures = get_active_fixtures(game_data)
+            active_schedule = active_fixtures.schedule
             if current_round <= len(active_schedule):
-                round_matches = active_schedule[current_round - 1]
-                for home, away in round_matches:
-                    # Пропускаем наш матч, он уже добавлен
-                    if (home == match_data['my_team'] and away == match_data['opponent_team']) or \
-                       (away == match_data['my_team'] and home == match_data['opponent_team']):
-                        continue
-
-                    # Генерируем простой результат
-                    home_score = random.randint(0, 3)
-                    away_score = random.randint(0, 3)
-
-                    # Генерация голов с настоящими именами игроков
-                    goals = []
-
-                    # Получаем составы команд для выбора бомбардиров
-                    home_squad = []
-                    away_squad = []
-
-                    if home in SQUADS_2007_08:
-                        for player_data in SQUADS_2007_08[home]:
-                            if isinstance(player_data, tuple):
-                                player_name, rating = player_data
-                            else:
-                                player_name = player_data
-                                rating = 70
-                            home_squad.append({'name': player_name, 'rating': rating})
-
-                    if away in SQUADS_2007_08:
-                        for player_data in SQUADS_2007_08[away]:
-                            if isinstance(player_data, tuple):
-                                player_name, rating = player_data
-                            else:
-                                player_name = player_data
-                                rating = 70
-                            away_squad.append({'name': player_name, 'rating': rating})
-
-                    # Выбираем бомбардиров (предпочитаем не вратарей)
-                    def select_scorer(team_squad, team_name):
-                        if not team_squad:
-                            return f"Игрок {team_name}"
-
-                        # Фильтруем не-вратарей
-                        non_gk_players = []
-                        for i, player in enumerate(team_squad):
-                            position = get_player_position(team_name, i)
-                            if position != 'GK':
-                                non_gk_players.append(player)
-
-                        if non_gk_players:
-                            return random.choice(non_gk_players)['name']
-                        else:
-                            return random.choice(team_squad)['name']
-
-                    for i in range(home_score):
-                        scorer = select_scorer(home_squad, home)
-                        goals.append({
-                            'team': home,
-                            'scorer': scorer,
-                            'minute': random.randint(1, 90)
-                        })
-
-                    for i in range(away_score):
-                        scorer = select_scorer(away_squad, away)
-                        goals.append({
-                            'team': away,
-                            'scorer': scorer,
-                            'minute': random.randint(1, 90)
-                        })
-
-                    # Добавляем результат матча
-                round_results.append({
-                    'home_team': home,
-                    'away_team': away,
-                    'home_score': home_score,
-                    'away_score': away_score,
-                        'goals': goals,
-                    'is_user_match': False
-                })
+                # Пропускаем наш матч, он уже добавлен
+                other_matches = active_fixtures.other_fixtures(current_round, match_data['my_team'])
+                # Счета, минуты голов и бомбардиры всех матчей - одним проходом
+                round_results.extend(get_round_simulator().simulate(
+                    other_matches, numpy_stream(get_career_seed(game_data), 'round', current_round)
+                ))
             # Сохраняем результаты текущего тура отдельно для таблицы итогов
             session['last_round_results'] = round_results
 
-            # Добавляем результаты текущего тура к накопительной статистике для бомбардиров
-            if 'match_results' not in session:
-                session['match_results'] = []
-            session['match_results'].extend(round_results)
+            # Добавляем результаты тура в статистику сезона (счета и бомбардиры)
+            season_stats = session.get('season_stats')
+            if not season_stats:
+                season_stats = new_season_stats(len(active_schedule), max(len(r) for r in active_schedule))
+            record_round_stats(season_stats, current_round, round_results, active_schedule)
+            session['season_stats'] = season_stats
 
             # Обновляем турнирную таблицу
             update_league_table(round_results)
@@ -1800,35 +1632,23 @@ def match_action():
             game_data['current_round'] = new_round
 
             # Определяем следующего соперника для нового тура
-            active_schedule = session.get('custom_schedule', MATCH_SCHEDULE)
-            next_opponent = None
-            next_is_home_match = True
-            if new_round <= len(active_schedule):
-                round_matches = active_schedule[new_round - 1]
-                my_team = game_data['team_name']
-                for home, away in round_matches:
-                    if home == my_team:
-                        next_opponent = away
-                        next_is_home_match = True
-                        break
-                    elif away == my_team:
-                        next_opponent = home
-                        next_is_home_match = False
-                        break
+            next_opponent, next_is_home_match = get_round_fixture(active_schedule, new_round, game_data['team_name'])
 
             # Если матчи закончились, следующий соперник будет определен при сбросе сезона
             if next_opponent:
                 game_data['next_opponent'] = next_opponent
                 game_data['is_home_match'] = next_is_home_match
 
-            # Проверяем, был ли это последний тур чемпионата
-            is_season_end = (new_round > 38)
+            # Проверяем, был ли это последний тур календаря
+            is_season_end = (new_round > len(active_schedule))
 
             # Сохраняем обновленный game_data в сессию
             session['game_data'] = game_data
+            journal_event('end_match', round_results)
 
             # Очищаем данные матча
             session.pop('match_data', None)
+            drop_match_context(session.pop('match_id', None))
 
             # Если это был последний тур, получаем итоговую позицию команды
             if is_season_end:
@@ -1853,6 +1673,7 @@ def match_action():
             return jsonify({"success": False, "error": f"Unknown action: {action}"})
 
     except Exception as e:
+        METRICS.errors.inc('match_action')
         print(f"Error in match_action: {e}")
         import traceback
         traceback.print_exc()
@@ -1866,6 +1687,69 @@ def match_results():
     results = session['last_round_results']
     return render_template('match_results.html', results=results)
 
+@app.route('/simulate_season', methods=['POST'])
+def simulate_season():
+    """Доигрывает сезон до конца за один запрос (для QA и баланса)"""
+    if 'game_data' not in session:
+        return jsonify({"success": False, "error": "Session not initialized"})
+
+    data = request.get_json(silent=True) or {}
+    game_data = session['game_data']
+    current_round = session.get('current_round', game_data.get('current_round', 1))
+    active_schedule = get_active_fixtures(game_data).schedule
+
+    season_stats = session.get('season_stats')
+    if not season_stats:
+        season_stats = new_season_stats(len(active_schedule), max(len(r) for r in active_schedule))
+
+    last_round_results, season_end_data = simulate_season_to_end(
+        game_data, season_stats, active_schedule, current_round, seed=data.get('seed')
+    )
+
+    # Незаконченный матч больше не нужен
+    session.pop('match_data', None)
+    drop_match_context(session.pop('match_id', None))
+
+    session['season_stats'] = season_stats
+    session['game_data'] = game_data
+    session['current_round'] = game_data['current_round']
+    if last_round_results:
+        session['last_round_results'] = last_round_results
+    session['season_end_data'] = season_end_data
+    journal_event('simulate_season')
+
+    return jsonify({
+        "success": True,
+        "new_round": game_data['current_round'],
+        "season_end": True,
+        "season_end_data": season_end_data
+    })
+
+@app.route('/projections')
+def projections():
+    """Вероятности чемпионства, топ-4 и вылета по симуляциям оставшихся туров"""
+    # Модуль прогнозов (NumPy, пул процессов) загружается с первым прогнозом
+    from projections import project_season
+
+    if 'game_data' not in session:
+        return jsonify({"success": False, "error": "Session not initialized"})
+
+    game_data = session['game_data']
+    current_round = session.get('current_round', game_data.get('current_round', 1))
+    active_schedule = get_active_fixtures(game_data).schedule
+    seasons = max(1, min(request.args.get('seasons', 10000, type=int), MAX_PROJECTION_SEASONS))
+
+    remaining = [fixture for round_matches in active_schedule[current_round - 1:] for fixture in round_matches]
+    ratings = TEAM_STRENGTH.vector([row['team'] for row in game_data['table']])
+    seed = request.args.get('seed', type=int)
+    if seed is None:
+        # Одинаковое состояние карьеры - одинаковый прогноз (можно кэшировать)
+        seed = derive_seed(get_career_seed(game_data), 'projections', current_round)
+    result = project_season(game_data['table'], remaining, ratings, seasons=seasons,
+                            workers=PROJECTION_WORKERS, seed=seed)
+
+    return jsonify({"success": True, "seasons": seasons, "projections": result})
+
 @app.route('/change_tactic', methods=['POST'])
 def change_tactic():
     if 'game_data' not in session:
@@ -1881,6 +1765,7 @@ def change_tactic():
     game_data = session['game_data']
     game_data['current_tactic'] = tactic
     session['game_data'] = game_data
+    journal_event('change_tactic')
 
     return jsonify({
         "success": True,
@@ -1895,31 +1780,17 @@ def top_scorers():
 
     game_data = session['game_data']
 
-    # Собираем статистику бомбардиров из всех результатов матчей
-    scorers_stats = {}
-
-    # Проверяем сохраненные результаты матчей
-    if 'match_results' in session:
-        for result in session['match_results']:
-            if 'goals' in result:
-                for goal in result['goals']:
-                    scorer_name = goal['scorer']
-                    team_name = goal['team']
-
-                    if scorer_name not in scorers_stats:
-                        scorers_stats[scorer_name] = {
-                            'name': scorer_name,
-                            'team': team_name,
-                            'goals': 0
-                        }
-                    scorers_stats[scorer_name]['goals'] += 1
-
-    # Преобразуем в список и сортируем по количеству голов
-    scorers_list = list(scorers_stats.values())
-    scorers_list.sort(key=lambda x: x['goals'], reverse=True)
-
-    # Берем топ-20 бомбардиров
-    top_scorers_list = scorers_list[:20]
+    # Топ бомбардиров поддерживается в статистике сезона при каждом голе
+    top_scorers_list = []
+    season_stats = session.get('season_stats')
+    if season_stats:
+        for player_key, goals in get_top_scorers(season_stats, 20):
+            team_name, scorer_name = get_stat_player(player_key)
+            top_scorers_list.append({
+                'name': scorer_name,
+                'team': team_name,
+                'goals': goals
+            })
 
     return render_template('top_scorers.html', scorers=top_scorers_list)
 
@@ -1930,6 +1801,7 @@ def favicon():
 # Глобальный обработчик ошибок для match_action маршрута
 @app.errorhandler(500)
 def handle_500(error):
+    METRICS.errors.inc(request.endpoint or 'not_found')
     # Проверяем, является ли запрос к match_action
     if request.path == '/match_action':
         print(f"Global 500 error handler for match_action: {error}")
@@ -0,0 +1,110 @@
+"""Пакетная симуляция карьер без веб-сервера.
+
+    python -m batch --careers 100 --seasons 3 --workers 4 --output runs.jsonl
+
+Каждая карьера - команда и seed; ее сезоны доигрываются тем же кодом,
+что и /simulate_season (составы SQUADS_2007_08, календарь
+round_robin из scheduler, выбор бомбардиров как в матчах). Итог каждого
+сезона - строка JSON Lines в stdout или файл; в конце в stderr
+печатается пропускная способность.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import app as game
+from league_table import new_table_row
+from rng_streams import derive_seed
+from season_stats import new_season_stats
+
+TOP_SCORERS = 5
+
+
+def simulate_career(career, team_name, career_seed, seasons):
+    """Доигрывает seasons сезонов одной карьеры и возвращает итоги сезонов"""
+    schedule = game.MATCH_SCHEDULE
+    # generate_game_data читает тур и календарь из сессии - даем ей пустую
+    with game.app.test_request_context():
+        game_data = game.generate_game_data(team_name, career_seed)
+
+    summaries = []
+    for season in range(1, seasons + 1):
+        game_data['table'] = [new_table_row(team) for team in game.TEAMS]
+        season_stats = new_season_stats(len(schedule), max(len(r) for r in schedule))
+        season_seed = derive_seed(career_seed, 'season', season)
+        _, season_end_data = game.simulate_season_to_end(game_data, season_stats, schedule, 1, seed=season_seed)
+
+        table = game_data['table']
+        summaries.append({
+            'career': career,
+            'season': season,
+            'team': team_name,
+            'seed': season_seed,
+            'final_position': season_end_data['final_position'],
+            'points': next(row['points'] for row in table if row['team'] == team_name),
+            'champion': table[0]['team'],
+            'matches': sum(len(r) for r in schedule),
+            'table': [[row['team'], row['points'], row['goal_difference'], row['goals_for']] for row in table],
+            'top_scorers': [
+                [*game.get_stat_player(key), goals]
+                for key, goals in game.get_top_scorers(season_stats, TOP_SCORERS)
+            ]
+        })
+    return summaries
+
+
+def _simulate_career_task(task):
+    return simulate_career(*task)
+
+
+def write_summaries(results, output):
+    """Пишет итоги карьер по мере готовности (в порядке карьер), возвращает число матчей"""
+    matches = 0
+    for summaries in results:
+        for summary in summaries:
+            output.write(json.dumps(summary, ensure_ascii=False) + '\n')
+            matches += summary['matches']
+        output.flush()
+    return matches
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m batch', description="Пакетная симуляция карьер")
+    parser.add_argument('--careers', type=int, default=1, help="число карьер")
+    parser.add_argument('--seasons', type=int, default=1, help="сезонов в каждой карьере")
+    parser.add_argument('--team', choices=game.TEAMS, help="команда (по умолчанию - по кругу)")
+    parser.add_argument('--seed', type=int, default=0, help="общий seed прогона")
+    parser.add_argument('--workers', type=int, default=None, help="число процессов (по умолчанию - все ядра)")
+    parser.add_argument('--output', default='-', help="файл JSON Lines ('-' - stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tasks = [
+        (career, args.team or game.TEAMS[career % len(game.TEAMS)],
+         derive_seed(args.seed, 'career', career), args.seasons)
+        for career in range(args.careers)
+    ]
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        if args.workers == 1:
+            matches = write_summaries(map(_simulate_career_task, tasks), output)
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                matches = write_summaries(executor.map(_simulate_career_task, tasks), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{args.careers} карьер x {args.seasons} сезонов: {matches} матчей за {elapsed:.2f} с, "
+          f"{matches / elapsed:.0f} матчей/с", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Бенчмарки горячих путей симуляции. Запуск: python -m benchmarks.<имя>"""
@@ -0,0 +1,88 @@
+"""Журнал карьеры против полного сохранения после каждого тура.
+
+Карьера проходит сезон через test client (simulate, смена тактики,
+end_match); журнал пишется во временную папку. Сравниваются байты и время
+записи end_match с полным сохранением save_format того же game_data.
+Проверяется, что загрузка из журнала (snapshot + дельты) дает game_data из
+сессии и что фоновый компактор ограничивает длину журнала.
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+import time
+
+import app as game
+from career_journal import CareerJournal
+from save_format import write_save
+
+ROUNDS = 38
+MAX_RECORDS = 20
+
+
+def main():
+    journal_dir = tempfile.mkdtemp(prefix='journal_')
+    original = game.JOURNAL
+    journal = game.JOURNAL = CareerJournal(
+        journal_dir, max_records=MAX_RECORDS,
+        apply_results=original.apply_results if original else None, derived_keys=('table', 'position')
+    )
+
+    # Время record для end_match - как его видит маршрут
+    record_times = []
+    record = journal.record
+
+    def timed_record(career_id, event, game_data, results=None):
+        start = time.perf_counter()
+        written = record(career_id, event, game_data, results)
+        if event == 'end_match':
+            record_times.append((time.perf_counter() - start, written))
+        return written
+
+    journal.record = timed_record
+    client = game.app.test_client()
+    full_times, full_sizes, lengths = [], [], []
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            client.post('/start_game', data={'team': 'Everton', 'seed': 7})
+            for round_number in range(ROUNDS):
+                client.get('/pre_match')
+                client.get('/match')
+                client.post('/match_action', json={'action': 'simulate'})
+                client.post('/change_tactic', json={'tactic': 'attacking' if round_number % 2 else 'balanced'})
+                client.post('/match_action', json={'action': 'end_match'})
+
+                with client.session_transaction() as session:
+                    career_id, game_data = session['career_id'], session['game_data']
+                journal.wait_for_compaction()
+                with open(journal.path(career_id), 'r', encoding='utf-8') as f:
+                    lengths.append(sum(1 for _ in f))
+
+                path = os.path.join(journal_dir, 'full.sav')
+                start = time.perf_counter()
+                write_save(path, game_data)
+                full_times.append(time.perf_counter() - start)
+                full_sizes.append(os.path.getsize(path))
+
+        start = time.perf_counter()
+        loaded = CareerJournal(journal_dir, apply_results=journal.apply_results,
+                               derived_keys=journal.derived_keys).load(career_id)
+        load_ms = (time.perf_counter() - start) * 1000
+        assert loaded == game_data, "журнал восстановил не тот game_data"
+        assert max(lengths) <= MAX_RECORDS + 1, f"журнал вырос до {max(lengths)} строк"
+    finally:
+        game.JOURNAL = original
+        shutil.rmtree(journal_dir)
+
+    deltas = [written for _, written in record_times[1:] if written < min(full_sizes)]
+    print(f"{ROUNDS} туров, snapshot каждые {journal.snapshot_every}:")
+    print(f"  журнал end_match: {sum(w for _, w in record_times) / ROUNDS:.0f} Б в среднем, "
+          f"дельта {sum(deltas) / len(deltas):.0f} Б, "
+          f"{sum(t for t, _ in record_times) / ROUNDS * 1000:.3f} мс")
+    print(f"  полное сохранение (gzip, fsync): {sum(full_sizes) / ROUNDS:.0f} Б, "
+          f"{sum(full_times) / ROUNDS * 1000:.3f} мс")
+    print(f"  загрузка из журнала: {load_ms:.2f} мс; длина журнала не больше {max(lengths)} строк")
+
+
+if __name__ == '__main__':
+    main()
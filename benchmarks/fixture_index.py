@@ -0,0 +1,83 @@
+"""Матч команды в туре: перебор пар тура против индекса календаря.
+
+Проверяет, что индекс дает те же (соперник, дома ли, номер матча) и тот же
+список остальных матчей тура, что и перебор, для каждой команды и тура.
+Затем печатает время на поиск для лиг разного размера, время построения
+индекса и стоимость получения индекса календаря из сессии по ключу.
+"""
+import time
+
+import app as game
+from fixture_index import FixtureIndex, FixtureIndexCache, schedule_key
+from scheduler import round_robin
+
+LOOKUPS = 20000
+
+
+def legacy_fixture(schedule, round_number, team_name):
+    """Прежний поиск: перебор пар тура"""
+    if 1 <= round_number <= len(schedule):
+        for slot, (home, away) in enumerate(schedule[round_number - 1]):
+            if home == team_name:
+                return away, True, slot
+            if away == team_name:
+                return home, False, slot
+    return None
+
+
+def legacy_other_fixtures(schedule, round_number, team_name):
+    """Прежний end_match: каждая пара тура проверяется на матч пользователя"""
+    return [(home, away) for home, away in schedule[round_number - 1] if team_name not in (home, away)]
+
+
+def per_lookup(func, calls):
+    start = time.perf_counter()
+    for args in calls:
+        func(*args)
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+def main():
+    schedule = game.MATCH_SCHEDULE
+    index = game.MATCH_FIXTURES
+    for round_number in range(1, len(schedule) + 1):
+        for team in game.TEAMS:
+            assert index.fixture(team, round_number) == legacy_fixture(schedule, round_number, team)
+            assert index.other_fixtures(round_number, team) == legacy_other_fixtures(schedule, round_number, team)
+            opponent, is_home, slot = index.fixture(team, round_number)
+            home, away = (team, opponent) if is_home else (opponent, team)
+            assert index.slot(round_number, home, away) == (slot, False)
+            assert index.slot(round_number, away, home) == (slot, True)
+            assert schedule[index.find(home, away)[0] - 1][slot] == (home, away)
+    print("индекс совпадает с перебором для всех команд и туров")
+
+    print(f"{'команд':>7} {'перебор, мкс':>13} {'индекс, мкс':>12} {'построение, мс':>15}")
+    for size in (20, 100, 500):
+        teams = [f"Команда {i}" for i in range(size)]
+        league = round_robin(teams).rounds
+        start = time.perf_counter()
+        league_index = FixtureIndex(league)
+        build = (time.perf_counter() - start) * 1000
+        calls = [(league, 1 + i % len(league), teams[(i * 7) % size]) for i in range(LOOKUPS)]
+        before = per_lookup(legacy_fixture, calls)
+        after = per_lookup(lambda _, round_number, team: league_index.fixture(team, round_number), calls)
+        print(f"{size:>7} {before:>13.3f} {after:>12.3f} {build:>15.2f}")
+
+    # Календарь из сессии: каждый запрос - новый объект со списками вместо кортежей
+    cache = FixtureIndexCache()
+    session_schedule = [[list(pair) for pair in round_matches] for round_matches in schedule]
+    key = schedule_key(session_schedule)
+    cache.get(session_schedule, key)
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        cache.get(session_schedule, key)
+    with_key = (time.perf_counter() - start) / LOOKUPS * 1e6
+    start = time.perf_counter()
+    for _ in range(200):
+        cache.get(session_schedule)
+    without_key = (time.perf_counter() - start) / 200 * 1e6
+    print(f"индекс календаря из сессии: по ключу {with_key:.2f} мкс, с подсчетом ключа {without_key:.0f} мкс")
+
+
+if __name__ == '__main__':
+    main()
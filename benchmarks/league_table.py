@@ -0,0 +1,128 @@
+"""Турнирная таблица: полная пересортировка после тура против LeagueTable.
+
+Сначала проверяет на случайных сезонах, что после каждого матча и тура
+(и по одному матчу, и слиянием) таблица упорядочена как
+sorted(rows, key=table_sort_key), а места и rank() совпадают с порядком.
+"""
+import random
+import time
+
+from league_table import LeagueTable, new_table_row, table_sort_key
+
+ROUNDS = 10
+FUZZ_CASES = 2000
+
+
+def make_rounds(teams, rng):
+    """Случайные туры: каждая команда играет один матч за тур"""
+    rounds = []
+    for _ in range(ROUNDS):
+        order = teams[:]
+        rng.shuffle(order)
+        rounds.append([{'home_team': order[i], 'away_team': order[i + 1],
+                        'home_score': rng.randint(0, 4), 'away_score': rng.randint(0, 4)}
+                       for i in range(0, len(order) - 1, 2)])
+    return rounds
+
+
+def assert_ordered(table):
+    """Порядок строк - как после полной сортировки, места и индекс совпадают с ним"""
+    keys = [table_sort_key(row) for row in table.rows]
+    assert keys == [table_sort_key(row) for row in sorted(table.rows, key=table_sort_key)]
+    assert all(table.rank(row['team']) == row['position'] == i + 1 for i, row in enumerate(table.rows))
+
+
+def fuzz(rng):
+    """Случайные таблицы: туры целиком (слияние) и по одному-четыре матча"""
+    for case in range(FUZZ_CASES):
+        teams = [f"T{i}" for i in range(rng.randint(2, 24))]
+        table = LeagueTable([new_table_row(team) for team in teams])
+        for round_results in make_rounds(teams, rng):
+            if case % 2:
+                table.apply_results(round_results)
+                assert_ordered(table)
+                continue
+            while round_results:
+                batch = rng.randint(1, LeagueTable.SEQUENTIAL_RESULTS)
+                table.apply_results(round_results[:batch])
+                round_results = round_results[batch:]
+                assert_ordered(table)
+
+
+def full_sort_update(rows, round_results):
+    """Как раньше: обновить строки, пересортировать таблицу, проставить места"""
+    teams_dict = {row['team']: row for row in rows}
+    for result in round_results:
+        for team, scored, conceded in ((result['home_team'], result['home_score'], result['away_score']),
+                                       (result['away_team'], result['away_score'], result['home_score'])):
+            row = teams_dict[team]
+            row['played'] += 1
+            row['won'] += 1 if scored > conceded else 0
+            row['drawn'] += 1 if scored == conceded else 0
+            row['lost'] += 1 if scored < conceded else 0
+            row['goals_for'] += scored
+            row['goals_against'] += conceded
+            row['goal_difference'] = row['goals_for'] - row['goals_against']
+            row['points'] = row['won'] * 3 + row['drawn']
+    rows.sort(key=table_sort_key)
+    for i, row in enumerate(rows, 1):
+        row['position'] = i
+    # Место одной команды - линейный поиск, как в end_match
+    return next(row['position'] for row in rows if row['team'] == rows[-1]['team'])
+
+
+def main():
+    # Минимальный случай: проигравший не должен остаться выше команд без матчей
+    table = LeagueTable([new_table_row(f"T{i}") for i in range(6)])
+    table.apply_result('T1', 'T0', 1, 0)
+    assert_ordered(table)
+    assert table.rank('T1') == 1 and table.rank('T0') == 6
+    fuzz(random.Random(0))
+    print(f"таблица упорядочена после каждого матча в {FUZZ_CASES} случайных сезонах")
+
+    print(f"{'команд':>7} {'пересортировка, мс/тур':>24} {'LeagueTable, мс/тур':>21} "
+          f"{'1 матч: сорт, мкс':>18} {'1 матч: LeagueTable, мкс':>25} {'rank, нс':>9}")
+    for size in (20, 200, 2000):
+        teams = [f"Team {i}" for i in range(size)]
+        rounds = make_rounds(teams, random.Random(size))
+
+        rows = [new_table_row(team) for team in teams]
+        start = time.perf_counter()
+        for round_results in rounds:
+            full_sort_update(rows, round_results)
+        full = (time.perf_counter() - start) / ROUNDS
+
+        table = LeagueTable([new_table_row(team) for team in teams])
+        start = time.perf_counter()
+        for round_results in rounds:
+            table.apply_results(round_results)
+        incremental = (time.perf_counter() - start) / ROUNDS
+
+        # Та же таблица с точностью до порядка равных команд
+        assert [table_sort_key(r) for r in rows] == [table_sort_key(r) for r in table.rows]
+        assert all(table.rank(row['team']) == row['position'] == i + 1 for i, row in enumerate(table.rows))
+
+        # Один матч (например, матч пользователя): обе команды меняют место
+        single = rounds[0][:1]
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            full_sort_update(rows, single)
+        full_single = (time.perf_counter() - start) / ROUNDS
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            table.apply_results(single)
+        incremental_single = (time.perf_counter() - start) / ROUNDS
+        assert [table_sort_key(r) for r in rows] == [table_sort_key(r) for r in table.rows]
+
+        lookups = 100000
+        start = time.perf_counter()
+        for i in range(lookups):
+            table.rank(teams[i % size])
+        rank_ns = (time.perf_counter() - start) / lookups * 1e9
+
+        print(f"{size:>7} {full * 1000:>24.3f} {incremental * 1000:>21.3f} "
+              f"{full_single * 1e6:>18.1f} {incremental_single * 1e6:>25.1f} {rank_ns:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
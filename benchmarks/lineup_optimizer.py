@@ -0,0 +1,103 @@
+"""Стартовый состав: прежний 4-4-2 против лучшего по рейтингу для любой схемы.
+
+Проверяет для всех команд и схем, что в составе 11 разных игроков, линии
+заполнены по схеме и сумма рейтингов для 4-4-2 не ниже прежней, а кэш
+отдает новый состав только после invalidate. Затем
+печатает время сборки состава без кэша и из кэша и время всех составов
+тура одним вызовом.
+"""
+import time
+from collections import Counter
+
+import app as game
+from lineup_optimizer import LineupCache, optimal_lineup
+from player_registry import Player
+from team_strength import parse_formation
+
+FORMATIONS = ('4-4-2', '4-3-3', '3-5-2', '5-3-2', '4-2-3-1')
+CODES = ('В', 'З', 'П', 'Н')
+CALLS = 2000
+
+
+def legacy_lineup(players, positions, targets):
+    """Прежний create_optimal_lineup: первые по составу в каждой линии, добор с перебором состава"""
+    lines = {line: [] for line in ('GK', 'DEF', 'MID', 'FWD')}
+    for player, position in zip(players, positions):
+        lines[position if position in lines else 'MID'].append(player)
+    targets = list(targets)
+    lineup = []
+    for number, (line, code) in enumerate(zip(lines, CODES)):
+        lineup.extend({**player, 'position': code} for player in lines[line][:targets[number]])
+    while len(lineup) < 11:
+        added = False
+        for number, (line, code) in enumerate(zip(lines, CODES)):
+            if added or len(lines[line]) <= targets[number]:
+                continue
+            for player in lines[line][targets[number]:]:
+                if player not in [p for p in lineup if p['name'] == player['name']]:
+                    lineup.append({**player, 'position': code})
+                    added = True
+                    break
+            targets[number] += 1
+        if not added:
+            break
+    return lineup[:11]
+
+
+def per_call(func):
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        func()
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+def main():
+    gained = 0
+    for team in game.TEAMS:
+        squad = game.PLAYER_REGISTRY.squad(team)
+        for formation in FORMATIONS:
+            lineup = optimal_lineup(squad, formation)
+            assert len(lineup) == 11 and len({player['id'] for player in lineup}) == 11, (team, formation)
+            # Линия заполнена по схеме, если в составе хватает игроков; недостающих добирают другие линии
+            counts = Counter(player['position'] for player in lineup)
+            for code, line, target in zip(CODES, ('GK', 'DEF', 'MID', 'FWD'), parse_formation(formation)):
+                available = sum(1 for player in squad if player.position == line)
+                assert counts.get(code, 0) >= min(target, available), (team, formation, line)
+        legacy = legacy_lineup(list(squad), [player.position for player in squad], (1, 4, 4, 2))
+        difference = sum(p['rating'] for p in game.build_opponent_lineup(team)) - sum(p['rating'] for p in legacy)
+        assert difference >= 0, team
+        gained += difference
+    print(f"составы корректны для {len(FORMATIONS)} схем; рейтинг основы 4-4-2 выше прежнего "
+          f"в сумме на {gained} по {len(game.TEAMS)} командам")
+
+    # Состав считается неизменным: усиленный запасной попадает в основу только после invalidate
+    team = 'Chelsea'
+    squads = {team: list(game.PLAYER_REGISTRY.squad(team))}
+    cache = LineupCache(lambda name: squads[name])
+    starters = {player['id'] for player in cache.get(team)}
+    index = next(i for i, player in enumerate(squads[team]) if player.id not in starters)
+    bench = squads[team][index]
+    squads[team][index] = Player(bench.id, bench.team, bench.name, 99, bench.index, bench.position)
+    assert bench.id not in {player['id'] for player in cache.get(team)}
+    cache.invalidate(team)
+    assert bench.id in {player['id'] for player in cache.get(team)}
+    print("кэш составов обновляется после invalidate")
+
+    squad = game.PLAYER_REGISTRY.squad(team)
+    positions = [player.position for player in squad]
+    cache = LineupCache(game.PLAYER_REGISTRY.squad)
+    before = per_call(lambda: legacy_lineup(list(squad), positions, (1, 4, 4, 2)))
+    after = per_call(lambda: optimal_lineup(squad))
+    cached = per_call(lambda: cache.get(team))
+    print(f"состав {team}: прежний {before:.1f} мкс, новый {after:.1f} мкс, из кэша {cached:.2f} мкс")
+
+    for formation in ('4-4-2', '3-5-2'):
+        start = time.perf_counter()
+        for _ in range(CALLS // 20):
+            cache.get_many(game.TEAMS, formation)
+        print(f"все {len(game.TEAMS)} составов тура ({formation}): "
+              f"{(time.perf_counter() - start) / (CALLS // 20) * 1e6:.1f} мкс")
+
+
+if __name__ == '__main__':
+    main()
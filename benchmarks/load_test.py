@@ -0,0 +1,185 @@
+"""Нагрузочный тест: N виртуальных менеджеров проходят сезон по реальным маршрутам.
+
+    python -m benchmarks.load_test --managers 16 --rounds 5
+    python -m benchmarks.load_test --managers 16 --url http://127.0.0.1:5000
+
+Каждый менеджер - свой поток и свой клиент (cookie): /start_game, /game/3,
+/update_lineup, затем в каждом туре /pre_match, /match, тики всех минут
+(--ticks-per-minute раз в минуту), start_second_half, end_match и
+/top_scorers. Без --url запросы идут в WSGI-приложение этого процесса
+через test client, с --url - в запущенный сервер по HTTP.
+
+Печатает по маршрутам пропускную способность и задержки p50/p95/p99/max,
+а по турам - средний размер сессии (для серверных хранилищ - размер
+сохраненных данных, иначе - cookie).
+"""
+import argparse
+import contextlib
+import http.cookiejar
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from json import dumps
+
+import app as game
+
+SESSION_COOKIE = 'session'
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+class InProcessTarget:
+    """Запросы в приложение этого процесса через test client"""
+
+    def __init__(self):
+        self.client = game.app.test_client()
+
+    def request(self, method, path, json=None, data=None):
+        return getattr(self.client, method)(path, json=json, data=data).status_code
+
+    def session_bytes(self):
+        cookie = self.client.get_cookie(SESSION_COOKIE)
+        if cookie is None:
+            return 0
+        store = getattr(game.app.session_interface, 'store', None)
+        if store is None:
+            return len(cookie.value)
+        payload = store.load(cookie.value)
+        return len(payload.encode('utf-8')) if payload else 0
+
+
+class HttpTarget:
+    """Запросы в запущенный сервер по HTTP (cookie хранит CookieJar)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    def request(self, method, path, json=None, data=None):
+        body = None
+        headers = {}
+        if json is not None:
+            body = dumps(json).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif data is not None:
+            body = urllib.parse.urlencode(data).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method.upper())
+        try:
+            with self.opener.open(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+    def session_bytes(self):
+        # Данные серверной сессии снаружи не видны - только cookie
+        return sum(len(cookie.value) for cookie in self.cookies if cookie.name == SESSION_COOKIE)
+
+
+class Manager:
+    """Виртуальный менеджер: проходит туры и записывает задержки своих запросов"""
+
+    def __init__(self, number, target, rounds, ticks_per_minute):
+        self.number = number
+        self.target = target
+        self.rounds = rounds
+        self.ticks_per_minute = ticks_per_minute
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.session_sizes = []
+
+    def call(self, route, method, path, **kwargs):
+        start = time.perf_counter()
+        status = self.target.request(method, path, **kwargs)
+        self.latencies[route].append(time.perf_counter() - start)
+        if status >= 400:
+            self.errors[route] += 1
+
+    def run(self):
+        team = game.TEAMS[self.number % len(game.TEAMS)]
+        squad = [{'name': name, 'rating': rating} for name, rating in game.SQUADS_2007_08[team]]
+        lineup = [player['name'] for player in game.create_optimal_lineup(squad, team)]
+
+        self.call('start_game', 'post', '/start_game', data={'team': team, 'seed': self.number})
+        self.call('game/3', 'get', '/game/3')
+        self.call('update_lineup', 'post', '/update_lineup', json={'player_order': lineup})
+
+        for _ in range(self.rounds):
+            self.call('pre_match', 'get', '/pre_match')
+            self.call('match', 'get', '/match')
+            for half, minutes in ((1, range(1, 47)), (2, range(47, 91))):
+                if half == 2:
+                    self.call('start_second_half', 'post', '/match_action', json={'action': 'start_second_half'})
+                for minute in minutes:
+                    for _ in range(self.ticks_per_minute):
+                        self.call('tick', 'post', '/match_action',
+                                  json={'action': 'tick', 'minute': minute, 'half': half})
+            self.call('end_match', 'post', '/match_action', json={'action': 'end_match'})
+            self.call('top_scorers', 'get', '/top_scorers')
+            self.session_sizes.append(self.target.session_bytes())
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load_test', description="Нагрузочный тест маршрутов")
+    parser.add_argument('--managers', type=int, default=8, help="число одновременных менеджеров")
+    parser.add_argument('--rounds', type=int, default=3, help="туров на менеджера (до 38)")
+    parser.add_argument('--ticks-per-minute', type=int, default=1, help="тиков на игровую минуту")
+    parser.add_argument('--url', help="адрес запущенного сервера (по умолчанию - в этом процессе)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rounds = max(1, min(args.rounds, len(game.MATCH_SCHEDULE)))
+    managers = [
+        Manager(i, HttpTarget(args.url) if args.url else InProcessTarget(), rounds, args.ticks_per_minute)
+        for i in range(args.managers)
+    ]
+    threads = [threading.Thread(target=manager.run) for manager in managers]
+
+    # Отладочный вывод маршрутов выполняется, но не засоряет отчет
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    for manager in managers:
+        for route, samples in manager.latencies.items():
+            latencies[route].extend(samples)
+        for route, count in manager.errors.items():
+            errors[route] += count
+
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"{args.managers} менеджеров x {rounds} туров: {total} запросов за {elapsed:.1f} с, "
+          f"{total / elapsed:.0f} запросов/с, {args.managers * rounds / elapsed:.2f} туров/с")
+    print(f"{'маршрут':<18} {'запросов':>9} {'в сек':>8} {'p50 мс':>8} {'p95 мс':>8} "
+          f"{'p99 мс':>8} {'max мс':>8} {'ошибок':>7}")
+    for route, samples in latencies.items():
+        print(f"{route:<18} {len(samples):>9} {len(samples) / elapsed:>8.0f} "
+              f"{percentile(samples, 0.5) * 1000:>8.2f} {percentile(samples, 0.95) * 1000:>8.2f} "
+              f"{percentile(samples, 0.99) * 1000:>8.2f} {max(samples) * 1000:>8.2f} {errors[route]:>7}")
+
+    print(f"{'тур':>4} {'сессия, Б (среднее)':>20} {'макс, Б':>9}")
+    for round_index in range(rounds):
+        sizes = [manager.session_sizes[round_index] for manager in managers
+                 if len(manager.session_sizes) > round_index]
+        if sizes:
+            print(f"{round_index + 1:>4} {sum(sizes) / len(sizes):>20,.0f} {max(sizes):>9,}")
+
+
+if __name__ == '__main__':
+    main()
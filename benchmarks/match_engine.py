@@ -0,0 +1,102 @@
+"""Трафик одного матча: 90 запросов tick, один запрос simulate и трансляция SSE.
+
+Трансляция идет без пауз между минутами (MATCH_STREAM_INTERVAL = 0):
+первый тайм, start_second_half и второй тайм с Last-Event-ID. Перед
+замером проверяется, что трансляция дает тот же счет и голы, что simulate.
+"""
+import json
+import time
+
+import app as game
+from app import app
+
+
+def start_match(client, team='Chelsea'):
+    """Начинает новую игру и открывает страницу матча"""
+    client.post('/start_game', data={'team': team})
+    client.get('/game/3')
+    client.get('/match')
+
+def play_with_ticks(client):
+    """Матч как раньше: один POST на каждую игровую минуту"""
+    requests = 0
+    traffic = 0
+    for minute in range(1, 91):
+        response = client.post('/match_action', json={'action': 'tick', 'minute': minute,
+                                                      'half': 1 if minute <= 46 else 2})
+        requests += 1
+        traffic += len(response.data) + len(response.headers.get('Set-Cookie', ''))
+    return requests, traffic
+
+def play_with_timeline(client):
+    """Матч целиком: один POST, таймлайн проигрывается на клиенте"""
+    response = client.post('/match_action', json={'action': 'simulate'})
+    return 1, len(response.data) + len(response.headers.get('Set-Cookie', ''))
+
+def read_frames(response):
+    """Кадры минут из ответа SSE (события без имени)"""
+    frames = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if ': ' in line)
+        if 'data' in fields and 'event' not in fields:
+            frames.append(json.loads(fields['data']))
+    return frames
+
+def play_with_stream(client):
+    """Матч трансляцией: поток первого тайма, start_second_half, поток второго тайма"""
+    with client.session_transaction() as session:
+        url = f"/match_stream/{session['match_id']}"
+    first_half = client.get(url)
+    second_half_start = client.post('/match_action', json={'action': 'start_second_half'})
+    second_half = client.get(url, headers={'Last-Event-ID': '46'})
+    traffic = sum(len(response.data) + len(response.headers.get('Set-Cookie', ''))
+                  for response in (first_half, second_half_start, second_half))
+    return 3, traffic
+
+def check_stream(team='Chelsea', seed=7):
+    """Трансляция и simulate с одним seed дают один и тот же матч"""
+    client = app.test_client()
+    client.post('/start_game', data={'team': team, 'seed': seed})
+    client.get('/match')
+    with client.session_transaction() as session:
+        url = f"/match_stream/{session['match_id']}"
+    frames = read_frames(client.get(url))
+    assert client.get(url, headers={'Last-Event-ID': '46'}).status_code == 204  # перерыв
+    client.post('/match_action', json={'action': 'start_second_half'})
+    frames += read_frames(client.get(url, headers={'Last-Event-ID': '46'}))
+    assert [frame['minute'] for frame in frames] == list(range(1, 91))
+
+    client.post('/start_game', data={'team': team, 'seed': seed})
+    client.get('/match')
+    expected = client.post('/match_action', json={'action': 'simulate'}).get_json()['match_data']
+    assert (frames[-1]['my_score'], frames[-1]['opponent_score']) == (expected['my_score'], expected['opponent_score'])
+    assert [goal for frame in frames for goal in frame['goals']] == expected['goals']
+
+def run(play, matches=50):
+    client = app.test_client()
+    total_requests = 0
+    total_traffic = 0
+    start = time.perf_counter()
+    for _ in range(matches):
+        start_match(client)
+        requests, traffic = play(client)
+        total_requests += requests
+        total_traffic += traffic
+    elapsed = time.perf_counter() - start
+    return total_requests / matches, total_traffic / matches, elapsed / matches
+
+def main():
+    game.MATCH_STREAM_INTERVAL = 0
+    check_stream()
+    ticks = run(play_with_ticks)
+    timeline = run(play_with_timeline)
+    broadcast = run(play_with_stream)
+    print(f"{'режим':<10} {'запросов':>9} {'байт':>10} {'мс/матч':>9}")
+    for name, (requests, traffic, seconds) in (('tick', ticks), ('simulate', timeline), ('stream', broadcast)):
+        print(f"{name:<10} {requests:>9.0f} {traffic:>10,.0f} {seconds * 1000:>9.1f}")
+    print(f"меньше запросов в x{ticks[0] / timeline[0]:.0f}, трафика в x{ticks[1] / timeline[1]:.0f}")
+    print(f"трансляция против tick: запросов в x{ticks[0] / broadcast[0]:.0f} меньше, "
+          f"время сервера в x{ticks[2] / broadcast[2]:.1f} меньше")
+
+if __name__ == '__main__':
+    main()
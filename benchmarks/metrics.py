@@ -0,0 +1,82 @@
+"""Накладные расходы метрик на запрос.
+
+Собственная цена записи (WSGI-обертка вокруг пустого приложения, имя
+маршрута, размер сессии) должна быть меньше 20 мкс. Для сравнения два
+одинаковых маленьких приложения Flask, с metrics.init_app и без, по очереди
+прогоняются через test client - разница лучших средних близка к шуму.
+"""
+import time
+
+from flask import Flask, session
+
+from metrics import ENDPOINT_KEY, Metrics, TimingMiddleware, init_app
+
+REQUESTS = 1000
+RECORDS = 50000
+REPEATS = 5
+LIMIT_US = 20.0
+
+
+def make_app(instrumented):
+    app = Flask(__name__)
+    app.secret_key = 'benchmark'
+
+    @app.route('/tick')
+    def tick():
+        session['minute'] = session.get('minute', 0) + 1
+        return 'ok'
+
+    if instrumented:
+        init_app(app, Metrics())
+    return app
+
+
+def mean_request_us(client):
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        client.get('/tick')
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def recording_us(metrics):
+    """Цена записи одного запроса без самого Flask"""
+    def app(environ, start_response):
+        environ[ENDPOINT_KEY] = 'tick'  # Как _remember_endpoint
+        metrics.session_bytes.observe(512)
+        return []
+
+    middleware = TimingMiddleware(app, metrics)
+    environ = {}
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(RECORDS):
+            middleware(environ, None)
+        elapsed = (time.perf_counter() - start) / RECORDS * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    record = recording_us(Metrics())
+    print(f"запись метрик: {record:.2f} мкс на запрос")
+
+    plain_app, instrumented_app = make_app(False), make_app(True)
+    clients = (plain_app.test_client(), instrumented_app.test_client())
+    best = [None, None]
+    # Прогоны чередуются, чтобы дрейф частоты и кэшей делился поровну
+    for _ in range(REPEATS):
+        for i, client in enumerate(clients):
+            elapsed = mean_request_us(client)
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    print(f"запрос без метрик: {best[0]:.1f} мкс, с метриками: {best[1]:.1f} мкс, "
+          f"разница: {best[1] - best[0]:.1f} мкс")
+
+    body = clients[1].get('/metrics').get_data(as_text=True)
+    assert 'soocer_request_duration_seconds_count{endpoint="tick"}' in body
+    assert 'soocer_session_bytes_count' in body
+    assert record < LIMIT_US, f"метрики стоят {record:.1f} мкс на запрос (предел {LIMIT_US:.0f})"
+
+
+if __name__ == '__main__':
+    main()
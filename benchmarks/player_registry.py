@@ -0,0 +1,93 @@
+"""Реестр игроков: размер game_data и сохранений, составы без словарей.
+
+Сравнивает прежнее представление (состав - словари {'name', 'rating'},
+выбранный состав и бомбардиры - имена) с id из реестра: байты JSON сессии
+и сжатого сохранения .sav, время и выделенную память на сборку состава
+соперника, время построения реестра при импорте.
+"""
+import json
+import time
+import tracemalloc
+
+import app as game
+from player_registry import PlayerRegistry
+from save_format import encode_save
+
+TEAM = 'Chelsea'
+CALLS = 2000
+
+
+def legacy_game_data(game_data):
+    """game_data в прежнем формате: словари игроков и имена"""
+    team = game_data['team_name']
+    legacy = dict(game_data)
+    legacy['squad'] = [{'name': game.PLAYER_REGISTRY[key].name, 'rating': game.PLAYER_REGISTRY[key].rating}
+                       for key in game_data['squad']]
+    legacy['selected_players'] = [game.PLAYER_REGISTRY[key].name for key in game_data['selected_players']]
+    assert game.upgrade_player_refs(json.loads(json.dumps(legacy)))['squad'] == game_data['squad'], team
+    return legacy
+
+
+def legacy_round_results(round_results):
+    """Голы тура с именами бомбардиров вместо id"""
+    return [{**result, 'goals': [{**goal, 'scorer': game.player_name(goal['scorer'])} for goal in result['goals']]}
+            for result in round_results]
+
+
+def legacy_opponent_lineup(team_name):
+    """Прежний build_opponent_lineup: словарь на каждого игрока состава при каждом вызове"""
+    opponent_squad = []
+    for player_name, rating in game.SQUADS_2007_08[team_name]:
+        opponent_squad.append({"name": player_name, "rating": rating})
+    return game.create_optimal_lineup(opponent_squad, team_name)
+
+
+def measure(func, *args):
+    """(мкс на вызов, байт выделено на вызов)"""
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        func(*args)
+    elapsed = (time.perf_counter() - start) / CALLS * 1e6
+
+    tracemalloc.start()
+    func(*args)
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, allocated
+
+
+def size(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def main():
+    with game.app.test_request_context():
+        game_data = game.generate_game_data(TEAM, 1)
+    game_data['selected_players'] = game_data['squad'][:11]
+    legacy = legacy_game_data(game_data)
+
+    round_results = game.ROUND_SIMULATOR.simulate(game.MATCH_SCHEDULE[0], game.numpy_stream(1, 'round', 1))
+
+    print(f"{'':<28} {'имена':>8} {'id':>8}")
+    for title, old, new in (
+        ("состав и выбранные, Б", size([legacy['squad'], legacy['selected_players']]),
+         size([game_data['squad'], game_data['selected_players']])),
+        ("game_data (JSON), Б", size(legacy), size(game_data)),
+        ("сохранение .sav (gzip), Б", len(encode_save(legacy)), len(encode_save(game_data))),
+        ("результаты тура, Б", size(legacy_round_results(round_results)), size(round_results)),
+    ):
+        print(f"{title:<28} {old:>8} {new:>8}  (-{(1 - new / old) * 100:.0f}%)")
+
+    assert [p['name'] for p in legacy_opponent_lineup(TEAM)] == [p['name'] for p in game.build_opponent_lineup(TEAM)]
+    before = measure(legacy_opponent_lineup, TEAM)
+    after = measure(game.build_opponent_lineup, TEAM)
+    print(f"состав соперника: словари {before[0]:.1f} мкс / {before[1]} Б, "
+          f"реестр {after[0]:.1f} мкс / {after[1]} Б")
+
+    start = time.perf_counter()
+    registry = PlayerRegistry(game.SQUADS_2007_08, game.classify_player_position)
+    print(f"реестр: {len(registry)} игроков за {(time.perf_counter() - start) * 1000:.2f} мс")
+
+
+if __name__ == '__main__':
+    main()
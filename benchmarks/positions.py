@@ -0,0 +1,71 @@
+"""Микробенчмарк get_player_position: сканирование списков против индекса"""
+import time
+
+from app import (SQUADS_2007_08, GOALKEEPERS, DEFENDERS, MIDFIELDERS, FORWARDS,
+                 get_player_position)
+
+
+def legacy_get_player_position(team_name, player_index):
+    """Старая реализация: линейный поиск по спискам на каждый вызов"""
+    if team_name in SQUADS_2007_08:
+        squad = SQUADS_2007_08[team_name]
+        if player_index >= len(squad):
+            return 'MID'
+        player_data = squad[player_index]
+        player_name = player_data[0] if isinstance(player_data, tuple) else player_data
+
+        # Списки пересоздавались при каждом вызове
+        goalkeepers = list(GOALKEEPERS)
+        defenders = list(DEFENDERS)
+        midfielders = list(MIDFIELDERS)
+        forwards = list(FORWARDS)
+
+        if player_name in goalkeepers:
+            return 'GK'
+        elif player_name in defenders:
+            return 'DEF'
+        elif player_name in midfielders:
+            return 'MID'
+        elif player_name in forwards:
+            return 'FWD'
+        elif player_index < 2:
+            return 'GK'
+        elif player_index < 8:
+            return 'DEF'
+        elif player_index < 14:
+            return 'MID'
+        else:
+            return 'FWD'
+    return 'MID'
+
+
+def measure(func, calls, repeat=5):
+    """Возвращает лучшее значение вызовов в секунду из repeat прогонов"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for team_name, player_index in calls:
+            func(team_name, player_index)
+        elapsed = time.perf_counter() - start
+        best = max(best, len(calls) / elapsed)
+    return best
+
+
+def main():
+    # Все игроки всех 20 команд
+    calls = [(team, i) for team, squad in SQUADS_2007_08.items() for i in range(len(squad))]
+
+    mismatches = sum(1 for team, i in calls
+                     if legacy_get_player_position(team, i) != get_player_position(team, i))
+
+    before = measure(legacy_get_player_position, calls)
+    after = measure(get_player_position, calls)
+
+    print(f"Команд: {len(SQUADS_2007_08)}, вызовов за прогон: {len(calls)}")
+    print(f"до (сканирование списков): {before:,.0f} вызовов/с")
+    print(f"после (индекс):            {after:,.0f} вызовов/с")
+    print(f"ускорение: x{after / before:.1f}, расхождений: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
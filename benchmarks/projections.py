@@ -0,0 +1,55 @@
+"""Прогноз сезона: сезонов в секунду на ядро и масштабирование по процессам.
+
+Эффективность = ускорение / число процессов; близкая к 1 - линейное
+масштабирование. Процессов больше, чем ядер, не даст ускорения. В конце
+печатает время первого и следующих запросов через общий пул процессов.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import app as game
+from projections import project_season, shared_executor
+
+SEASONS = 40000
+REQUEST_SEASONS = 10000  # Как /projections по умолчанию
+
+
+def main():
+    table = [{'team': team, 'points': 0, 'goals_for': 0, 'goals_against': 0} for team in game.TEAMS]
+    fixtures = [fixture for round_matches in game.MATCH_SCHEDULE for fixture in round_matches]
+    ratings = game.TEAM_STRENGTH.vector(game.TEAMS)
+
+    result = project_season(table, fixtures, ratings, seasons=2000, workers=1, seed=1)
+    assert abs(sum(team['title'] for team in result.values()) - 1) < 1e-9
+    assert abs(sum(team['top4'] for team in result.values()) - 4) < 1e-9
+    assert abs(sum(team['relegation'] for team in result.values()) - 3) < 1e-9
+
+    cores = os.cpu_count() or 1
+    print(f"ядер: {cores}, сезонов: {SEASONS}")
+    print(f"{'процессов':>9} {'сезонов/с':>10} {'на процесс':>11} {'ускорение':>10} {'эффективность':>14}")
+    base = None
+    for workers in sorted({1, 2, 4, cores}):
+        # Свой пул на каждое число процессов; запуск процессов не входит в замер
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            project_season(table, fixtures, ratings, seasons=workers, workers=workers, seed=1, executor=executor)
+            start = time.perf_counter()
+            project_season(table, fixtures, ratings, seasons=SEASONS, workers=workers, seed=1, executor=executor)
+            rate = SEASONS / (time.perf_counter() - start)
+        base = base or rate
+        print(f"{workers:>9} {rate:>10.0f} {rate / workers:>11.0f} {rate / base:>10.2f} {rate / base / workers:>14.2f}")
+
+    # Запросы /projections: пул создается один раз, дальше процессы уже запущены
+    workers = max(2, cores)
+    timings = []
+    for seed in range(4):
+        start = time.perf_counter()
+        project_season(table, fixtures, ratings, seasons=REQUEST_SEASONS, workers=workers, seed=seed)
+        timings.append((time.perf_counter() - start) * 1000)
+    assert shared_executor(workers) is shared_executor(1)
+    print(f"запрос через общий пул ({REQUEST_SEASONS} сезонов): первый {timings[0]:.0f} мс, "
+          f"следующие {min(timings[1:]):.0f} мс")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Воспроизводимость карьеры по seed и стоимость потоков случайных чисел.
+
+Две карьеры с одним seed проходят несколько туров (simulate и tick);
+итоговые сессии должны совпасть байт в байт.
+"""
+import json
+import time
+
+import app as game
+from rng_streams import derive_seed, numpy_stream, stream
+
+ROUNDS = 3
+CALLS = 20000
+
+
+def play_career(seed, action):
+    client = game.app.test_client()
+    client.post('/start_game', data={'team': 'Everton', 'seed': seed})
+    for _ in range(ROUNDS):
+        client.get('/pre_match')
+        client.get('/match')
+        if action == 'simulate':
+            client.post('/match_action', json={'action': 'simulate'})
+        else:
+            for half, minutes in ((1, range(1, 47)), (2, range(47, 91))):
+                for minute in minutes:
+                    client.post('/match_action', json={'action': 'tick', 'minute': minute, 'half': half})
+        client.post('/match_action', json={'action': 'end_match'})
+    with client.session_transaction() as session:
+        state = dict(session)
+    state.pop('match_id', None)  # Случайный id контекста, не влияет на игру
+    state.pop('career_id', None)  # Случайный id журнала карьеры
+    return json.dumps(state, sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+
+def main():
+    for action in ('simulate', 'tick'):
+        first, second, other = play_career(42, action), play_career(42, action), play_career(43, action)
+        assert first == second, f"{action}: карьеры с одним seed различаются"
+        assert first != other, f"{action}: разные seed дали одну карьеру"
+        print(f"{action}: {len(first)} байт сессии совпадают для одного seed")
+
+    for name, make in (('derive_seed', derive_seed), ('random.Random', stream), ('np Generator', numpy_stream)):
+        start = time.perf_counter()
+        for i in range(CALLS):
+            make(42, 'minute', 1, i)
+        print(f"{name}: {(time.perf_counter() - start) / CALLS * 1e6:.2f} мкс на поток")
+
+
+if __name__ == '__main__':
+    main()
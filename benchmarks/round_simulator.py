@@ -0,0 +1,97 @@
+"""Остальные матчи тура: прежний цикл end_match против RoundSimulator.
+
+Проверяет, что распределения совпадают (средний счет, доля голов
+вратарей, частоты бомбардиров), и печатает время на тур для лиг разного
+размера.
+"""
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+import app as game
+
+SAMPLES = 20000
+
+
+def loop_round(fixtures):
+    """Прежний цикл end_match: составы и бомбардиры по одному матчу"""
+    results = []
+    for home, away in fixtures:
+        home_score = random.randint(0, 3)
+        away_score = random.randint(0, 3)
+        goals = []
+        for team_name, count in ((home, home_score), (away, away_score)):
+            squad = [{'name': p[0] if isinstance(p, tuple) else p} for p in game.SQUADS_2007_08.get(team_name, [])]
+            for _ in range(count):
+                if not squad:
+                    scorer = f"Игрок {team_name}"
+                else:
+                    non_gk = [player for i, player in enumerate(squad)
+                              if game.get_player_position(team_name, i) != 'GK']
+                    scorer = random.choice(non_gk or squad)['name']
+                goals.append({'team': team_name, 'scorer': scorer, 'minute': random.randint(1, 90)})
+        results.append({'home_team': home, 'away_team': away, 'home_score': home_score,
+                        'away_score': away_score, 'goals': goals, 'is_user_match': False})
+    return results
+
+
+def check_distribution():
+    fixtures = [tuple(pair) for pair in game.MATCH_SCHEDULE[0]]
+    team = fixtures[0][0]
+    rng = np.random.default_rng(1)
+    random.seed(1)
+
+    stats = {}
+    for name, simulate in (('цикл', loop_round), ('numpy', lambda f: game.ROUND_SIMULATOR.simulate(f, rng))):
+        scores = []
+        scorers = Counter()
+        for _ in range(SAMPLES // len(fixtures)):
+            for result in simulate(fixtures):
+                scores.append(result['home_score'])
+                scorers.update(game.player_name(goal['scorer']) for goal in result['goals'] if goal['team'] == team)
+        stats[name] = (np.mean(scores), scorers)
+
+    (loop_mean, loop_scorers), (np_mean, np_scorers) = stats['цикл'], stats['numpy']
+    assert abs(loop_mean - np_mean) < 0.05, (loop_mean, np_mean)
+    assert set(np_scorers) <= {name for name, _ in game.SQUADS_2007_08[team]}
+    goalkeepers = {name for i, (name, _) in enumerate(game.SQUADS_2007_08[team])
+                   if game.get_player_position(team, i) == 'GK'}
+    assert not goalkeepers & set(np_scorers), "вратарь забил"
+
+    # Хи-квадрат частот бомбардиров против равномерного по полевым игрокам
+    total = sum(np_scorers.values())
+    field = [name for name, _ in game.SQUADS_2007_08[team] if name not in goalkeepers]
+    expected = total / len(field)
+    chi2 = sum((np_scorers[name] - expected) ** 2 / expected for name in field)
+    print(f"средний счет: цикл {loop_mean:.3f}, numpy {np_mean:.3f}; "
+          f"хи-квадрат бомбардиров {chi2:.1f} при {len(field) - 1} степенях свободы")
+
+
+def main():
+    check_distribution()
+
+    print(f"{'матчей':>7} {'цикл, мс/тур':>14} {'numpy, мс/тур':>15}")
+    teams = list(game.SQUADS_2007_08)
+    for size in (9, 90, 900):
+        picker = random.Random(size)
+        fixtures = [tuple(picker.sample(teams, 2)) for _ in range(size)]
+        rng = np.random.default_rng(size)
+        repeats = max(1, 900 // size)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            loop_round(fixtures)
+        loop_ms = (time.perf_counter() - start) / repeats * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            game.ROUND_SIMULATOR.simulate(fixtures, rng)
+        numpy_ms = (time.perf_counter() - start) / repeats * 1000
+
+        print(f"{size:>7} {loop_ms:>14.3f} {numpy_ms:>15.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Список сохранений: чтение каждого файла против каталога с индексом.
+
+Во временной папке создается SAVES копий настоящего сохранения; сравнивается
+прежний /load_game (listdir + json.load каждого файла), первое построение
+индекса, повторный список без изменений и список после нового сохранения.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from save_catalog import SaveCatalog
+
+SAVES = 10000
+SOURCE = os.path.join('saves', 'save_20251116_020536.json')
+TEAMS = ['Arsenal', 'Chelsea', 'Everton', 'Liverpool']
+
+
+def list_by_reading(save_dir):
+    """Прежний способ: каждое сохранение читается целиком ради team_name"""
+    saves = []
+    for filename in os.listdir(save_dir):
+        if filename.endswith('.json'):
+            with open(os.path.join(save_dir, filename), 'r', encoding='utf-8') as f:
+                save_data = json.load(f)
+            saves.append({"filename": filename, "team": save_data.get('team_name', 'Unknown'),
+                          "timestamp": filename.replace('save_', '').replace('.json', '')})
+    saves.sort(key=lambda x: x['timestamp'], reverse=True)
+    return saves
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    with open(SOURCE, 'r', encoding='utf-8') as f:
+        game_data = json.load(f)
+    save_dir = tempfile.mkdtemp(prefix='saves_')
+    try:
+        for i in range(SAVES):
+            game_data['team_name'] = TEAMS[i % len(TEAMS)]
+            with open(os.path.join(save_dir, f"save_2025{i:010d}.json"), 'w', encoding='utf-8') as f:
+                json.dump(game_data, f, ensure_ascii=False, indent=2)
+
+        old, old_ms = timed(lambda: list_by_reading(save_dir))
+        print(f"чтение всех файлов: {old_ms:.0f} мс")
+
+        catalog = SaveCatalog(save_dir)
+        _, build_ms = timed(lambda: catalog.page(1))
+        print(f"построение индекса: {build_ms:.0f} мс")
+        (page, _, pages), warm_ms = timed(lambda: catalog.page(1))
+        print(f"список без изменений: {warm_ms:.3f} мс ({pages} страниц)")
+
+        restarted = SaveCatalog(save_dir)
+        _, restart_ms = timed(lambda: restarted.page(1))
+        print(f"список после перезапуска (индекс с диска): {restart_ms:.1f} мс")
+
+        game_data['team_name'] = 'Fulham'
+
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(game_data, f, ensure_ascii=False, indent=2)
+
+        _, record_ms = timed(lambda: catalog.add(f"save_2025{SAVES:010d}.json", game_data, write))
+        (page, _, _), after_ms = timed(lambda: catalog.page(1))
+        print(f"новое сохранение: запись файла и индекса {record_ms:.1f} мс, список {after_ms:.3f} мс")
+
+        assert page[0]['team'] == 'Fulham'
+        assert [(s['filename'], s['team']) for s in old[:19]] == \
+            [(s['filename'], s['team']) for s in restarted.page(1)[0][1:]]
+        assert restarted.count() == SAVES + 1
+    finally:
+        shutil.rmtree(save_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Формат сохранений: размер и время записи/чтения против JSON с отступами.
+
+Для каждого saves/*.json сравниваются прежняя запись (json.dump с indent=2
+прямо в файл) и новый формат save_format со сжатием none/gzip/lzma;
+проверяется, что чтение возвращает те же game_data. Запись нового формата
+включает fsync, поэтому отдельно показано время сериализации без диска.
+Обрезанные и испорченные файлы любого формата читаются с SaveFormatError.
+"""
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from save_format import COMPRESSIONS, SaveFormatError, decode_save, encode_save, read_save, write_save
+
+REPEATS = 50
+
+
+def write_legacy(path, game_data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(game_data, f, ensure_ascii=False, indent=2)
+
+
+def best_ms(function):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def check_corrupt(game_data):
+    """Поврежденное сохранение - SaveFormatError, а не ошибка JSON или распаковки"""
+    legacy = json.dumps(game_data, ensure_ascii=False, indent=2).encode('utf-8')
+    broken = [legacy[:len(legacy) // 2], legacy[:-1] + b'\xff', b'[]']
+    for name in COMPRESSIONS:
+        data = encode_save(game_data, name)
+        broken += [data[:len(data) // 2], data[:len(data) - 1]]
+    for data in broken:
+        try:
+            decode_save(data)
+        except SaveFormatError:
+            continue
+        raise AssertionError(f"поврежденное сохранение прочитано: {data[:20]!r}")
+
+
+def main():
+    saves = sorted(glob.glob(os.path.join('saves', '*.json')))
+    work_dir = tempfile.mkdtemp(prefix='save_format_')
+    totals = {}
+    try:
+        for source in saves:
+            with open(source, 'r', encoding='utf-8') as f:
+                game_data = json.load(f)
+            # Старые сохранения читаются read_save как есть
+            assert read_save(source) == game_data
+            check_corrupt(game_data)
+
+            variants = [('json indent=2', lambda path: write_legacy(path, game_data),
+                         lambda: json.dumps(game_data, ensure_ascii=False, indent=2))]
+            variants += [(name, lambda path, name=name: write_save(path, game_data, name),
+                          lambda name=name: encode_save(game_data, name)) for name in COMPRESSIONS]
+            for name, write, encode in variants:
+                path = os.path.join(work_dir, 'save')
+                encode_ms = best_ms(encode)
+                write_ms = best_ms(lambda: write(path))
+                read_ms = best_ms(lambda: read_save(path))
+                assert read_save(path) == game_data
+                total = totals.setdefault(name, [0, 0.0, 0.0, 0.0])
+                total[0] += os.path.getsize(path)
+                total[1] += encode_ms
+                total[2] += write_ms
+                total[3] += read_ms
+    finally:
+        shutil.rmtree(work_dir)
+
+    print(f"{len(saves)} сохранений из saves/ (сумма по файлам)")
+    print(f"{'формат':<14} {'байт':>8} {'сериализация мс':>16} {'запись мс':>10} {'чтение мс':>10}")
+    for name, (size, encode_ms, write_ms, read_ms) in totals.items():
+        print(f"{name:<14} {size:>8} {encode_ms:>16.3f} {write_ms:>10.3f} {read_ms:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Круговой календарь: проверки для лиг разного размера и стоимость построения.
+
+Для четного и нечетного числа команд проверяет, что каждая пара играет
+по разу дома и в гостях, команда не играет дважды за тур, серии домашних
+и гостевых матчей не длиннее двух, а массив туров совпадает с парами.
+Сравнивает серии с прежним календарем, проверяет повторяемость по seed и
+совпадение результатов RoundSimulator по названиям и по строкам массива.
+Затем печатает время построения календаря и повторного получения из кэша.
+"""
+import time
+
+import numpy as np
+
+import app as game
+from scheduler import round_robin
+
+MAX_RUN = 2
+CALLS = 2000
+
+
+def longest_runs(rounds, teams):
+    """Самая длинная серия домашних или гостевых матчей подряд по командам"""
+    venues = {team: [] for team in teams}
+    for round_matches in rounds:
+        for home, away in round_matches:
+            venues[home].append(True)
+            venues[away].append(False)
+    longest = {}
+    for team, team_venues in venues.items():
+        run = best = 0
+        for i, venue in enumerate(team_venues):
+            run = run + 1 if i and venue == team_venues[i - 1] else 1
+            best = max(best, run)
+        longest[team] = best
+    return longest
+
+
+def check(schedule):
+    teams = schedule.teams
+    pairs = [pair for round_matches in schedule.rounds for pair in round_matches]
+    assert len(pairs) == len(set(pairs)) == len(teams) * (len(teams) - 1), len(teams)
+    for round_matches in schedule.rounds:
+        playing = [team for pair in round_matches for team in pair]
+        assert len(playing) == len(set(playing)), len(teams)
+    assert max(longest_runs(schedule.rounds, teams).values()) <= MAX_RUN, len(teams)
+    for round_index, round_matches in enumerate(schedule.rounds):
+        ids = schedule.array[round_index, :len(round_matches)].tolist()
+        assert [(teams[h], teams[a]) for h, a in ids] == list(round_matches)
+
+
+def main():
+    for size in (2, 3, 4, 7, 19, 20, 21, 100, 101):
+        teams = [f"Команда {i}" for i in range(size)]
+        check(round_robin(teams))
+        check(round_robin(teams, seed=size))
+    assert round_robin(game.TEAMS, seed=7).rounds == round_robin(list(game.TEAMS), seed=7).rounds
+    assert round_robin(game.TEAMS, seed=7).rounds != round_robin(game.TEAMS, seed=8).rounds
+    print("календари корректны для 2-101 команды, серии не длиннее двух матчей")
+
+    legacy = longest_runs(round_robin(game.TEAMS, balanced=False).rounds, game.TEAMS)
+    balanced = longest_runs(game.MATCH_SCHEDULE, game.TEAMS)
+    print(f"самая длинная серия АПЛ: прежний календарь {max(legacy.values())} "
+          f"({max(legacy, key=legacy.get)}), новый {max(balanced.values())}")
+
+    # Тур из массива: RoundSimulator не ищет команды по названиям
+    schedule = round_robin(game.ROUND_SIMULATOR.teams)
+    fixtures = schedule.rounds[0]
+    sides = schedule.array[0]
+    assert game.ROUND_SIMULATOR.simulate(fixtures, 1) == game.ROUND_SIMULATOR.simulate(fixtures, 1, sides=sides)
+    timings = []
+    for kwargs in ({}, {'sides': sides}):
+        rng = np.random.default_rng(1)
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            game.ROUND_SIMULATOR.simulate(fixtures, rng, **kwargs)
+        timings.append((time.perf_counter() - start) / CALLS * 1e6)
+    print(f"тур RoundSimulator: по названиям {timings[0]:.1f} мкс, из массива {timings[1]:.1f} мкс")
+
+    print(f"{'команд':>7} {'построение, мс':>15} {'из кэша, мкс':>13}")
+    for size in (20, 21, 100, 500):
+        teams = [f"Команда {i}" for i in range(size)]
+        seeds = range(1000, 1005)
+        start = time.perf_counter()
+        for seed in seeds:
+            round_robin(teams, seed)
+        build = (time.perf_counter() - start) / len(seeds) * 1000
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            round_robin(teams, seeds[0])
+        cached = (time.perf_counter() - start) / CALLS * 1e6
+        print(f"{size:>7} {build:>15.2f} {cached:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Выбор бомбардира: список с повторами имен против WeightedSampler.
+
+Проверяет эквивалентность (одинаковые результаты при одинаковом seed и
+совпадение распределений при разных seed) и сравнивает пропускную способность.
+"""
+import math
+import random
+import time
+
+import app as game
+
+
+def legacy_select_scorer(team_name, lineup, match_goals, rng):
+    """Старая реализация: extend([бомбардир] * weight) и rng.choice на каждый гол.
+
+    Бомбардир - id игрока, как в голах сейчас (get_scorer_key).
+    """
+    scorer_counts = {}
+    for goal in match_goals:
+        if goal['team'] == team_name:
+            scorer_counts[goal['scorer']] = scorer_counts.get(goal['scorer'], 0) + 1
+
+    scorers_with_weights = []
+    for i, player in enumerate(lineup):
+        position = game.get_player_position(team_name, i)
+        if position == 'GK':
+            continue
+        base_weight = {'DEF': 3, 'MID': 5, 'FWD': 8}.get(position, 4)
+        rating_multiplier = max(0.5, min(2.0, 0.8 + (player.get('rating', 70) - 60) * 0.01))
+        final_weight = int(base_weight * rating_multiplier)
+        goals_in_match = scorer_counts.get(game.get_scorer_key(player), 0)
+        if goals_in_match >= 1:
+            final_weight = int(final_weight * (1.5 + goals_in_match * 0.3))
+        luck_factor = rng.random()
+        if luck_factor > 0.85:
+            final_weight = int(final_weight * 1.5)
+        elif luck_factor < 0.05:
+            final_weight = max(1, int(final_weight * 0.5))
+        final_weight = max(1, final_weight)
+        scorers_with_weights.extend([game.get_scorer_key(player)] * final_weight)
+    return rng.choice(scorers_with_weights)
+
+
+def new_select_scorer(team_name, table, match_goals, rng):
+    return game.select_scorer_from_table(team_name, table, match_goals, rng)
+
+
+def random_goals(team_name, lineup, rng, count):
+    """Случайная история голов матча (включая дубли и голы соперника)"""
+    goals = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            goals.append({'team': 'Other', 'scorer': 'Someone', 'minute': 1})
+        else:
+            goals.append({'team': team_name, 'scorer': game.get_scorer_key(rng.choice(lineup)), 'minute': 1})
+    return goals
+
+
+def chi_square(counts_a, counts_b):
+    """Статистика хи-квадрат однородности двух выборок и число степеней свободы"""
+    keys = set(counts_a) | set(counts_b)
+    total_a = sum(counts_a.values())
+    total_b = sum(counts_b.values())
+    statistic = 0.0
+    for key in keys:
+        a = counts_a.get(key, 0)
+        b = counts_b.get(key, 0)
+        expected_a = (a + b) * total_a / (total_a + total_b)
+        expected_b = (a + b) * total_b / (total_a + total_b)
+        statistic += (a - expected_a) ** 2 / expected_a + (b - expected_b) ** 2 / expected_b
+    return statistic, len(keys) - 1
+
+
+def chi_square_critical(dof, z=2.326):
+    """Критическое значение хи-квадрат для уровня 1% (приближение Уилсона-Хилферти)"""
+    return dof * (1 - 2 / (9 * dof) + z * math.sqrt(2 / (9 * dof))) ** 3
+
+
+def main():
+    team_name = 'Manchester United'
+    lineup = game.build_opponent_lineup(team_name)
+    table = game.build_scorer_table(team_name, lineup)
+
+    # 1. Одинаковый seed - одинаковый бомбардир
+    mismatches = 0
+    history_rng = random.Random(1)
+    for seed in range(20000):
+        goals = random_goals(team_name, lineup, history_rng, history_rng.randint(0, 6))
+        legacy = legacy_select_scorer(team_name, lineup, goals, random.Random(seed))
+        new = new_select_scorer(team_name, table, goals, random.Random(seed))
+        mismatches += legacy != new
+    print(f"совпадение при одинаковом seed: {20000 - mismatches}/20000")
+
+    # 2. Распределения при независимых генераторах
+    draws = 200000
+    goals = random_goals(team_name, lineup, random.Random(2), 3)
+    rng_a = random.Random(3)
+    rng_b = random.Random(4)
+    counts_a = {}
+    counts_b = {}
+    for _ in range(draws):
+        name = legacy_select_scorer(team_name, lineup, goals, rng_a)
+        counts_a[name] = counts_a.get(name, 0) + 1
+        name = new_select_scorer(team_name, table, goals, rng_b)
+        counts_b[name] = counts_b.get(name, 0) + 1
+    statistic, dof = chi_square(counts_a, counts_b)
+    critical = chi_square_critical(dof)
+    verdict = "распределения совпадают" if statistic < critical else "РАСХОЖДЕНИЕ"
+    print(f"хи-квадрат: {statistic:.1f} при {dof} степенях свободы "
+          f"(порог 1%: {critical:.1f}) - {verdict}")
+
+    # 3. Пропускная способность
+    rng = random.Random(5)
+    calls = 100000
+    for title, select, argument in (("список с повторами", legacy_select_scorer, lineup),
+                                    ("WeightedSampler", new_select_scorer, table)):
+        start = time.perf_counter()
+        for _ in range(calls):
+            select(team_name, argument, goals, rng)
+        elapsed = time.perf_counter() - start
+        print(f"{title:<20} {calls / elapsed:>12,.0f} выборов/с")
+
+
+if __name__ == '__main__':
+    main()
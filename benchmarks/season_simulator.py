@@ -0,0 +1,53 @@
+"""Доигрывание сезона: simulate_season_to_end и маршрут /simulate_season.
+
+Печатает время на сезон из 380 матчей и проверяет, что результат
+воспроизводится по seed.
+"""
+import copy
+import time
+
+import app as game
+from season_stats import new_season_stats
+
+SEASONS = 20
+
+
+def new_season(game_data):
+    schedule = game.MATCH_SCHEDULE
+    return copy.deepcopy(game_data), new_season_stats(len(schedule), max(len(r) for r in schedule))
+
+
+def main():
+    schedule = game.MATCH_SCHEDULE
+    matches = sum(len(r) for r in schedule)
+
+    with game.app.test_request_context():
+        game_data = game.generate_game_data('Everton')
+
+        first = game.simulate_season_to_end(*new_season(game_data), schedule, 1, seed=7)
+        second = game.simulate_season_to_end(*new_season(game_data), schedule, 1, seed=7)
+        assert first == second, "сезон с одним seed отличается"
+
+        timings = []
+        for seed in range(SEASONS):
+            season_game_data, season_stats = new_season(game_data)
+            start = time.perf_counter()
+            game.simulate_season_to_end(season_game_data, season_stats, schedule, 1, seed=seed)
+            timings.append(time.perf_counter() - start)
+            assert sum(row['played'] for row in season_game_data['table']) == matches * 2
+
+    timings.sort()
+    print(f"API: {matches} матчей, медиана {timings[len(timings) // 2] * 1000:.1f} мс/сезон, "
+          f"{matches / timings[len(timings) // 2]:.0f} матчей/с")
+
+    client = game.app.test_client()
+    client.post('/start_game', data={'team': 'Everton'})
+    start = time.perf_counter()
+    response = client.post('/simulate_season', json={'seed': 1})
+    elapsed = time.perf_counter() - start
+    assert response.get_json()['success']
+    print(f"/simulate_season: {elapsed * 1000:.1f} мс, место {response.get_json()['season_end_data']['final_position']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Целый сезон (38 туров) через test client для каждого хранилища сессий.
+
+Печатает байты сессии на запрос (cookie туда и обратно, для серверных
+хранилищ - еще и размер сохраненных данных) и задержки p50/p99.
+"""
+import os
+import tempfile
+import time
+import warnings
+
+from flask.sessions import SecureCookieSessionInterface
+
+import app as game
+from session_store import create_session_interface
+
+ROUNDS = 38
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+class SeasonRecorder:
+    """Оборачивает test client и собирает задержки и размеры cookie"""
+
+    def __init__(self, client):
+        self.client = client
+        self.latencies = []
+        self.cookie_bytes = []
+
+    def request(self, method, path, **kwargs):
+        cookie = self.client.get_cookie('session')
+        sent = len(cookie.value) if cookie else 0
+        start = time.perf_counter()
+        response = getattr(self.client, method)(path, **kwargs)
+        self.latencies.append((time.perf_counter() - start) * 1000)
+        received = len(response.headers.get('Set-Cookie', ''))
+        self.cookie_bytes.append(sent + received)
+        return response
+
+
+def play_season(recorder, team='Everton'):
+    """Проходит сезон по реальной последовательности маршрутов"""
+    recorder.request('post', '/start_game', data={'team': team})
+    recorder.request('get', '/game/3')
+    per_round = []
+    for _ in range(ROUNDS):
+        recorder.request('get', '/pre_match')
+        recorder.request('get', '/match')
+        recorder.request('post', '/match_action', json={'action': 'simulate'})
+        recorder.request('post', '/match_action', json={'action': 'start_second_half'})
+        recorder.request('post', '/match_action', json={'action': 'end_match'})
+        recorder.request('get', '/top_scorers')
+        recorder.request('get', '/game/2')
+        per_round.append(recorder.cookie_bytes[-1])
+    return per_round
+
+
+def stored_size(interface):
+    """Средний размер сохраненной сессии у серверного хранилища"""
+    store = getattr(interface, 'store', None)
+    if store is None:
+        return None
+    data = getattr(store, '_data', None)
+    if data is not None:
+        return sum(len(payload) for _, payload in data.values()) / max(len(data), 1)
+    if hasattr(store, 'directory'):
+        sizes = [os.path.getsize(os.path.join(store.directory, name)) for name in os.listdir(store.directory)]
+        return sum(sizes) / max(len(sizes), 1)
+    connection = store._connection()
+    return connection.execute("SELECT AVG(LENGTH(data)) FROM sessions").fetchone()[0]
+
+
+def main():
+    # Cookie-сессия к концу сезона превышает 4 КБ - Werkzeug предупреждает на каждом ответе
+    warnings.filterwarnings('ignore', message="The 'session' cookie is too large")
+    original_interface = game.app.session_interface
+    ttl = game.app.permanent_session_lifetime.total_seconds()
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [
+            ('cookie', SecureCookieSessionInterface()),
+            ('memory', create_session_interface('memory', ttl)),
+            ('sqlite', create_session_interface('sqlite', ttl, os.path.join(tmp, 'sessions.db'))),
+            ('file', create_session_interface('file', ttl, os.path.join(tmp, 'sessions'))),
+        ]
+        print(f"{'хранилище':<10} {'запросов':>9} {'cookie Б/запрос':>16} {'тур 38, Б':>10} "
+              f"{'данные, Б':>10} {'p50 мс':>8} {'p99 мс':>8}")
+        for name, interface in backends:
+            game.app.session_interface = interface
+            recorder = SeasonRecorder(game.app.test_client())
+            per_round = play_season(recorder)
+            stored = stored_size(interface)
+            stored = '-' if stored is None else f"{stored:,.0f}"
+            print(f"{name:<10} {len(recorder.latencies):>9} "
+                  f"{sum(recorder.cookie_bytes) / len(recorder.cookie_bytes):>16,.0f} "
+                  f"{per_round[-1]:>10,} {stored:>10} "
+                  f"{percentile(recorder.latencies, 0.5):>8.2f} {percentile(recorder.latencies, 0.99):>8.2f}")
+    game.app.session_interface = original_interface
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Время запуска: импорт app в новом процессе и загрузка пакета данных.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --compare <коммит>   # сравнить с другим коммитом
+
+Каждый запуск - отдельный интерпретатор с -X importtime (как холодный
+старт на Vercel): печатаются медианы полного времени процесса, импорта
+app целиком и его частей (Flask, NumPy, собственный код app) для текущего
+дерева и для коммита сравнения - по умолчанию коммита перед пакетом
+данных (родителя коммита, добавившего data_pack.py). Затем пакет данных
+загружается без снимка (разбор JSON) и со снимком marshal.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+from data_pack import DataPack
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACK_PATH = os.path.join(ROOT, 'data', 'premier_league_2007_08.json')
+MODULES = ('flask', 'numpy', 'data_pack', 'app')
+
+
+def import_app(root=ROOT):
+    """(секунды процесса, {модуль: (свое время, с зависимостями) в мс}) одного холодного импорта"""
+    env = dict(os.environ, SESSION_BACKEND='memory', CAREER_JOURNAL='0')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=root, env=env, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        own, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        if name in MODULES and own.isdigit():
+            modules[name] = (int(own) / 1000, int(cumulative) / 1000)
+    return elapsed, modules
+
+
+def before_data_pack():
+    """Коммит перед пакетом данных: родитель коммита, добавившего data_pack.py"""
+    added = subprocess.run(['git', 'log', '--diff-filter=A', '--format=%H', '--', 'data_pack.py'],
+                           cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+    return f"{added[-1]}^"
+
+
+def checkout(revision, directory):
+    """Файлы коммита revision в directory (без изменения рабочего дерева)"""
+    archive = subprocess.run(['git', 'archive', '--format=tar', revision],
+                             cwd=ROOT, capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(directory, filter='data')
+
+
+def measure_imports(roots, runs):
+    """Для каждого дерева - медианы: мс процесса и {модуль: (свое, с зависимостями)}.
+
+    Деревья запускаются по очереди в каждом прогоне, чтобы колебания
+    скорости машины поровну приходились на все деревья.
+    """
+    for root in roots:
+        import_app(root)  # Прогрев: .pyc и снимок пакета данных
+    samples = {root: [] for root in roots}
+    for _ in range(runs):
+        for root in roots:
+            samples[root].append(import_app(root))
+
+    results = []
+    for root in roots:
+        modules = {}
+        for name in MODULES:
+            times = [found[name] for _, found in samples[root] if name in found]
+            if times:
+                modules[name] = (statistics.median(t[0] for t in times), statistics.median(t[1] for t in times))
+        results.append((statistics.median(elapsed for elapsed, _ in samples[root]) * 1000, modules))
+    return results
+
+
+def load_pack(path, sections):
+    start = time.perf_counter()
+    pack = DataPack(path)
+    for name in sections:
+        pack.section(name)
+    return (time.perf_counter() - start) * 1000
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup', description="Время запуска приложения")
+    parser.add_argument('--runs', type=int, default=5, help="число запусков интерпретатора")
+    parser.add_argument('--compare', help="коммит для сравнения (по умолчанию - перед пакетом данных)")
+    parser.add_argument('--no-compare', action='store_true', help="только текущее дерево")
+    return parser.parse_args(argv)
+
+
+def format_module(modules, name):
+    if name not in modules:
+        return f"{'не загружается':>24}"
+    own, cumulative = modules[name]
+    return f"{own:>8.1f} / {cumulative:>7.1f} мс  "
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    trees = [('сейчас', ROOT)]
+    reference_dir = None
+    if not args.no_compare:
+        revision = subprocess.run(['git', 'rev-parse', '--short', args.compare or before_data_pack()],
+                                  cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        reference_dir = tempfile.mkdtemp(prefix='startup_')
+        checkout(revision, reference_dir)
+        trees.insert(0, (revision, reference_dir))
+    try:
+        measured = measure_imports([root for _, root in trees], args.runs)
+        results = [(label, *result) for (label, _), result in zip(trees, measured)]
+    finally:
+        if reference_dir is not None:
+            shutil.rmtree(reference_dir)
+
+    print(f"import app в новом процессе, медиана {args.runs} запусков; модули - свое / с зависимостями")
+    print(f"{'дерево':<14} {'процесс':>10} " + ' '.join(f"{name:>24}" for name in MODULES))
+    for label, elapsed, modules in results:
+        print(f"{label:<14} {elapsed:>7.0f} мс " + ' '.join(format_module(modules, name) for name in MODULES))
+
+    work_dir = tempfile.mkdtemp(prefix='data_pack_')
+    try:
+        path = shutil.copy(PACK_PATH, work_dir)
+        sections = ('teams', 'squads', 'stadiums', 'stadium_capacities', 'team_logos', 'team_logos_fallback')
+        cold = load_pack(path, sections)  # Разбор JSON и запись снимка
+        warm = min(load_pack(path, sections) for _ in range(20))
+        startup = min(load_pack(path, ('teams', 'squads')) for _ in range(20))
+    finally:
+        shutil.rmtree(work_dir)
+    print(f"пакет данных: без снимка {cold:.2f} мс, со снимком {warm:.2f} мс, "
+          f"только команды и составы (нужны при импорте) {startup:.2f} мс")
+
+
+if __name__ == '__main__':
+    main()
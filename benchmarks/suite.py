@@ -0,0 +1,194 @@
+"""Набор микробенчмарков горячих путей с базовой линией.
+
+    python -m benchmarks.suite                    # сравнить с benchmarks/baseline.json
+    python -m benchmarks.suite --update-baseline  # записать новую базовую линию
+    python -m benchmarks.suite --threshold 15 --output results.json
+
+Каждый путь измеряется на реалистичном размере входа (состав АПЛ, тур из
+10 матчей, таблица из 20 команд, статистика полного сезона, импорт app в
+новом процессе): число
+повторов подбирается автоматически, берется лучший из REPEATS замеров.
+Весь набор прогоняется RUNS раз (--runs) и в результат идет медиана;
+базовая линия по умолчанию записывается медианой BASELINE_RUNS прогонов,
+чтобы один удачный прогон не занизил ее. Результаты - JSON (мкс на
+операцию). Если путь медленнее базовой линии больше чем на threshold
+процентов (для путей быстрее SMALL_CASE_US - на SMALL_CASE_THRESHOLD,
+их шум больше), выход с кодом 1. Базовая линия зависит от машины - ее
+стоит записывать там же, где запускается проверка.
+"""
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+import app as game
+from benchmarks.startup import import_app
+from session_store import create_session_interface
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_THRESHOLD = 25.0  # Допустимое замедление, %
+SMALL_CASE_US = 100.0  # Пути быстрее этого (по базовой линии) шумят сильнее
+SMALL_CASE_THRESHOLD = 75.0  # Допустимое замедление для них, %
+RUNS = 3  # Прогонов набора для проверки
+BASELINE_RUNS = 5  # Прогонов набора для записи базовой линии
+REPEATS = 7
+MIN_TIME = 0.1  # Секунд на один замер
+TEAM = 'Everton'
+
+
+def started_client():
+    """Test client с начатой карьерой и открытым матчем"""
+    client = game.app.test_client()
+    client.post('/start_game', data={'team': TEAM, 'seed': 1})
+    client.get('/match')
+    return client
+
+
+def build_cases():
+    """Имя -> функция одной операции (подготовка входов - здесь, вне замера)"""
+    pairs = [(team, index) for team, squad in game.SQUADS_2007_08.items() for index in range(len(squad))]
+    squads = {team: list(game.PLAYER_REGISTRY.squad(team)) for team in game.TEAMS}
+    rng = random.Random(1)
+
+    with game.app.test_request_context():
+        game_data = game.generate_game_data(TEAM, 1)
+    lineup = game.create_optimal_lineup(squads[TEAM], TEAM)
+    match_goals = [{'team': TEAM, 'scorer': game.get_scorer_key(lineup[-1]), 'minute': 10}]
+
+    fixtures = [tuple(fixture) for fixture in game.MATCH_SCHEDULE[0]][1:]
+    round_results = game.ROUND_SIMULATOR.simulate(game.MATCH_SCHEDULE[0], 1)
+    table_data = copy.deepcopy(game_data)
+
+    tick_client = started_client()
+    tick_minute = [0]
+
+    def tick():
+        tick_minute[0] = tick_minute[0] % 90 + 1
+        tick_client.post('/match_action', json={'action': 'tick', 'minute': tick_minute[0], 'half': 1})
+
+    scorers_client = game.app.test_client()
+    scorers_client.post('/start_game', data={'team': TEAM, 'seed': 1})
+    scorers_client.post('/simulate_season', json={})
+
+    return {
+        # Все игроки всех составов (465 вызовов)
+        'get_player_position': lambda: [game.get_player_position(team, index) for team, index in pairs],
+        'sort_squad_by_positions': lambda: [game.sort_squad_by_positions(squads[team], team) for team in game.TEAMS],
+        'create_optimal_lineup': lambda: [game.create_optimal_lineup(squads[team], team) for team in game.TEAMS],
+        # Составы всех команд ИИ на тур из кэша составов
+        'ai_lineups': lambda: game.AI_LINEUPS.get_many(game.TEAMS),
+        'select_goal_scorer': lambda: game.select_goal_scorer(game_data, lineup, match_goals, rng),
+        'match_action_tick': tick,
+        'end_match_round': lambda: game.ROUND_SIMULATOR.simulate(fixtures, rng.randrange(2 ** 32)),
+        'update_league_table': lambda: game.apply_league_results(table_data, round_results),
+        'top_scorers': lambda: scorers_client.get('/top_scorers'),
+        # Холодный старт: import app в новом интерпретаторе
+        'startup_import': import_app,
+    }
+
+
+def measure(operation):
+    """Лучшее время одной операции в микросекундах"""
+    operation()  # Прогрев: кэши и ленивые структуры не входят в замер
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(MIN_TIME / elapsed) + 1))
+
+    best = elapsed / loops
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best * 1e6
+
+
+def compare(results, baseline, threshold):
+    """Список (имя, было, стало, изменение %) для путей, замедлившихся больше допустимого"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = (current['us'] - previous['us']) / previous['us'] * 100
+        limit = max(threshold, SMALL_CASE_THRESHOLD) if previous['us'] < SMALL_CASE_US else threshold
+        if change > limit:
+            regressions.append((name, previous['us'], current['us'], change))
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description="Микробенчмарки горячих путей")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="файл базовой линии")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="допустимое замедление, %%")
+    parser.add_argument('--output', help="записать результаты в JSON-файл")
+    parser.add_argument('--update-baseline', action='store_true', help="записать результаты как базовую линию")
+    parser.add_argument('--only', nargs='*', help="запустить только эти пути")
+    parser.add_argument('--runs', type=int,
+                        help=f"прогонов набора, в результат идет медиана (по умолчанию {RUNS}, "
+                             f"для --update-baseline - {BASELINE_RUNS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Сессии в памяти: замер не зависит от диска
+    game.app.session_interface = create_session_interface('memory', ttl=3600)
+
+    # Отладочный вывод маршрутов не должен попасть в JSON на stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        cases = build_cases()
+    runs = max(1, args.runs or (BASELINE_RUNS if args.update_baseline else RUNS))
+    timings = {name: [] for name in cases if not args.only or name in args.only}
+    for run in range(runs):
+        for name in timings:
+            timings[name].append(measure(cases[name]))
+            print(f"{name:<24} {timings[name][-1]:>12.2f} мкс"
+                  + (f" (прогон {run + 1}/{runs})" if runs > 1 else ""), file=sys.stderr)
+    results = {name: {'us': round(statistics.median(values), 3)} for name, values in timings.items()}
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'runs': runs,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(report, ensure_ascii=False))
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"базовая линия записана в {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"нет базовой линии {args.baseline}, сравнение пропущено", file=sys.stderr)
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, previous, current, change in regressions:
+        print(f"РЕГРЕССИЯ {name}: {previous:.2f} -> {current:.2f} мкс (+{change:.0f}%)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
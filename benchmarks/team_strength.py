@@ -0,0 +1,72 @@
+"""Сила команд: пересчет оптимального состава на каждый вызов против TeamStrengthCache"""
+import time
+
+import app as game
+from lineup_optimizer import optimal_lineup
+from player_registry import Player
+from team_strength import TeamStrengthCache
+
+CALLS = 2000
+
+
+def lineup_rating_uncached(team_name):
+    """get_starting_lineup_rating без кэша: состав собирается заново"""
+    lineup = optimal_lineup(game.PLAYER_REGISTRY.squad(team_name))
+    return sum(player['rating'] for player in lineup) / len(lineup)
+
+
+def average_rating_uncached(team_name):
+    """Прежний get_team_average_rating"""
+    ratings = [rating for _, rating in game.SQUADS_2007_08[team_name][:18]]
+    return sum(ratings) / len(ratings)
+
+
+def main():
+    teams = game.TEAMS
+    for team in teams:
+        assert game.get_starting_lineup_rating(team) == lineup_rating_uncached(team)
+        assert game.get_team_average_rating(team) == average_rating_uncached(team)
+        # Сила и составы команд ИИ считаются по одному составу
+        lineup = game.build_opponent_lineup(team)
+        assert game.get_starting_lineup_rating(team) == sum(p['rating'] for p in lineup) / len(lineup)
+
+    # Состав меняется только явно: игрок основы +11 к рейтингу виден после
+    # invalidate - средний рейтинг основы +1
+    squads = {team: list(game.PLAYER_REGISTRY.squad(team)) for team in teams[:1]}
+    cache = TeamStrengthCache(lambda team: squads.get(team, ()), optimal_lineup)
+    squad = squads[teams[0]]
+    before = cache.get(teams[0])['xi']
+    starter = optimal_lineup(squad)[0]['id']
+    index = next(i for i, player in enumerate(squad) if player.id == starter)
+    original = squad[index]
+    squad[index] = Player(original.id, original.team, original.name, original.rating + 11,
+                          original.index, original.position)
+    assert cache.get(teams[0])['xi'] == before
+    cache.invalidate(teams[0])
+    assert abs(cache.get(teams[0])['xi'] - (before + 1)) < 1e-9
+    squad[index] = original
+    cache.invalidate()
+    assert cache.get(teams[0])['xi'] == before
+
+    start = time.perf_counter()
+    for i in range(CALLS):
+        lineup_rating_uncached(teams[i % len(teams)])
+    uncached = (time.perf_counter() - start) / CALLS * 1e6
+
+    start = time.perf_counter()
+    for i in range(CALLS):
+        game.get_starting_lineup_rating(teams[i % len(teams)])
+    cached = (time.perf_counter() - start) / CALLS * 1e6
+
+    start = time.perf_counter()
+    for _ in range(CALLS // 20):
+        game.TEAM_STRENGTH.vector(teams)
+    vector = (time.perf_counter() - start) / (CALLS // 20) * 1e6
+
+    print(f"рейтинг состава: пересчет {uncached:.1f} мкс, кэш {cached:.2f} мкс")
+    print(f"вектор рейтингов {len(teams)} команд: {vector:.1f} мкс")
+    print("линии:", {line: round(value, 1) for line, value in game.TEAM_STRENGTH.get(teams[0], '4-3-3').items()})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Гистограмма задержки action=tick: с контекстом матча и с пересборкой составов"""
+import time
+
+import app as game
+from match_engine import new_match_data, play_minute
+
+REQUEST_BUCKETS_US = [500, 1000, 1500, 2000, 3000, 5000]
+CORE_BUCKETS_US = [5, 10, 20, 50, 100, 200]
+
+
+def histogram(samples, buckets):
+    """Раскладывает задержки (в микросекундах) по корзинам"""
+    counts = [0] * (len(buckets) + 1)
+    for value in samples:
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+def print_histogram(title, samples, buckets):
+    samples = sorted(samples)
+    counts = histogram(samples, buckets)
+    print(f"\n{title}: p50={samples[len(samples) // 2]:.1f} мкс, "
+          f"p99={samples[int(len(samples) * 0.99)]:.1f} мкс")
+    labels = [f"<= {b}" for b in buckets] + [f"> {buckets[-1]}"]
+    width = max(counts) or 1
+    for label, count in zip(labels, counts):
+        print(f"  {label:>8} мкс | {'#' * (40 * count // width):<40} {count}")
+
+
+def measure_requests(drop_context, matches=20):
+    """Полный запрос через test client: matches матчей по 90 тиков"""
+    client = game.app.test_client()
+    samples = []
+    for _ in range(matches):
+        client.post('/start_game', data={'team': 'Liverpool'})
+        client.get('/game/3')
+        client.get('/match')
+        for minute in range(1, 91):
+            if drop_context:
+                # Как раньше: составы и оптимальный состав соперника на каждом тике
+                game.MATCH_CONTEXTS.clear()
+            start = time.perf_counter()
+            client.post('/match_action', json={'action': 'tick', 'minute': minute,
+                                               'half': 1 if minute <= 46 else 2})
+            samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def measure_core(rebuild, matches=50):
+    """Только обработка тика, без HTTP и сериализации сессии"""
+    with game.app.test_request_context():
+        game_data = game.generate_game_data('Liverpool')
+    game_data['selected_players'] = game_data['squad'][:11]
+    match_id = game.create_match_context(game_data)['match_id']
+
+    samples = []
+    for _ in range(matches):
+        match_data = new_match_data(game_data['team_name'], game_data['next_opponent'])
+        for minute in range(1, 91):
+            start = time.perf_counter()
+            if rebuild:
+                context = game.create_match_context(game_data)
+                game.drop_match_context(context['match_id'])
+            else:
+                context = game.get_match_context(match_id)
+            play_minute(match_data, minute, 1 if minute <= 46 else 2,
+                        lambda goals, rng: game.select_scorer_from_table(
+                            context['my_team'], context['my_scorers'], goals, rng),
+                        lambda goals, rng: game.select_scorer_from_table(
+                            context['opponent_team'], context['opponent_scorers'], goals, rng))
+            samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    print("== Обработка тика ==")
+    print_histogram("до (пересборка составов)", measure_core(rebuild=True), CORE_BUCKETS_US)
+    print_histogram("после (контекст матча)", measure_core(rebuild=False), CORE_BUCKETS_US)
+    print("\n== Полный запрос /match_action (включая cookie-сессию) ==")
+    print_histogram("до (пересборка составов)", measure_requests(drop_context=True), REQUEST_BUCKETS_US)
+    print_histogram("после (контекст матча)", measure_requests(drop_context=False), REQUEST_BUCKETS_US)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""Журнал карьеры: дописываемый файл вместо перезаписи game_data целиком.
+
+<каталог>/<career_id>.journal - JSON Lines:
+- header - первая строка: команда и время создания (для списка карьер);
+- snapshot - game_data целиком; пишется при старте и каждые
+  snapshot_every туров;
+- delta - событие (end_match, update_lineup, ...) и только изменившиеся
+  ключи game_data ("set") и удаленные ("del"). Если к событию приложены
+  результаты тура ("results"), ключи, которые по ним пересчитываются
+  (таблица, место), не пишутся - при загрузке их заново вычисляет
+  apply_results.
+
+Загрузка - последний snapshot и дельты после него. Изменившиеся ключи
+ищутся по JSON каждого ключа, запомненному с прошлой записи, поэтому на
+диск уходит только разница. Фоновый компактор переписывает журнал, в
+котором больше max_records строк, до header + последний snapshot + хвост.
+Оборванная последняя строка (сбой при записи) при чтении пропускается.
+"""
+import json
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+EXTENSION = '.journal'
+CAREER_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+LOCK_STRIPES = 64  # Блокировки карьер: по хэшу id, чтобы их число не росло
+
+
+def new_career_id():
+    return uuid.uuid4().hex
+
+
+def _encode_keys(game_data):
+    """JSON каждого ключа game_data по отдельности.
+
+    Ключи сортируются: game_data, прошедший через сессию, приходит с другим
+    порядком ключей, и без сортировки неизменившиеся значения отличались бы.
+    """
+    return {
+        key: json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        for key, value in game_data.items()
+    }
+
+
+def _read_records(path):
+    """Записи журнала по порядку; оборванный хвост отбрасывается"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return records
+
+
+def replay(records, apply_results=None):
+    """game_data после последнего snapshot и дельт за ним, тур этого snapshot и его номер в records"""
+    start = max((i for i, record in enumerate(records) if record['kind'] == 'snapshot'), default=None)
+    if start is None:
+        return None, 0, None
+    game_data = dict(records[start]['data'])
+    for record in records[start + 1:]:
+        if record['kind'] == 'delta':
+            if 'results' in record:
+                apply_results(game_data, record['results'])
+            game_data.update(record.get('set', {}))
+            for key in record.get('del', ()):
+                game_data.pop(key, None)
+    return game_data, records[start]['round'], start
+
+
+class _CareerState:
+    """То, что известно о журнале карьеры после последней записи"""
+
+    __slots__ = ('size', 'keys', 'snapshot_round', 'records')
+
+    def __init__(self, size, keys, snapshot_round, records):
+        self.size = size  # Размер файла: если изменился, журнал писал кто-то еще
+        self.keys = keys  # ключ game_data -> JSON
+        self.snapshot_round = snapshot_round
+        self.records = records  # Строк в файле
+
+
+class CareerJournal:
+    """Журналы карьер в папке directory.
+
+    apply_results(game_data, results) учитывает в game_data результаты тура,
+    переданные в record; derived_keys - ключи, которые он пересчитывает.
+    """
+
+    def __init__(self, directory, snapshot_every=5, max_records=60, max_cached=1000,
+                 apply_results=None, derived_keys=()):
+        self.directory = directory
+        self.apply_results = apply_results
+        self.derived_keys = frozenset(derived_keys)
+        self.snapshot_every = snapshot_every
+        self.max_records = max_records
+        self.max_cached = max_cached
+        self._states = OrderedDict()  # career_id -> _CareerState, LRU
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._lock = threading.Lock()
+        self._compact_queue = None
+
+    def path(self, career_id):
+        if not CAREER_ID_RE.match(career_id):
+            raise ValueError(f"Неверный id карьеры: {career_id}")
+        return os.path.join(self.directory, career_id + EXTENSION)
+
+    def _career_lock(self, career_id):
+        return self._locks[hash(career_id) % LOCK_STRIPES]
+
+    def _remember(self, career_id, state):
+        with self._lock:
+            self._states[career_id] = state
+            self._states.move_to_end(career_id)
+            while len(self._states) > self.max_cached:
+                self._states.popitem(last=False)
+
+    def _append(self, path, lines):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+        return os.path.getsize(path)
+
+    def _state(self, career_id, path):
+        """Состояние из кэша, а если файл менялся без нас - заново из журнала"""
+        state = self._states.get(career_id)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        if state is not None and state.size == size:
+            return state
+        records = _read_records(path)
+        game_data, snapshot_round, _ = replay(records, self.apply_results)
+        if game_data is None:
+            return None
+        state = _CareerState(size, _encode_keys(game_data), snapshot_round, len(records))
+        self._remember(career_id, state)
+        return state
+
+    def start(self, career_id, game_data):
+        """Создает журнал карьеры: header и первый snapshot"""
+        with self._career_lock(career_id):
+            return self._start(career_id, game_data)
+
+    def _start(self, career_id, game_data):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(career_id)
+        round_number = game_data.get('current_round', 1)
+        header = {'kind': 'header', 'team': game_data.get('team_name'), 'created': time.time()}
+        keys = _encode_keys(game_data)
+        lines = [json.dumps(header, ensure_ascii=False) + '\n', self._snapshot_line(keys, round_number, 'start')]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(''.join(lines))
+        size = os.path.getsize(path)
+        self._remember(career_id, _CareerState(size, keys, round_number, len(lines)))
+        return size
+
+    def _snapshot_line(self, keys, round_number, event):
+        data = '{' + ','.join(f'{json.dumps(key)}:{value}' for key, value in keys.items()) + '}'
+        return (f'{{"kind":"snapshot","event":{json.dumps(event)},"round":{round_number},'
+                f'"time":{time.time()},"data":{data}}}\n')
+
+    def record(self, career_id, event, game_data, results=None):
+        """Дописывает событие: дельту, а раз в snapshot_every туров - snapshot.
+
+        results - результаты тура для apply_results (вместо derived_keys).
+        Возвращает число записанных байт (0, если game_data не изменился).
+        """
+        path = self.path(career_id)
+        with self._career_lock(career_id):
+            state = self._state(career_id, path)
+            if state is None:
+                # Журнала нет (карьера из старого сохранения) - начинаем новый
+                return self._start(career_id, game_data)
+
+            keys = _encode_keys(game_data)
+            round_number = game_data.get('current_round', 1)
+            # Snapshot раз в snapshot_every туров и в начале нового сезона
+            if round_number >= state.snapshot_round + self.snapshot_every or round_number < state.snapshot_round:
+                line = self._snapshot_line(keys, round_number, event)
+                state.snapshot_round = round_number
+            else:
+                with_results = results is not None and self.apply_results is not None
+                skipped = self.derived_keys if with_results else ()
+                changed = [key for key, value in keys.items() if state.keys.get(key) != value and key not in skipped]
+                removed = [key for key in state.keys if key not in keys]
+                if not changed and not removed and not with_results:
+                    return 0
+                changes = ','.join(f'{json.dumps(key)}:{keys[key]}' for key in changed)
+                extra = f',"results":{json.dumps(results, ensure_ascii=False, separators=(",", ":"))}' if with_results else ''
+                line = (f'{{"kind":"delta","event":{json.dumps(event)},"round":{round_number},'
+                        f'"time":{time.time()}{extra},"set":{{{changes}}},"del":{json.dumps(removed)}}}\n')
+
+            state.size = self._append(path, [line])
+            state.keys = keys
+            state.records += 1
+            self._remember(career_id, state)
+            if state.records > self.max_records:
+                self._schedule_compaction(career_id)
+            return len(line.encode('utf-8'))
+
+    def load(self, career_id):
+        """game_data карьеры из журнала или None"""
+        try:
+            records = _read_records(self.path(career_id))
+        except OSError:
+            return None
+        return replay(records, self.apply_results)[0]
+
+    def compact(self, career_id):
+        """Переписывает журнал: header, последний snapshot и дельты после него"""
+        path = self.path(career_id)
+        with self._career_lock(career_id):
+            try:
+                records = _read_records(path)
+            except OSError:
+                return
+            game_data, snapshot_round, start = replay(records, self.apply_results)
+            if game_data is None:
+                return
+            kept = records[:1] if records[0]['kind'] == 'header' else []
+            kept += records[start:]
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                                for record in kept))
+            os.replace(tmp_path, path)
+            self._remember(career_id, _CareerState(
+                os.path.getsize(path), _encode_keys(game_data), snapshot_round, len(kept)))
+
+    def _schedule_compaction(self, career_id):
+        """Ставит журнал в очередь фонового компактора (поток запускается при первой надобности)"""
+        with self._lock:
+            if self._compact_queue is None:
+                self._compact_queue = queue.Queue()
+                threading.Thread(target=self._compactor, daemon=True, name='career-journal-compactor').start()
+        self._compact_queue.put(career_id)
+
+    def _compactor(self):
+        while True:
+            career_id = self._compact_queue.get()
+            try:
+                self.compact(career_id)
+            except Exception as e:
+                print(f"Error compacting journal {career_id}: {e}")
+            finally:
+                self._compact_queue.task_done()
+
+    def wait_for_compaction(self):
+        """Ждет, пока фоновый компактор разберет очередь"""
+        if self._compact_queue is not None:
+            self._compact_queue.join()
+
+    def careers(self, limit=None):
+        """[(career_id, команда, время последней записи)] - последние limit карьер, новые сначала.
+
+        Заголовки читаются только у отобранных журналов.
+        """
+        journals = []
+        try:
+            scanner = os.scandir(self.directory)
+        except OSError:
+            return []
+        with scanner:
+            for item in scanner:
+                career_id, extension = os.path.splitext(item.name)
+                if extension == EXTENSION and CAREER_ID_RE.match(career_id):
+                    journals.append((item.stat().st_mtime, career_id, item.path))
+        journals.sort(reverse=True)
+
+        careers = []
+        for updated, career_id, path in journals[:limit]:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    header = json.loads(f.readline())
+            except (OSError, ValueError):
+                continue
+            careers.append((career_id, header.get('team'), updated))
+        return careers
@@ -0,0 +1,118 @@
+"""Пакет статических данных (составы, стадионы, логотипы) с ленивой загрузкой.
+
+Исходник пакета - JSON в data/ с полем version. При первой загрузке он
+разбирается и сохраняется снимком marshal в data/__pycache__, имя снимка
+содержит хэш исходника (и версию Python) - правка JSON сама делает старый
+снимок ненужным. В снимке каждый раздел лежит отдельно и распаковывается только при первом
+обращении к нему. Если каталог недоступен для записи (Vercel), снимок
+просто не сохраняется.
+"""
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+from collections.abc import Mapping
+
+PACK_VERSION = 1  # Версия формата пакета, которую понимает этот код
+CACHE_DIR = '__pycache__'
+
+
+class DataPackError(ValueError):
+    """Пакет данных не читается или записан другой версией формата"""
+
+
+def _compile(source):
+    """Разделы пакета из JSON: составы - списки кортежей (имя, рейтинг)"""
+    pack = json.loads(source.decode('utf-8'))
+    if pack.get('version') != PACK_VERSION:
+        raise DataPackError(f"Неизвестная версия пакета данных: {pack.get('version')}")
+    pack['squads'] = {team: [tuple(player) for player in squad] for team, squad in pack['squads'].items()}
+    return pack
+
+
+class DataPack:
+    """Пакет данных из файла path; разделы загружаются при первом обращении"""
+
+    def __init__(self, path):
+        self.path = path
+        self._sections = None  # раздел -> байты marshal
+        self._loaded = {}  # раздел -> распакованное значение
+        self._lock = threading.Lock()
+
+    def _cache_path(self, digest):
+        directory, name = os.path.split(self.path)
+        # Формат marshal зависит от версии Python - она тоже в имени, как у .pyc
+        return os.path.join(directory, CACHE_DIR,
+                            f"{os.path.splitext(name)[0]}.{sys.implementation.cache_tag}.{digest[:16]}.marshal")
+
+    def _load_sections(self):
+        with open(self.path, 'rb') as f:
+            source = f.read()
+        cache_path = self._cache_path(hashlib.sha256(source).hexdigest())
+        try:
+            with open(cache_path, 'rb') as f:
+                return marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        sections = {name: marshal.dumps(value) for name, value in _compile(source).items()}
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(sections, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # Только для чтения - в следующий раз снова разберем JSON
+        return sections
+
+    def section(self, name):
+        """Значение раздела (распаковывается один раз)"""
+        value = self._loaded.get(name)
+        if value is not None:
+            return value
+        with self._lock:
+            if self._sections is None:
+                self._sections = self._load_sections()
+            if name not in self._loaded:
+                if name not in self._sections:
+                    raise DataPackError(f"В пакете {self.path} нет раздела {name}")
+                self._loaded[name] = marshal.loads(self._sections[name])
+            return self._loaded[name]
+
+    def lazy(self, name):
+        """Словарь-раздел, который загрузится при первом обращении"""
+        return LazySection(self, name)
+
+
+class LazySection(Mapping):
+    """Только для чтения: раздел пакета, загружаемый при первом обращении"""
+
+    __slots__ = ('_pack', '_name', '_data')
+
+    def __init__(self, pack, name):
+        self._pack = pack
+        self._name = name
+        self._data = None
+
+    def _get(self):
+        if self._data is None:
+            self._data = self._pack.section(self._name)
+        return self._data
+
+    def __getitem__(self, key):
+        return self._get()[key]
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __len__(self):
+        return len(self._get())
+
+    def __contains__(self, key):
+        return key in self._get()
+
+    def get(self, key, default=None):
+        return self._get().get(key, default)
@@ -0,0 +1,119 @@
+"""Индекс календаря: матч команды в туре за O(1) вместо перебора пар тура.
+
+Календарь - список туров, тур - список пар (хозяева, гости). Индекс хранит
+для каждой команды список по турам: (соперник, дома ли, номер матча в
+туре) или None, если команда в туре не играет. Обратный поиск - тур и
+номер матча по паре (хозяева, гости).
+
+Индексы кэшируются по ключу содержимого календаря: календарь из сессии
+(новый сезон) приходит новым объектом на каждый запрос, но с тем же
+ключом, и индекс строится один раз на процесс.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+MAX_CACHED = 64  # Сколько разных календарей держать в кэше
+
+
+def normalize_schedule(schedule):
+    """Календарь как кортежи: из сессии пары приходят списками"""
+    return tuple(tuple((home, away) for home, away in round_matches) for round_matches in schedule)
+
+
+def _normalized_key(schedule):
+    # Пары через \x1f, матчи через \t, туры через \n - в названиях команд таких символов нет
+    text = '\n'.join('\t'.join(home + '\x1f' + away for home, away in round_matches) for round_matches in schedule)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def schedule_key(schedule):
+    """Ключ содержимого календаря (одинаковый для одинаковых календарей)"""
+    return _normalized_key(normalize_schedule(schedule))
+
+
+class FixtureIndex:
+    """Индекс одного календаря; schedule - тот же календарь кортежами"""
+
+    __slots__ = ('schedule', 'key', '_by_team', '_by_pair')
+
+    def __init__(self, schedule, key=None):
+        self.schedule = normalize_schedule(schedule)
+        self.key = key or _normalized_key(self.schedule)
+        rounds = len(self.schedule)
+        by_team = {}  # команда -> [(соперник, дома ли, номер матча) или None по турам]
+        by_pair = {}  # (хозяева, гости) -> (тур, номер матча)
+        for round_index, round_matches in enumerate(self.schedule):
+            for slot, pair in enumerate(round_matches):
+                home, away = pair
+                for team in pair:
+                    if team not in by_team:
+                        by_team[team] = [None] * rounds
+                by_team[home][round_index] = (away, True, slot)
+                by_team[away][round_index] = (home, False, slot)
+                if pair not in by_pair:
+                    by_pair[pair] = (round_index + 1, slot)
+        self._by_team = by_team
+        self._by_pair = by_pair
+
+    def __len__(self):
+        return len(self.schedule)
+
+    def fixture(self, team_name, round_number):
+        """(соперник, дома ли, номер матча в туре) или None"""
+        team_rounds = self._by_team.get(team_name)
+        if team_rounds is None or not 1 <= round_number <= len(team_rounds):
+            return None
+        return team_rounds[round_number - 1]
+
+    def slot(self, round_number, home, away):
+        """(номер матча в туре, поменяны ли хозяева и гости) для пары или None"""
+        fixture = self.fixture(home, round_number)
+        if fixture is None or fixture[0] != away:
+            return None
+        return fixture[2], not fixture[1]
+
+    def find(self, home, away):
+        """Обратный поиск: (тур, номер матча) первой игры хозяев с гостями или None"""
+        return self._by_pair.get((home, away))
+
+    def other_fixtures(self, round_number, team_name):
+        """Пары тура без матча команды team_name"""
+        if not 1 <= round_number <= len(self.schedule):
+            return []
+        round_matches = self.schedule[round_number - 1]
+        fixture = self.fixture(team_name, round_number)
+        if fixture is None:
+            return list(round_matches)
+        return [pair for slot, pair in enumerate(round_matches) if slot != fixture[2]]
+
+
+class FixtureIndexCache:
+    """Индексы календарей по ключу содержимого, самые старые вытесняются"""
+
+    def __init__(self, max_cached=MAX_CACHED):
+        self.max_cached = max_cached
+        self._indexes = OrderedDict()  # ключ -> FixtureIndex
+        self._by_id = {}  # id(index.schedule) -> FixtureIndex: календари самих индексов без ключа
+        self._lock = threading.Lock()
+
+    def get(self, schedule, key=None):
+        """Индекс календаря. key - ключ из schedule_key, если уже известен"""
+        index = self._by_id.get(id(schedule))
+        if index is not None and index.schedule is schedule:
+            return index
+        if key is None:
+            key = schedule_key(schedule)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+        index = FixtureIndex(schedule, key)
+        with self._lock:
+            index = self._indexes.setdefault(key, index)
+            self._by_id[id(index.schedule)] = index
+            while len(self._indexes) > self.max_cached:
+                _, evicted = self._indexes.popitem(last=False)
+                self._by_id.pop(id(evicted.schedule), None)
+        return index
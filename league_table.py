@@ -0,0 +1,166 @@
+"""Турнирная таблица с инкрементальным обновлением.
+
+Строки таблицы - словари из game_data['table']; LeagueTable меняет их на
+месте. Порядок: очки, разница мячей, забитые мячи (как в АПЛ). При полном
+равенстве команды сохраняют прежний взаимный порядок.
+"""
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+
+def new_table_row(team_name):
+    """Пустая строка таблицы для команды"""
+    return {
+        "team": team_name,
+        "played": 0,
+        "won": 0,
+        "drawn": 0,
+        "lost": 0,
+        "goals_for": 0,
+        "goals_against": 0,
+        "goal_difference": 0,
+        "points": 0
+    }
+
+
+def table_sort_key(row):
+    """Ключ сортировки по возрастанию: лучшие команды в начале"""
+    return (-row['points'], -row['goal_difference'], -row['goals_for'])
+
+
+class LeagueTable:
+    """Обертка над списком строк таблицы с индексом команда -> место"""
+
+    # До скольких результатов за раз переставлять команды по одной
+    SEQUENTIAL_RESULTS = 4
+
+    def __init__(self, rows):
+        self.rows = rows
+        for row in rows:
+            # Таблицы из старых сохранений не знают мячей
+            row.setdefault('goals_for', 0)
+            row.setdefault('goals_against', 0)
+            row['goal_difference'] = row['goals_for'] - row['goals_against']
+
+        keys = [table_sort_key(row) for row in rows]
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            rows.sort(key=table_sort_key)
+
+        self._index = {}
+        for i, row in enumerate(rows):
+            row['position'] = i + 1
+            self._index[row['team']] = i
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, team_name):
+        return team_name in self._index
+
+    def rank(self, team_name):
+        """Место команды (с 1) или None"""
+        index = self._index.get(team_name)
+        return None if index is None else index + 1
+
+    def row(self, team_name):
+        """Строка таблицы команды или None"""
+        index = self._index.get(team_name)
+        return None if index is None else self.rows[index]
+
+    def apply_result(self, home_team, away_team, home_score, away_score):
+        """Учитывает результат матча и переставляет только две команды"""
+        # По одной команде: _reposition ждет, что не на месте только одна строка,
+        # а после перестановки первой место второй берется заново из индекса
+        for team_name, scored, conceded in ((home_team, home_score, away_score),
+                                            (away_team, away_score, home_score)):
+            index = self._update_row(team_name, scored, conceded)
+            if index is not None:
+                self._reposition(index)
+
+    def apply_results(self, results):
+        """Учитывает список результатов в формате round_results"""
+        if len(results) <= self.SEQUENTIAL_RESULTS:
+            for result in results:
+                self.apply_result(result['home_team'], result['away_team'],
+                                  result['home_score'], result['away_score'])
+            return
+
+        # Целый тур: обновляем строки, затем сливаем отсортированные
+        # изменившиеся строки с остальной (уже упорядоченной) таблицей
+        changed = set()
+        for result in results:
+            for index in (self._update_row(result['home_team'], result['home_score'], result['away_score']),
+                          self._update_row(result['away_team'], result['away_score'], result['home_score'])):
+                if index is not None:
+                    changed.add(index)
+        self._merge(changed)
+
+    def _update_row(self, team_name, scored, conceded):
+        # Обновляет статистику строки команды и возвращает ее индекс (None - команды нет)
+        index = self._index.get(team_name)
+        if index is None:
+            return None
+        row = self.rows[index]
+        row['played'] += 1
+        row['won'] += 1 if scored > conceded else 0
+        row['drawn'] += 1 if scored == conceded else 0
+        row['lost'] += 1 if scored < conceded else 0
+        row['goals_for'] += scored
+        row['goals_against'] += conceded
+        row['goal_difference'] = row['goals_for'] - row['goals_against']
+        row['points'] = row['won'] * 3 + row['drawn']
+        return index
+
+    def _merge(self, changed):
+        rows = self.rows
+        if len(changed) * 2 >= len(rows):
+            # Изменилась большая часть таблицы: устойчивая сортировка не медленнее слияния
+            rows.sort(key=table_sort_key)
+            for position, row in enumerate(rows):
+                row['position'] = position + 1
+                self._index[row['team']] = position
+            return
+
+        # sorted() устойчива: равные изменившиеся команды сохраняют прежний порядок
+        moved = sorted(((table_sort_key(rows[i]), rows[i]) for i in sorted(changed)), key=itemgetter(0))
+        stay = [(table_sort_key(row), row) for i, row in enumerate(rows) if i not in changed]
+
+        merged = []
+        i = j = 0
+        while i < len(stay) and j < len(moved):
+            if moved[j][0] < stay[i][0]:
+                merged.append(moved[j][1])
+                j += 1
+            else:
+                merged.append(stay[i][1])
+                i += 1
+        merged.extend(row for _, row in stay[i:])
+        merged.extend(row for _, row in moved[j:])
+
+        for position, row in enumerate(merged):
+            if rows[position] is not row:
+                rows[position] = row
+                row['position'] = position + 1
+                self._index[row['team']] = position
+
+    def _reposition(self, index):
+        # Таблица упорядочена везде, кроме строки index: ищем ей место
+        # двоичным поиском и сдвигаем только строки между старым и новым местом
+        rows = self.rows
+        row = rows[index]
+        key = table_sort_key(row)
+
+        if index > 0 and table_sort_key(rows[index - 1]) > key:
+            # Поднимается: встает после всех команд, которые не хуже
+            target = bisect_right(rows, key, 0, index, key=table_sort_key)
+        elif index + 1 < len(rows) and key > table_sort_key(rows[index + 1]):
+            # Опускается: встает перед всеми командами, которые не лучше
+            target = bisect_left(rows, key, index + 1, len(rows), key=table_sort_key) - 1
+        else:
+            return
+
+        rows.pop(index)
+        rows.insert(target, row)
+        for i in range(min(index, target), max(index, target) + 1):
+            rows[i]['position'] = i + 1
+            self._index[rows[i]['team']] = i
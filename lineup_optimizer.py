@@ -0,0 +1,109 @@
+"""Стартовый состав с наибольшим рейтингом для любой схемы.
+
+Схема ('4-4-2', '4-3-3', '3-5-2', '5-3-2', '4-2-3-1') задает число
+игроков по линиям (parse_formation). В каждой линии берутся игроки с
+наибольшим рейтингом (при равенстве - кто раньше в составе); если в линии
+не хватает игроков, места занимают лучшие из оставшихся полевых, и только
+потом запасные вратари. Одна сортировка на линию - O(n log n).
+
+LineupCache хранит составы по (команда, схема). Составы команд считаются
+неизменными: после изменения состава кэш сбрасывают явно (invalidate).
+"""
+from operator import attrgetter
+
+from player_registry import RECORD_KEYS
+from team_strength import DEFAULT_FORMATION, LINES, parse_formation
+
+LINEUP_SIZE = 11
+# Линия -> код позиции в составе (как в шаблонах и TeamStrengthCache)
+POSITION_CODES = {'GK': 'В', 'DEF': 'З', 'MID': 'П', 'FWD': 'Н'}
+
+_record_fields = attrgetter(*RECORD_KEYS)
+
+
+def _rating(player):
+    return player['rating'] if isinstance(player, dict) else player.rating
+
+
+def _lineup_record(player, code):
+    """Запись состава: словарь игрока с кодом позиции"""
+    if isinstance(player, dict):
+        return {**player, 'position': code}
+    # Запись реестра - поля напрямую, без чтения через __getitem__
+    record = dict(zip(RECORD_KEYS, _record_fields(player)))
+    record['position'] = code
+    return record
+
+
+def best_lineup(players, targets, position_of=attrgetter('position')):
+    """Лучший состав по числу игроков в линиях targets = (GK, DEF, MID, FWD).
+
+    players - записи игроков с ключом 'rating' (Player из реестра или
+    словарь), position_of(игрок) -> линия (GK/DEF/MID/FWD, иначе MID).
+    Возвращает [{**игрок, 'position': код линии}, ...]: вратари,
+    защитники, полузащитники, нападающие, внутри линии - по порядку в составе.
+    """
+    by_line = {line: [] for line in LINES}  # линия -> [(-рейтинг, индекс, игрок)] по порядку в составе
+    for index, player in enumerate(players):
+        line = position_of(player)
+        by_line[line if line in by_line else 'MID'].append((-_rating(player), index, player))
+
+    # Индексы уникальны - кортежи сортируются по рейтингу, затем по месту в составе
+    chosen = set()
+    ranked_lines = []
+    for line, target in zip(LINES, targets):
+        ranked = sorted(by_line[line])
+        chosen.update(index for _, index, _ in ranked[:target])
+        ranked_lines.append((line == 'GK', ranked[target:]))
+
+    missing = LINEUP_SIZE - len(chosen)
+    if missing > 0:
+        # Лучшие из оставшихся: сначала полевые, потом вратари
+        rest = sorted((is_gk, rank, index) for is_gk, ranked in ranked_lines for rank, index, _ in ranked)
+        chosen.update(index for _, _, index in rest[:missing])
+
+    lineup = []
+    for line in LINES:
+        code = POSITION_CODES[line]
+        for _, index, player in by_line[line]:
+            if index in chosen:
+                lineup.append(_lineup_record(player, code))
+    return lineup[:LINEUP_SIZE]
+
+
+def optimal_lineup(players, formation=DEFAULT_FORMATION, position_of=attrgetter('position')):
+    """Лучший состав для схемы formation (строка '4-3-3')"""
+    return best_lineup(players, parse_formation(formation), position_of)
+
+
+class LineupCache:
+    """Составы команд ИИ по схемам.
+
+    squad_of(команда) -> кортеж игроков (PlayerRegistry.squad). Возвращаемые
+    списки - копии, записи игроков в них общие для всех вызовов и не меняются.
+    """
+
+    def __init__(self, squad_of, position_of=attrgetter('position')):
+        self.squad_of = squad_of
+        self.position_of = position_of
+        self._cache = {}  # (команда, схема) -> состав
+
+    def get(self, team_name, formation=DEFAULT_FORMATION):
+        """Лучший состав команды для схемы"""
+        lineup = self._cache.get((team_name, formation))
+        if lineup is None:
+            lineup = optimal_lineup(self.squad_of(team_name), formation, self.position_of)
+            self._cache[(team_name, formation)] = lineup
+        return list(lineup)
+
+    def get_many(self, teams, formation=DEFAULT_FORMATION):
+        """Составы сразу для нескольких команд (например, всех команд тура): {команда: состав}"""
+        return {team: self.get(team, formation) for team in teams}
+
+    def invalidate(self, team_name=None):
+        """Сбрасывает кэш команды (или всех команд) после изменения состава"""
+        if team_name is None:
+            self._cache.clear()
+        else:
+            for key in [key for key in self._cache if key[0] == team_name]:
+                del self._cache[key]
@@ -0,0 +1,151 @@
+"""Движок матча: розыгрыш одной минуты и симуляция всего матча за один вызов.
+
+Вероятности совпадают с тиком /match_action: 12% шанс удара в минуту,
+50% ударов в створ, xG удара в створ 0.08-0.25, шанс гола = xG * 0.4,
+но не больше 8% в минуту и только при накопленном xG больше 0.15.
+"""
+import random
+
+SHOT_CHANCE = 0.12  # Вероятность удара в минуту
+MY_SHOT_SHARE = 0.5  # Доля ударов нашей команды
+ON_TARGET_CHANCE = 0.5  # Доля ударов в створ
+XG_MIN = 0.08
+XG_MAX = 0.25
+GOAL_PROB_PER_XG = 0.4
+MAX_GOAL_PROB = 0.08  # Максимум 8% в минуту
+MIN_XG_FOR_GOAL = 0.15
+POSSESSION_MIN = 30
+POSSESSION_MAX = 70
+
+# Минуты, которые клиент отыгрывает за матч: 1-46 в первом тайме, 47-90 во втором
+FIRST_HALF_MINUTES = range(1, 47)
+SECOND_HALF_MINUTES = range(47, 91)
+
+# Коды событий таймлайна
+EVENT_POSSESSION = 'p'  # ['p', владение нашей команды]
+EVENT_SHOT = 's'  # ['s', сторона, в створ (0/1), прирост xG]
+EVENT_GOAL = 'g'  # ['g', сторона, бомбардир]
+
+SIDE_MY = 0
+SIDE_OPPONENT = 1
+
+
+def new_match_data(my_team, opponent_team):
+    """Создает начальное состояние матча (формат session['match_data'])"""
+    return {
+        'my_team': my_team,
+        'opponent_team': opponent_team,
+        'my_score': 0,
+        'opponent_score': 0,
+        'goals': [],
+        'half': 1,
+        'minute': 0,
+        'possession_my': 50,
+        'possession_opponent': 50,
+        'shots_my': 0,
+        'shots_opponent': 0,
+        'shots_on_target_my': 0,
+        'shots_on_target_opponent': 0,
+        'xg_my': 0.0,
+        'xg_opponent': 0.0
+    }
+
+
+def play_minute(match_data, minute, half, pick_my_scorer, pick_opponent_scorer, rng=None):
+    """Разыгрывает одну минуту матча: изменяет match_data и возвращает список событий.
+
+    pick_my_scorer / pick_opponent_scorer - функции (goals, rng) -> бомбардир
+    (id игрока из реестра или имя).
+    """
+    if rng is None:
+        rng = random
+
+    events = []
+    match_data['minute'] = minute
+    match_data['half'] = half
+
+    # Владение - медленно меняется
+    if minute % 5 == 0:
+        match_data['possession_my'] = max(POSSESSION_MIN, min(POSSESSION_MAX, match_data['possession_my'] + rng.randint(-2, 2)))
+        match_data['possession_opponent'] = 100 - match_data['possession_my']
+        events.append([EVENT_POSSESSION, match_data['possession_my']])
+
+    # Удары
+    if rng.random() < SHOT_CHANCE:
+        if rng.random() < MY_SHOT_SHARE:
+            match_data['shots_my'] += 1
+            if rng.random() < ON_TARGET_CHANCE:
+                xg = round(rng.uniform(XG_MIN, XG_MAX), 2)
+                match_data['shots_on_target_my'] += 1
+                match_data['xg_my'] += xg
+                events.append([EVENT_SHOT, SIDE_MY, 1, xg])
+            else:
+                events.append([EVENT_SHOT, SIDE_MY, 0, 0])
+        else:
+            match_data['shots_opponent'] += 1
+            if rng.random() < ON_TARGET_CHANCE:
+                xg = round(rng.uniform(XG_MIN, XG_MAX), 2)
+                match_data['shots_on_target_opponent'] += 1
+                match_data['xg_opponent'] += xg
+                events.append([EVENT_SHOT, SIDE_OPPONENT, 1, xg])
+            else:
+                events.append([EVENT_SHOT, SIDE_OPPONENT, 0, 0])
+
+    # Голы (вероятность зависит от накопленного xG)
+    goal_prob_my = min(MAX_GOAL_PROB, match_data['xg_my'] * GOAL_PROB_PER_XG)
+    if rng.random() < goal_prob_my and match_data['xg_my'] > MIN_XG_FOR_GOAL:
+        match_data['my_score'] += 1
+        scorer = pick_my_scorer(match_data['goals'], rng) or "Неизвестный игрок"
+        match_data['goals'].append({
+            'team': match_data['my_team'],
+            'scorer': scorer,
+            'minute': minute
+        })
+        match_data['xg_my'] = 0.0  # Сбрасываем после гола
+        events.append([EVENT_GOAL, SIDE_MY, scorer])
+
+    goal_prob_opp = min(MAX_GOAL_PROB, match_data['xg_opponent'] * GOAL_PROB_PER_XG)
+    if rng.random() < goal_prob_opp and match_data['xg_opponent'] > MIN_XG_FOR_GOAL:
+        match_data['opponent_score'] += 1
+        scorer = pick_opponent_scorer(match_data['goals'], rng) or "Неизвестный игрок"
+        match_data['goals'].append({
+            'team': match_data['opponent_team'],
+            'scorer': scorer,
+            'minute': minute
+        })
+        match_data['xg_opponent'] = 0.0
+        events.append([EVENT_GOAL, SIDE_OPPONENT, scorer])
+
+    return events
+
+
+def simulate_match(my_team, opponent_team, pick_my_scorer, pick_opponent_scorer,
+                   tactic='balanced', seed=None, on_minute=None):
+    """Симулирует весь матч за один вызов.
+
+    Возвращает словарь с итоговым состоянием матча ('match_data') и компактным
+    таймлайном: список [минута, [события]] только для минут, где что-то произошло.
+    Один и тот же seed дает один и тот же матч. on_minute(тайм, минута,
+    события, match_data) вызывается после каждой минуты (кадры трансляции).
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    rng = random.Random(seed)
+
+    match_data = new_match_data(my_team, opponent_team)
+    timeline = []
+
+    for half, minutes in ((1, FIRST_HALF_MINUTES), (2, SECOND_HALF_MINUTES)):
+        for minute in minutes:
+            events = play_minute(match_data, minute, half, pick_my_scorer, pick_opponent_scorer, rng)
+            if events:
+                timeline.append([minute, events])
+            if on_minute is not None:
+                on_minute(half, minute, events, match_data)
+
+    return {
+        'seed': seed,
+        'tactic': tactic,
+        'match_data': match_data,
+        'timeline': timeline
+    }
@@ -0,0 +1,94 @@
+"""Трансляция матча через Server-Sent Events.
+
+Матч разыгрывается на сервере целиком один раз (тот же движок и seed, что
+у действия 'simulate'), а поток отдает его по минуте: событие на каждую
+минуту со счетом, ударами, ударами в створ, xG, владением и голами этой
+минуты. id события - минута матча, поэтому переподключение с Last-Event-ID
+продолжает трансляцию со следующей минуты.
+
+После первого тайма поток заканчивается событием half_time. Второй тайм
+начинается, когда клиент вызывает start_second_half и открывает поток
+заново. Пока второй тайм не начат, поток отвечает 204: по стандарту SSE
+браузер после этого не переподключается сам.
+"""
+import json
+import time
+
+from match_engine import FIRST_HALF_MINUTES, SECOND_HALF_MINUTES
+
+RETRY_MS = 1000  # Через сколько браузер переподключается после обрыва
+MINUTE_INTERVAL = 1 / 3  # Секунд на игровую минуту (как таймер клиента: 333 мс)
+LAST_MINUTE = SECOND_HALF_MINUTES[-1]
+HALF_TIME_MINUTE = FIRST_HALF_MINUTES[-1]
+FRAME_KEYS = (
+    'my_score', 'opponent_score', 'shots_my', 'shots_opponent',
+    'shots_on_target_my', 'shots_on_target_opponent',
+    'xg_my', 'xg_opponent', 'possession_my', 'possession_opponent'
+)
+
+
+class FrameRecorder:
+    """on_minute для simulate_match: кадр на каждую минуту.
+
+    Кадр - минута, тайм, поля FRAME_KEYS после минуты и голы этой минуты
+    (бомбардир - имя через scorer_name).
+    """
+
+    def __init__(self, scorer_name=str):
+        self.scorer_name = scorer_name
+        self.frames = []
+
+    def __call__(self, half, minute, events, match_data):
+        frame = {key: match_data[key] for key in FRAME_KEYS}
+        frame['xg_my'] = round(frame['xg_my'], 2)
+        frame['xg_opponent'] = round(frame['xg_opponent'], 2)
+        frame['minute'] = minute
+        frame['half'] = half
+        frame['goals'] = [
+            {**goal, 'scorer': self.scorer_name(goal['scorer'])}
+            for goal in match_data['goals'] if goal['minute'] == minute
+        ]
+        self.frames.append(frame)
+
+
+def format_event(data, event_id=None, event=None):
+    """Одно событие SSE: data - JSON в одну строку"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return '\n'.join(lines) + '\n\n'
+
+
+def resume_minute(last_event_id):
+    """Первая минута трансляции после Last-Event-ID (1, если id нет или он неверный)"""
+    try:
+        return max(1, int(last_event_id) + 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def is_paused(start_minute, second_half_started):
+    """Нечего отдавать: перерыв до start_second_half или матч уже показан"""
+    if start_minute > LAST_MINUTE:
+        return True
+    return start_minute > HALF_TIME_MINUTE and not second_half_started
+
+
+def stream_frames(frames, start_minute, second_half_started, interval=MINUTE_INTERVAL, sleep=time.sleep):
+    """Генератор текста SSE с минуты start_minute до перерыва или конца матча.
+
+    second_half_started() - начат ли второй тайм; проверяется, когда
+    трансляция доходит до перерыва.
+    """
+    yield f"retry: {RETRY_MS}\n\n"
+    for frame in frames[start_minute - 1:]:
+        yield format_event(frame, frame['minute'])
+        if frame['minute'] == HALF_TIME_MINUTE and not second_half_started():
+            yield format_event({'minute': HALF_TIME_MINUTE}, HALF_TIME_MINUTE, 'half_time')
+            return
+        if frame['minute'] < LAST_MINUTE and interval:
+            sleep(interval)
+    yield format_event({'minute': LAST_MINUTE}, LAST_MINUTE, 'full_time')
@@ -0,0 +1,190 @@
+"""Метрики запросов в текстовом формате Prometheus.
+
+- soocer_request_duration_seconds{endpoint} - гистограмма времени запроса
+  целиком, вместе с сохранением сессии (WSGI-обертка вокруг приложения);
+- soocer_match_actions_total{action} - запросы /match_action по действиям
+  и открытые трансляции /match_stream (action="stream");
+- soocer_session_bytes - гистограмма размера сохраняемой сессии (данные
+  серверного хранилища или cookie);
+- soocer_errors_total{endpoint} - ошибки, дошедшие до обработчиков ошибок.
+
+Метрики живут в памяти процесса: при нескольких воркерах у каждого свои,
+Prometheus собирает их с каждого процесса отдельно. Запись - пара
+perf_counter, bisect и инкремент под блокировкой, несколько микросекунд.
+"""
+import copy
+import threading
+import time
+from bisect import bisect_left
+
+from flask import request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Границы корзин: секунды для задержек, байты для сессий
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SESSION_BUCKETS = (256, 1024, 4096, 8192, 16384, 32768, 65536, 131072, 262144)
+ENDPOINT_KEY = 'soocer.endpoint'  # Ключ environ, куда before_request кладет имя маршрута
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label, value, extra=''):
+    parts = []
+    if label:
+        parts.append(f'{label}="{_escape(value)}"')
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    """Счетчик с одной меткой (или без меток, если label=None)"""
+
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=None, amount=1):
+        with self._lock:
+            self._values[value] = self._values.get(value, 0) + amount
+
+    def value(self, value=None):
+        return self._values.get(value, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items(), key=lambda item: str(item[0]))
+        for value, count in items:
+            lines.append(f"{self.name}{_format_labels(self.label, value)} {count}")
+        return lines
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами и одной меткой (или без меток)"""
+
+    def __init__(self, name, help_text, buckets, label=None):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._series = {}  # метка -> [счетчики корзин..., +Inf, сумма]
+        self._lock = threading.Lock()
+
+    def observe(self, amount, value=None):
+        index = bisect_left(self.buckets, amount)
+        with self._lock:
+            series = self._series.get(value)
+            if series is None:
+                series = self._series[value] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += amount
+
+    def count(self, value=None):
+        series = self._series.get(value)
+        return sum(series[:-1]) if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((value, list(series)) for value, series in self._series.items())
+        for value, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                labels = _format_labels(self.label, value, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label, value)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.label, value)} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """Набор метрик приложения"""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            'soocer_request_duration_seconds', "Время обработки запроса", LATENCY_BUCKETS, label='endpoint')
+        self.match_actions = Counter('soocer_match_actions_total', "Запросы /match_action по действиям", label='action')
+        self.session_bytes = Histogram('soocer_session_bytes', "Размер сохраняемой сессии", SESSION_BUCKETS)
+        self.errors = Counter('soocer_errors_total', "Ошибки обработки запросов", label='endpoint')
+
+    def render(self):
+        lines = []
+        for metric in (self.request_duration, self.match_actions, self.session_bytes, self.errors):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class TimingMiddleware:
+    """WSGI-обертка: время запроса целиком по имени маршрута"""
+
+    def __init__(self, wsgi_app, metrics):
+        self.wsgi_app = wsgi_app
+        self.metrics = metrics
+
+    def __call__(self, environ, start_response):
+        start = time.perf_counter()
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            self.metrics.request_duration.observe(
+                time.perf_counter() - start, environ.get(ENDPOINT_KEY) or 'not_found')
+
+
+def _remember_endpoint():
+    request.environ[ENDPOINT_KEY] = request.endpoint
+
+
+def _observe_session_store(store, histogram):
+    """Подменяет store.save так, чтобы он записывал размер данных сессии"""
+    save = store.save
+
+    def save_and_observe(sid, payload):
+        histogram.observe(len(payload))
+        return save(sid, payload)
+
+    store.save = save_and_observe
+
+
+def _observe_session_cookie(interface, histogram):
+    """Подменяет save_session так, чтобы он записывал размер cookie сессии.
+
+    after_request выполняется до сохранения сессии, поэтому размер берем
+    из заголовка Set-Cookie уже после save_session.
+    """
+    save_session = interface.save_session
+
+    def save_and_observe(app, session, response):
+        save_session(app, session, response)
+        prefix = interface.get_cookie_name(app) + '='
+        for header in response.headers.getlist('Set-Cookie'):
+            if header.startswith(prefix):
+                histogram.observe(header.find(';') - len(prefix) if ';' in header else len(header) - len(prefix))
+
+    interface.save_session = save_and_observe
+
+
+def init_app(app, metrics):
+    """Подключает сбор метрик к приложению и маршрут /metrics"""
+    app.before_request(_remember_endpoint)
+    app.wsgi_app = TimingMiddleware(app.wsgi_app, metrics)
+
+    store = getattr(app.session_interface, 'store', None)
+    if store is not None:
+        _observe_session_store(store, metrics.session_bytes)
+    else:
+        # Интерфейс cookie по умолчанию - общий атрибут класса Flask, не трогаем его
+        app.session_interface = copy.copy(app.session_interface)
+        _observe_session_cookie(app.session_interface, metrics.session_bytes)
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return app.response_class(metrics.render(), content_type=CONTENT_TYPE)
+
+    return metrics
@@ -0,0 +1,146 @@
+"""Реестр игроков: неизменяемые записи со стабильными целыми id.
+
+Строится один раз, при первом обращении, из составов (команда -> [(имя, рейтинг)]):
+id - порядковый номер игрока в общем списке всех составов, поэтому он
+один и тот же при каждом запуске, пока не меняется пакет данных. Составы,
+выбранный состав и голы в game_data хранят id, а имя и рейтинг берутся
+из реестра - в сессии и сохранениях вместо словаря на игрока одно число.
+
+Запись игрока читается и как словарь с ключами id, name, rating
+(player['name'], {**player, 'position': ...}) - так ее понимает код,
+который раньше получал словари {'name', 'rating'}.
+"""
+import threading
+
+DEFAULT_RATING = 70
+RECORD_KEYS = ('id', 'name', 'rating')
+
+
+class Player:
+    """Игрок из реестра: id, команда, имя, рейтинг, индекс в составе и позиция"""
+
+    __slots__ = ('id', 'team', 'name', 'rating', 'index', 'position')
+
+    def __init__(self, player_id, team, name, rating, index, position):
+        for slot, value in zip(self.__slots__, (player_id, team, name, rating, index, position)):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Игрок {self.name} неизменяемый")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Игрок {self.name} неизменяемый")
+
+    def __repr__(self):
+        return f"Player({self.id}, {self.team!r}, {self.name!r}, {self.rating})"
+
+    # Чтение как словаря {'id', 'name', 'rating'}
+    def keys(self):
+        return RECORD_KEYS
+
+    def __getitem__(self, key):
+        if key not in RECORD_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in RECORD_KEYS else default
+
+
+class PlayerRegistry:
+    """Все игроки составов squads. classify(имя, индекс) -> позиция (GK/DEF/MID/FWD).
+
+    Записи строятся при первом обращении к реестру, а не при создании:
+    импорт app не платит за реестр, пока он не нужен.
+    """
+
+    # Атрибуты, которые появляются после построения реестра
+    _BUILT = ('_players', '_squads', '_ids', 'positions', 'name_indexes')
+
+    def __init__(self, squads, classify):
+        self._source = (squads, classify)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Вызывается, только пока атрибута нет: первое обращение строит реестр
+        if name not in self._BUILT:
+            raise AttributeError(name)
+        with self._lock:
+            if '_source' in self.__dict__:
+                self._build(*self._source)
+                del self._source
+        return self.__dict__[name]
+
+    def _build(self, squads, classify):
+        players = []
+        squad_players = {}
+        for team, squad in squads.items():
+            members = []
+            for index, player_data in enumerate(squad):
+                if isinstance(player_data, tuple):
+                    name, rating = player_data
+                else:
+                    name, rating = player_data, DEFAULT_RATING
+                player = Player(len(players), team, name, rating, index, classify(name, index))
+                players.append(player)
+                members.append(player)
+            squad_players[team] = tuple(members)
+
+        self._players = tuple(players)
+        self._squads = squad_players
+        # Имя в составе может повторяться - id по имени берется у первого
+        self._ids = {}
+        for player in reversed(self._players):
+            self._ids[(player.team, player.name)] = player.id
+        # (команда, индекс в составе) -> позиция и команда -> {имя: индекс в составе}
+        # (при повторе имени - индекс последнего)
+        self.positions = {}
+        self.name_indexes = {}
+        for player in self._players:
+            self.positions[(player.team, player.index)] = player.position
+            self.name_indexes.setdefault(player.team, {})[player.name] = player.index
+
+    def __len__(self):
+        return len(self._players)
+
+    def __iter__(self):
+        return iter(self._players)
+
+    def __getitem__(self, player_id):
+        return self._players[player_id]
+
+    def squad(self, team_name):
+        """Игроки команды в порядке состава (пустой кортеж для неизвестной команды)"""
+        return self._squads.get(team_name, ())
+
+    def id_of(self, team_name, player_name):
+        """id игрока по команде и имени или None"""
+        return self._ids.get((team_name, player_name))
+
+    def resolve(self, team_name, entry):
+        """Игрок по записи из game_data: id, имя или словарь {'name', 'rating'}.
+
+        Игроки не из реестра (случайные имена для неизвестной команды)
+        возвращаются словарем как есть.
+        """
+        if isinstance(entry, int):
+            return self._players[entry]
+        name = entry.get('name') if isinstance(entry, dict) else entry
+        player_id = self._ids.get((team_name, name))
+        if player_id is not None:
+            return self._players[player_id]
+        return entry if isinstance(entry, dict) else {'name': name, 'rating': DEFAULT_RATING}
+
+    def key_of(self, team_name, entry):
+        """Ключ игрока для game_data: id из реестра, для игроков не из реестра - имя"""
+        if isinstance(entry, int):
+            return entry
+        name = entry.get('name') if isinstance(entry, dict) else entry
+        player_id = self._ids.get((team_name, name))
+        return name if player_id is None else player_id
+
+    def name(self, entry):
+        """Имя для показа: по id из реестра, строка - как есть"""
+        if isinstance(entry, int) and 0 <= entry < len(self._players):
+            return self._players[entry].name
+        return entry
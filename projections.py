@@ -0,0 +1,188 @@
+"""Прогноз итогов сезона методом Монте-Карло.
+
+Оставшиеся матчи разыгрываются пачками сезонов на NumPy: голы команды -
+пуассоновская величина со средним BASE_GOALS (как у randint(0, 3) в
+остальных матчах тура), которое растет или падает с разницей рейтингов
+стартовых составов. Места считаются как в LeagueTable: очки, разница
+мячей, забитые мячи, при равенстве - текущий порядок в таблице.
+Пачки раздаются процессам ProcessPoolExecutor: один общий пул создается
+при первом прогнозе и переиспользуется всеми запросами до выхода.
+"""
+import atexit
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+BASE_GOALS = 1.5  # Среднее число голов команды за матч
+RATING_SCALE = 0.05  # Во сколько раз (экспонента) меняются голы на 1 пункт рейтинга
+TOP_PLACES = 4
+RELEGATION_PLACES = 3
+BATCH_SEASONS = 1000  # Сезонов в одной пачке NumPy
+MAX_GOALS = 12  # Голы сверх этого числа отбрасываются (вероятность < 1e-5)
+
+
+def build_inputs(table, fixtures, ratings):
+    """Готовит массивы для симуляции.
+
+    table - строки турнирной таблицы по порядку мест, fixtures - оставшиеся
+    матчи [(хозяева, гости), ...], ratings - рейтинги команд в порядке
+    строк table.
+    """
+    teams = [row['team'] for row in table]
+    team_ids = {team: i for i, team in enumerate(teams)}
+    fixtures = [(home, away) for home, away in fixtures if home in team_ids and away in team_ids]
+
+    home = np.array([team_ids[h] for h, _ in fixtures], dtype=np.int64)
+    away = np.array([team_ids[a] for _, a in fixtures], dtype=np.int64)
+    team_ratings = np.asarray(ratings, dtype=float)
+    difference = team_ratings[home] - team_ratings[away]
+    home_rate = BASE_GOALS * np.exp(RATING_SCALE * difference)
+    away_rate = BASE_GOALS * np.exp(-RATING_SCALE * difference)
+
+    return {
+        'teams': teams,
+        'points': np.array([row['points'] for row in table], dtype=np.int64),
+        'goal_difference': np.array([row.get('goals_for', 0) - row.get('goals_against', 0) for row in table], dtype=np.int64),
+        'goals_for': np.array([row.get('goals_for', 0) for row in table], dtype=np.int64),
+        'home_cdf': poisson_cdf(home_rate),
+        'away_cdf': poisson_cdf(away_rate),
+        'home_matrix': incidence_matrix(home, len(teams)),
+        'away_matrix': incidence_matrix(away, len(teams))
+    }
+
+
+def poisson_cdf(rates):
+    """Таблица P(X <= k) для k = 0..MAX_GOALS-1, строка на матч (float32)"""
+    k = np.arange(MAX_GOALS)
+    factorials = np.array([math.factorial(i) for i in k], dtype=float)
+    pmf = np.exp(-rates[:, None]) * rates[:, None] ** k / factorials
+    return np.cumsum(pmf, axis=1).T.astype(np.float32)
+
+
+def incidence_matrix(team_ids, team_count):
+    """Матрица матч -> команда: сумма по матчам команды одним умножением"""
+    matrix = np.zeros((len(team_ids), team_count))
+    matrix[np.arange(len(team_ids)), team_ids] = 1
+    return matrix
+
+
+def draw_goals(cdf, seasons, rng):
+    """Пуассоновские голы обратной функцией распределения: быстрее rng.poisson"""
+    draws = rng.random((seasons, cdf.shape[1]), dtype=np.float32)
+    goals = np.zeros(draws.shape, dtype=np.int8)
+    for level in cdf:
+        goals += draws > level
+    return goals
+
+
+def simulate_batch(inputs, seasons, rng):
+    """Разыгрывает seasons сезонов сразу.
+
+    Возвращает счетчики мест (title, top, relegation) и сумму очков по командам.
+    """
+    team_count = len(inputs['teams'])
+    home_goals = draw_goals(inputs['home_cdf'], seasons, rng)
+    away_goals = draw_goals(inputs['away_cdf'], seasons, rng)
+    home_points = np.where(home_goals > away_goals, 3.0, np.where(home_goals == away_goals, 1.0, 0.0))
+    away_points = np.where(away_goals > home_goals, 3.0, np.where(home_goals == away_goals, 1.0, 0.0))
+    home_goals = home_goals.astype(float)
+    away_goals = away_goals.astype(float)
+    home_matrix, away_matrix = inputs['home_matrix'], inputs['away_matrix']
+
+    # Суммы по командам - умножения в float (BLAS), результаты целые
+    points = inputs['points'] + (home_points @ home_matrix + away_points @ away_matrix).astype(np.int64)
+    scored = (home_goals @ home_matrix + away_goals @ away_matrix).astype(np.int64)
+    conceded = (home_goals @ away_matrix + away_goals @ home_matrix).astype(np.int64)
+    goals_for = inputs['goals_for'] + scored
+    goal_difference = inputs['goal_difference'] + scored - conceded
+
+    # Один целочисленный ключ: очки, разница, забитые, затем текущее место
+    key = points
+    for column, span in ((goal_difference, 4096), (goals_for, 4096)):
+        key = key * span + np.clip(column + span // 2, 0, span - 1)
+    key = key * team_count + (team_count - 1 - np.arange(team_count))
+    order = np.argsort(-key, axis=1)
+
+    title = np.bincount(order[:, 0], minlength=team_count)
+    top = np.bincount(order[:, :TOP_PLACES].ravel(), minlength=team_count)
+    relegation = np.bincount(order[:, team_count - RELEGATION_PLACES:].ravel(), minlength=team_count)
+    return title, top, relegation, points.sum(axis=0)
+
+
+def _simulate_chunk(inputs, seasons, seed_sequence):
+    # Задача одного процесса: несколько пачек по BATCH_SEASONS
+    rng = np.random.default_rng(seed_sequence)
+    totals = None
+    while seasons > 0:
+        batch = min(seasons, BATCH_SEASONS)
+        result = simulate_batch(inputs, batch, rng)
+        totals = result if totals is None else tuple(a + b for a, b in zip(totals, result))
+        seasons -= batch
+    return totals
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor(workers):
+    """Общий пул процессов: создается при первом вызове на workers процессов"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def shutdown_executor():
+    """Останавливает общий пул (при выходе или после падения процесса пула)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_executor)
+
+
+def project_season(table, fixtures, ratings, seasons=10000, workers=None, seed=None, executor=None):
+    """Прогноз итогов сезона по seasons симуляциям оставшихся матчей.
+
+    workers - число пачек для процессов (по умолчанию - число ядер; 1 - без
+    пула), executor - свой пул процессов вместо общего.
+    Возвращает словарь команда -> {'title', 'top4', 'relegation',
+    'expected_points'}; вероятности от 0 до 1.
+    """
+    inputs = build_inputs(table, fixtures, ratings)
+    workers = max(1, min(workers or os.cpu_count() or 1, seasons))
+
+    # Независимые потоки случайных чисел для каждого процесса
+    chunks = [seasons // workers + (1 if i < seasons % workers else 0) for i in range(workers)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(workers)
+
+    if workers == 1:
+        results = [_simulate_chunk(inputs, chunks[0], seed_sequences[0])]
+    else:
+        pool = executor or shared_executor(workers)
+        try:
+            results = list(pool.map(_simulate_chunk, [inputs] * workers, chunks, seed_sequences))
+        except BrokenProcessPool:
+            if executor is None:
+                shutdown_executor()  # Следующий прогноз создаст пул заново
+            raise
+
+    title, top, relegation, points = (sum(values) for values in zip(*results))
+    return {
+        team: {
+            'title': float(title[i]) / seasons,
+            'top4': float(top[i]) / seasons,
+            'relegation': float(relegation[i]) / seasons,
+            'expected_points': float(points[i]) / seasons
+        }
+        for i, team in enumerate(inputs['teams'])
+    }
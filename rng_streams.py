@@ -0,0 +1,36 @@
+"""Воспроизводимые потоки случайных чисел.
+
+У каждой карьеры есть seed; из него и меток (назначение, тур, матч...)
+выводятся независимые генераторы random.Random и np.random.Generator.
+Одинаковые seed и метки дают одинаковую последовательность в любом
+процессе (встроенный hash() строк для этого не годится - он
+рандомизирован, поэтому используется blake2b).
+"""
+import hashlib
+import random
+import secrets
+
+SEED_BITS = 63
+
+
+def new_career_seed():
+    """Случайный seed новой карьеры"""
+    return secrets.randbits(SEED_BITS)
+
+
+def derive_seed(seed, *labels):
+    """Seed потока для (seed, метки...): целое от 0 до 2**63"""
+    key = '|'.join(str(part) for part in (seed,) + labels).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big') >> (64 - SEED_BITS)
+
+
+def stream(seed, *labels):
+    """Генератор random.Random для (seed, метки...)"""
+    return random.Random(derive_seed(seed, *labels))
+
+
+def numpy_stream(seed, *labels):
+    """Генератор np.random.Generator для (seed, метки...)"""
+    import numpy as np  # NumPy загружается с первым туром, а не при импорте
+
+    return np.random.default_rng(derive_seed(seed, *labels))
@@ -0,0 +1,99 @@
+"""Векторная симуляция остальных матчей тура на NumPy.
+
+Все счета, минуты голов и бомбардиры тура разыгрываются одним проходом:
+для каждой команды заранее хранится вектор кумулятивных вероятностей
+забить гол по игрокам состава, а выбор бомбардира - сравнение случайного
+числа с этим вектором. Распределения совпадают с прежним циклом в
+end_match: счет 0-3 у каждой команды, минута 1-90, бомбардир - случайный
+полевой игрок (или любой игрок, если в составе одни вратари).
+"""
+import numpy as np
+
+MAX_GOALS = 3  # Максимум голов команды в матче
+LAST_MINUTE = 90
+
+
+class RoundSimulator:
+    """Симулятор тура для фиксированного набора составов.
+
+    squads - словарь команда -> [(игрок, вес), ...], игрок (id или имя)
+    попадает в голы как бомбардир; вероятность забить пропорциональна весу. Команды с нулевой суммой весов выбирают
+    бомбардира равновероятно.
+    """
+
+    def __init__(self, squads, max_goals=MAX_GOALS):
+        self.max_goals = max_goals
+        self.teams = list(squads)
+        self.team_ids = {team: i for i, team in enumerate(self.teams)}
+        self.scorers = [[player for player, _ in squads[team]] for team in self.teams]
+
+        width = max((len(scorers) for scorers in self.scorers), default=0) or 1
+        # Хвост строки заполнен значением больше 1 - туда случайное число не попадает
+        self._cumulative = np.full((len(self.teams), width), 2.0)
+        self._last = np.zeros(len(self.teams), dtype=np.int64)
+        for i, team in enumerate(self.teams):
+            weights = np.array([weight for _, weight in squads[team]], dtype=float)
+            if not len(weights):
+                continue
+            if weights.sum() <= 0:
+                weights = np.ones(len(weights))
+            self._cumulative[i, :len(weights)] = np.cumsum(weights) / weights.sum()
+            self._last[i] = len(weights) - 1
+
+    def simulate(self, fixtures, rng=None, sides=None):
+        """Разыгрывает матчи [(хозяева, гости), ...] и возвращает результаты
+        в формате round_results (голы хозяев, затем голы гостей).
+
+        rng - np.random.Generator, целый seed или None. sides - те же матчи
+        массивом (матчи × 2) индексов команд в self.teams (тур из
+        Schedule.array, если календарь построен по тем же командам) -
+        тогда индексы команд не ищутся по названиям.
+        """
+        rng = np.random.default_rng(rng)
+        if not fixtures:
+            return []
+
+        scores = rng.integers(0, self.max_goals + 1, size=(len(fixtures), 2))
+        if sides is None:
+            sides = np.array([[self.team_ids.get(home, -1), self.team_ids.get(away, -1)]
+                              for home, away in fixtures], dtype=np.int64)
+        else:
+            sides = np.asarray(sides, dtype=np.int64)
+
+        # Один гол - одна строка: команда, минута, случайное число для бомбардира
+        goal_teams = np.repeat(sides.ravel(), scores.ravel())
+        minutes = rng.integers(1, LAST_MINUTE + 1, size=len(goal_teams))
+        draws = rng.random(len(goal_teams))
+
+        known = np.maximum(goal_teams, 0)
+        picks = (self._cumulative[known] <= draws[:, None]).sum(axis=1)
+        picks = np.minimum(picks, self._last[known])
+
+        scores = scores.tolist()
+        goal_teams = goal_teams.tolist()
+        minutes = minutes.tolist()
+        picks = picks.tolist()
+
+        results = []
+        goal = 0
+        for (home, away), (home_score, away_score) in zip(fixtures, scores):
+            goals = []
+            for team_name, count in ((home, home_score), (away, away_score)):
+                for _ in range(count):
+                    team_id = goal_teams[goal]
+                    if team_id >= 0 and self.scorers[team_id]:
+                        scorer = self.scorers[team_id][picks[goal]]
+                    else:
+                        scorer = f"Игрок {team_name}"
+                    goals.append({'team': team_name, 'scorer': scorer, 'minute': minutes[goal]})
+                    goal += 1
+
+            results.append({
+                'home_team': home,
+                'away_team': away,
+                'home_score': home_score,
+                'away_score': away_score,
+                'goals': goals,
+                'is_user_match': False
+            })
+        return results
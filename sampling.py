@@ -0,0 +1,57 @@
+"""Выбор элемента по целочисленным весам: кумулятивные суммы + bisect."""
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class WeightedSampler:
+    """Взвешенный выбор из фиксированного списка элементов.
+
+    Веса целые и неотрицательные. Выбор с весами w эквивалентен
+    rng.choice() из списка, где каждый элемент повторен w раз, включая
+    одинаковую последовательность случайных чисел, но без создания списка.
+    """
+
+    __slots__ = ('items', 'weights', '_cumulative')
+
+    def __init__(self, items, weights):
+        self.items = list(items)
+        self.weights = [int(w) for w in weights]
+        if len(self.items) != len(self.weights):
+            raise ValueError("items и weights должны быть одной длины")
+        self._cumulative = list(accumulate(self.weights))
+
+    @property
+    def total(self):
+        """Сумма весов"""
+        return self._cumulative[-1] if self._cumulative else 0
+
+    def set_weight(self, index, weight):
+        """Меняет вес одного элемента, пересчитывая суммы только после него"""
+        delta = int(weight) - self.weights[index]
+        if not delta:
+            return
+        self.weights[index] += delta
+        cumulative = self._cumulative
+        for i in range(index, len(cumulative)):
+            cumulative[i] += delta
+
+    def sample(self, rng=None, adjust=None):
+        """Возвращает элемент с вероятностью, пропорциональной весу.
+
+        adjust - необязательная функция вес -> вес, применяемая к каждому
+        весу по порядку перед выбором (например, случайный фактор удачи).
+        Если сумма весов равна нулю, возвращает None.
+        """
+        if rng is None:
+            rng = random
+
+        if adjust is None:
+            cumulative = self._cumulative
+        else:
+            cumulative = list(accumulate(adjust(w) for w in self.weights))
+
+        total = cumulative[-1] if cumulative else 0
+        if total <= 0:
+            return None
+        return self.items[bisect_right(cumulative, rng.randrange(total))]
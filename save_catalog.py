@@ -0,0 +1,149 @@
+"""Каталог сохранений: краткие сведения о каждом сохранении без чтения файлов.
+
+Рядом с сохранениями лежит индекс (.index.json): имя файла -> команда, тур,
+очки, время сохранения и inode файла. Новое сохранение записывается через
+каталог и сразу попадает в индекс. Папка перечитывается (os.scandir, без
+stat каждого файла) только когда изменилось ее mtime - файлы появились,
+пропали или были заменены; заново разбираются лишь файлы с новым именем
+или inode.
+"""
+import json
+import os
+import threading
+from bisect import insort
+
+INDEX_NAME = '.index.json'
+INDEX_VERSION = 2
+# Порядок полей записи индекса; последний - inode файла
+FIELDS = ('team', 'round', 'points', 'timestamp')
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_timestamp(filename):
+    """Время сохранения из имени файла save_YYYYMMDD_HHMMSS.json"""
+    return filename.split('.', 1)[0].replace('save_', '')
+
+
+def save_metadata(filename, game_data):
+    """Сведения о сохранении для списка: [команда, тур, очки, время]"""
+    team_name = game_data.get('team_name', 'Unknown')
+    points = next((row.get('points', 0) for row in game_data.get('table', []) if row.get('team') == team_name), 0)
+    return [team_name, game_data.get('current_round', 1), points, save_timestamp(filename)]
+
+
+class SaveCatalog:
+    """Индекс сохранений в папке directory.
+
+    read_save(path) читает сохранение целиком - нужен только для файлов,
+    которых еще нет в индексе.
+    """
+
+    def __init__(self, directory, read_save=_read_json, extensions=('.json',)):
+        self.directory = directory
+        self.read_save = read_save
+        self.extensions = tuple(extensions)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self._entries = None  # имя файла -> [команда, тур, очки, время, inode]
+        self._order = []  # (время, имя файла) по возрастанию
+        self._dir_mtime = None  # mtime папки, для которого индекс актуален
+        self._lock = threading.Lock()
+
+    def _is_save(self, name):
+        return not name.startswith('.') and name.endswith(self.extensions)
+
+    def _load_index(self):
+        try:
+            index = _read_json(self.index_path)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get('version') != INDEX_VERSION:
+            return {}
+        return index.get('saves', {})
+
+    def _write_index(self):
+        tmp_path = f"{self.index_path}.{threading.get_ident()}.tmp"
+        # json.dumps, а не json.dump: запись в файл идет через медленный кодировщик на Python
+        payload = json.dumps({'version': INDEX_VERSION, 'saves': self._entries},
+                             ensure_ascii=False, separators=(',', ':'))
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.index_path)
+        # Запись индекса сама меняет mtime папки - запоминаем его после нее
+        self._dir_mtime = self._dir_mtime_ns()
+
+    def _dir_mtime_ns(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _rescan(self):
+        """Сверяет индекс с папкой; разбирает только новые и замененные файлы"""
+        old = self._entries if self._entries is not None else self._load_index()
+        entries = {}
+        changed = False
+        try:
+            scanner = os.scandir(self.directory)
+        except OSError:
+            scanner = None
+        if scanner is not None:
+            with scanner:
+                for item in scanner:
+                    if not self._is_save(item.name):
+                        continue
+                    entry = old.get(item.name)
+                    if entry is None or entry[-1] != item.inode():
+                        try:
+                            game_data = self.read_save(item.path)
+                        except (OSError, ValueError):
+                            continue  # Поврежденное сохранение в список не попадает
+                        entry = save_metadata(item.name, game_data) + [item.inode()]
+                        changed = True
+                    entries[item.name] = entry
+
+        self._entries = entries
+        self._order = sorted((entry[3], name) for name, entry in entries.items())
+        if scanner is not None and (changed or len(entries) != len(old) or not os.path.exists(self.index_path)):
+            self._write_index()
+        else:
+            self._dir_mtime = self._dir_mtime_ns()
+
+    def _refresh(self):
+        if self._entries is None or self._dir_mtime_ns() != self._dir_mtime:
+            self._rescan()
+
+    def add(self, filename, game_data, write):
+        """Записывает сохранение функцией write(path) и добавляет его в индекс"""
+        with self._lock:
+            self._refresh()
+            path = os.path.join(self.directory, filename)
+            write(path)
+            if filename in self._entries:
+                self._order.remove((self._entries[filename][3], filename))
+            self._entries[filename] = save_metadata(filename, game_data) + [os.stat(path).st_ino]
+            insort(self._order, (self._entries[filename][3], filename))
+            self._write_index()
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def page(self, page=1, per_page=20):
+        """Сохранения страницы page (с 1, новые сначала), номер страницы и число страниц"""
+        with self._lock:
+            self._refresh()
+            total = len(self._entries)
+            pages = max(1, (total + per_page - 1) // per_page)
+            page = min(max(1, page), pages)
+            # _order по возрастанию, страница 1 - его хвост
+            end = total - (page - 1) * per_page
+            saves = [
+                dict(zip(FIELDS, self._entries[name]), filename=name)
+                for _, name in reversed(self._order[max(0, end - per_page):end])
+            ]
+        return saves, page, pages
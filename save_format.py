@@ -0,0 +1,101 @@
+"""Формат файлов сохранений.
+
+Файл .sav: заголовок из 12 байт (сигнатура SOOCER, версия формата, способ
+сжатия, CRC32 тела) и тело - компактный JSON game_data, при желании
+сжатый gzip или lzma. Запись атомарная: во временный файл рядом, fsync,
+затем os.replace - оборванная запись не портит прежнее сохранение.
+read_save читает и новый формат, и старые сохранения (JSON с отступами).
+"""
+import gzip
+import json
+import lzma
+import os
+import struct
+import threading
+import zlib
+
+MAGIC = b'SOOCER'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('>6sBBI')  # сигнатура, версия, сжатие, CRC32 тела
+EXTENSION = '.sav'
+
+# Способ сжатия -> (код в заголовке, сжать, распаковать)
+COMPRESSIONS = {
+    'none': (0, lambda data: data, lambda data: data),
+    'gzip': (1, lambda data: gzip.compress(data, compresslevel=6, mtime=0), gzip.decompress),
+    'lzma': (2, lzma.compress, lzma.decompress),
+}
+COMPRESSION_BY_CODE = {code: (name, decompress) for name, (code, _, decompress) in COMPRESSIONS.items()}
+
+
+class SaveFormatError(ValueError):
+    """Файл сохранения поврежден или записан неизвестной версией формата"""
+
+
+def encode_save(game_data, compression='gzip'):
+    """Байты файла сохранения для game_data"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Неизвестный способ сжатия: {compression}")
+    code, compress, _ = COMPRESSIONS[compression]
+    body = compress(json.dumps(game_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return HEADER.pack(MAGIC, FORMAT_VERSION, code, zlib.crc32(body)) + body
+
+
+def _load_game_data(data):
+    # JSONDecodeError и UnicodeDecodeError - подклассы ValueError
+    try:
+        game_data = json.loads(data.decode('utf-8'))
+    except ValueError as e:
+        raise SaveFormatError(f"Поврежденные данные сохранения: {e}") from e
+    if not isinstance(game_data, dict):
+        raise SaveFormatError("В сохранении нет данных игры")
+    return game_data
+
+
+def decode_save(data):
+    """game_data из байтов файла: новый формат или старый JSON.
+
+    Любое повреждение (в том числе обрезанный или испорченный старый JSON) -
+    SaveFormatError.
+    """
+    if not data.startswith(MAGIC):
+        # Старое сохранение - JSON с отступами
+        return _load_game_data(data)
+    if len(data) < HEADER.size:
+        raise SaveFormatError("Обрезанный заголовок сохранения")
+    _, version, code, crc = HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise SaveFormatError(f"Неизвестная версия формата сохранения: {version}")
+    if code not in COMPRESSION_BY_CODE:
+        raise SaveFormatError(f"Неизвестный способ сжатия: {code}")
+    body = data[HEADER.size:]
+    if zlib.crc32(body) != crc:
+        raise SaveFormatError("Контрольная сумма сохранения не совпадает")
+    _, decompress = COMPRESSION_BY_CODE[code]
+    try:
+        body = decompress(body)
+    except (OSError, EOFError, lzma.LZMAError) as e:
+        raise SaveFormatError(f"Не удалось распаковать сохранение: {e}") from e
+    return _load_game_data(body)
+
+
+def write_save(path, game_data, compression='gzip'):
+    """Атомарно записывает сохранение в path"""
+    data = encode_save(game_data, compression)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_save(path):
+    """Читает сохранение любого формата; SaveFormatError, если файл поврежден"""
+    with open(path, 'rb') as f:
+        return decode_save(f.read())
@@ -0,0 +1,134 @@
+"""Круговой календарь для лиги любого размера.
+
+Туры строятся методом круга: одна команда стоит на месте, остальные
+сдвигаются по кругу. При нечетном числе команд добавляется пустое место -
+его соперник в этом туре отдыхает. Хозяева выбираются так, чтобы у каждой
+команды было не больше двух домашних или гостевых матчей подряд; второй
+круг - зеркало первого со сдвигом на тур, чтобы ответный матч не шел сразу
+за первым.
+
+seed перемешивает порядок команд перед построением; без seed команды
+берутся в переданном порядке. Календари кэшируются по (команды, seed,
+число кругов), поэтому новый сезон с тем же seed не строится заново.
+"""
+from functools import lru_cache
+
+from fixture_index import schedule_key
+from rng_streams import stream
+
+MAX_CACHED = 128  # Сколько разных календарей держать в кэше
+
+
+class Schedule:
+    """Календарь: rounds - туры кортежами пар (хозяева, гости),
+    array - те же туры массивом (туры × матчи × 2) индексов команд в teams
+    (строится при первом обращении), key - ключ содержимого (как schedule_key)."""
+
+    __slots__ = ('teams', 'seed', 'rounds', 'key', '_array')
+
+    def __init__(self, teams, seed, rounds):
+        self.teams = teams
+        self.seed = seed
+        self.rounds = rounds
+        self.key = schedule_key(rounds)
+        self._array = None
+
+    @property
+    def array(self):
+        if self._array is None:
+            # NumPy нужен только симуляторам - календарь строится и без него
+            import numpy as np
+
+            team_ids = {team: i for i, team in enumerate(self.teams)}
+            fixtures = max((len(round_matches) for round_matches in self.rounds), default=0)
+            # Туры короче остальных (только в вырожденных календарях) дополняются -1
+            array = np.array([
+                [(team_ids[home], team_ids[away]) for home, away in round_matches]
+                + [(-1, -1)] * (fixtures - len(round_matches))
+                for round_matches in self.rounds
+            ], dtype=np.int16).reshape(len(self.rounds), fixtures, 2)
+            array.flags.writeable = False
+            self._array = array
+        return self._array
+
+    def __len__(self):
+        return len(self.rounds)
+
+    def __getitem__(self, round_index):
+        return self.rounds[round_index]
+
+    def __iter__(self):
+        return iter(self.rounds)
+
+
+def balanced_leg(teams):
+    """Один круг (четное число мест): пары меняют хозяина через тур"""
+    count = len(teams)
+    fixed = teams[-1]
+    circle = teams[:-1]
+    size = len(circle)
+    rounds = []
+    for round_index in range(size):
+        home, away = circle[round_index], fixed
+        round_matches = [(home, away) if round_index % 2 == 0 else (away, home)]
+        for offset in range(1, count // 2):
+            first = circle[(round_index + offset) % size]
+            second = circle[(round_index - offset) % size]
+            round_matches.append((first, second) if offset % 2 == 0 else (second, first))
+        rounds.append(round_matches)
+    return rounds
+
+
+def simple_leg(teams):
+    """Один круг без чередования хозяев - как прежний generate_full_schedule
+    (первая команда всегда дома в первом круге)"""
+    fixed, rotating = teams[0], teams[1:]
+    rounds = []
+    for _ in range(len(rotating)):
+        round_matches = [(rotating[i], rotating[-2 - i]) for i in range(len(teams) // 2 - 1)]
+        round_matches.append((fixed, rotating[-1]))
+        rounds.append(round_matches)
+        rotating = [rotating[-1]] + rotating[:-1]
+    return rounds
+
+
+@lru_cache(maxsize=MAX_CACHED)
+def _build(teams, seed, legs, balanced):
+    if len(set(teams)) != len(teams):
+        raise ValueError("Команды в календаре повторяются")
+    order = list(teams)
+    if seed is not None:
+        stream(seed, 'schedule').shuffle(order)
+    if len(order) % 2:
+        order.append(None)  # Соперник пустого места отдыхает
+
+    if len(order) < 2:
+        leg = []
+    else:
+        leg = balanced_leg(order) if balanced else simple_leg(order)
+    rounds = []
+    for number in range(legs):
+        if not balanced:
+            leg_rounds = leg
+        else:
+            # Каждый следующий круг сдвинут на тур: ответный матч не идет сразу за первым
+            shift = number % len(leg) if leg else 0
+            leg_rounds = leg[shift:] + leg[:shift]
+        if number % 2:
+            leg_rounds = [[(away, home) for home, away in round_matches] for round_matches in leg_rounds]
+        rounds.extend(leg_rounds)
+
+    rounds = tuple(
+        tuple((home, away) for home, away in round_matches if home is not None and away is not None)
+        for round_matches in rounds
+    )
+    return Schedule(teams, seed, rounds)
+
+
+def round_robin(teams, seed=None, legs=2, balanced=True):
+    """Календарь, где каждая команда играет с каждой legs раз.
+
+    balanced=False - прежняя расстановка хозяев (для календарей карьер,
+    начатых до чередования).
+    """
+    return _build(tuple(teams), seed, legs, balanced)
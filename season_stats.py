@@ -0,0 +1,62 @@
+"""Компактная статистика сезона, размер которой не растет с числом матчей.
+
+Состояние - обычный словарь (хранится в сессии):
+- 'goals': {ключ игрока: голы} - не больше, чем игроков в лиге;
+- 'top': [[ключ игрока, голы], ...] - поддерживаемый топ бомбардиров;
+- 'scores': плоский массив фиксированной длины rounds * fixtures * 2
+  со счетом каждого матча сезона (-1 - матч еще не сыгран).
+"""
+
+TOP_SIZE = 20  # Сколько бомбардиров держать в топе
+NOT_PLAYED = -1
+
+
+def new_season_stats(rounds, fixtures, top_size=TOP_SIZE):
+    """Создает пустую статистику сезона из rounds туров по fixtures матчей"""
+    return {
+        'rounds': rounds,
+        'fixtures': fixtures,
+        'top_size': top_size,
+        'goals': {},
+        'top': [],
+        'scores': [NOT_PLAYED] * (rounds * fixtures * 2)
+    }
+
+
+def record_goal(stats, player_key):
+    """Засчитывает гол игроку и поддерживает топ бомбардиров"""
+    goals = stats['goals'].get(player_key, 0) + 1
+    stats['goals'][player_key] = goals
+
+    top = stats['top']
+    for i, entry in enumerate(top):
+        if entry[0] == player_key:
+            entry[1] = goals
+            # Голы только растут - поднимаем игрока вверх, пока он больше соседа
+            while i > 0 and top[i - 1][1] < goals:
+                top[i - 1], top[i] = top[i], top[i - 1]
+                i -= 1
+            return
+
+    if len(top) < stats['top_size'] or goals > top[-1][1]:
+        # Новый игрок в топе: вставляем после всех, у кого голов не меньше
+        i = len(top)
+        while i > 0 and top[i - 1][1] < goals:
+            i -= 1
+        top.insert(i, [player_key, goals])
+        del top[stats['top_size']:]
+
+
+def record_result(stats, round_number, slot, home_score, away_score):
+    """Записывает счет матча slot в туре round_number (туры с 1)"""
+    if not 1 <= round_number <= stats['rounds'] or not 0 <= slot < stats['fixtures']:
+        return
+    offset = ((round_number - 1) * stats['fixtures'] + slot) * 2
+    stats['scores'][offset] = home_score
+    stats['scores'][offset + 1] = away_score
+
+
+def get_top_scorers(stats, limit=None):
+    """Возвращает топ бомбардиров: [(ключ игрока, голы), ...]"""
+    top = stats['top'] if limit is None else stats['top'][:limit]
+    return [(key, goals) for key, goals in top]
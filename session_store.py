@@ -0,0 +1,217 @@
+"""Серверное хранение сессий: в cookie остается только непрозрачный id.
+
+Хранилища:
+- MemorySessionStore - в памяти процесса, LRU + TTL;
+- SQLiteSessionStore - SQLite в режиме WAL, общая для нескольких процессов;
+- FileSessionStore - один файл на сессию, атомарная запись.
+"""
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.sessions import SessionInterface, SessionMixin, session_json_serializer
+from werkzeug.datastructures import CallbackDict
+
+# Формат id сессии (secrets.token_urlsafe) - защищает файловое хранилище от путей в id
+SESSION_ID_RE = re.compile(r'^[A-Za-z0-9_-]{32,64}$')
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Сессия, данные которой лежат на сервере"""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class MemorySessionStore:
+    """Сессии в памяти процесса: не больше max_entries, старые вытесняются"""
+
+    def __init__(self, ttl, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # sid -> (истекает, данные)
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._data[sid]
+                return None
+            self._data.move_to_end(sid)
+            return entry[1]
+
+    def save(self, sid, payload):
+        with self._lock:
+            self._data[sid] = (time.time() + self.ttl, payload)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+
+class SQLiteSessionStore:
+    """Сессии в SQLite (WAL): переживают перезапуск и видны всем процессам"""
+
+    # Как часто (в сохранениях) удалять просроченные сессии
+    PURGE_EVERY = 500
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._saves = 0
+
+    def _connection(self):
+        # Отдельное соединение на поток: sqlite3 не разделяет их между потоками
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            connection.commit()
+            self._local.connection = connection
+        return connection
+
+    def load(self, sid):
+        row = self._connection().execute(
+            "SELECT data FROM sessions WHERE sid = ? AND expires >= ?", (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, sid, payload):
+        connection = self._connection()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)",
+            (sid, payload, now + self.ttl)
+        )
+        self._saves += 1
+        if self._saves % self.PURGE_EVERY == 0:
+            connection.execute("DELETE FROM sessions WHERE expires < ?", (now,))
+        connection.commit()
+
+    def delete(self, sid):
+        connection = self._connection()
+        connection.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        connection.commit()
+
+
+class FileSessionStore:
+    """Сессии в файлах: <каталог>/<sid>.json, запись через временный файл"""
+
+    def __init__(self, directory, ttl):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid):
+        return os.path.join(self.directory, f"{sid}.json")
+
+    def load(self, sid):
+        path = self._path(sid)
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                os.remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def save(self, sid, payload):
+        path = self._path(sid)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def delete(self, sid):
+        try:
+            os.remove(self._path(sid))
+        except OSError:
+            pass
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """SessionInterface Flask, хранящий данные сессии в store"""
+
+    serializer = session_json_serializer
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and SESSION_ID_RE.match(sid):
+            payload = self.store.load(sid)
+            if payload is not None:
+                try:
+                    return ServerSession(self.serializer.loads(payload), sid=sid)
+                except ValueError:
+                    pass
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # Пустая сессия: удаляем данные и cookie
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified or session.new:
+            self.store.save(session.sid, self.serializer.dumps(dict(session)))
+
+        # id сессии не меняется, поэтому cookie ставим только новой сессии
+        # (или при продлении постоянной сессии на каждом запросе)
+        if session.new or (session.permanent and app.config['SESSION_REFRESH_EACH_REQUEST']):
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+def create_session_interface(backend, ttl, path=None):
+    """Создает SessionInterface для backend: 'memory', 'sqlite' или 'file'.
+
+    path - файл базы для 'sqlite' или каталог для 'file'.
+    """
+    if backend == 'memory':
+        store = MemorySessionStore(ttl)
+    elif backend == 'sqlite':
+        store = SQLiteSessionStore(path or 'sessions.db', ttl)
+    elif backend == 'file':
+        store = FileSessionStore(path or 'sessions', ttl)
+    else:
+        raise ValueError(f"Неизвестное хранилище сессий: {backend}")
+    return ServerSideSessionInterface(store)
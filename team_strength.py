@@ -0,0 +1,95 @@
+"""Кэш силы команд: рейтинг стартового состава, средний по составу и по линиям.
+
+Значения считаются один раз на (команда, схема). Составы считаются
+неизменными: если состав команды все же поменялся, кэш сбрасывают явно
+(invalidate) - при чтении состав не сравнивается с прежним.
+"""
+DEFAULT_FORMATION = '4-4-2'
+DEFAULT_RATING = 70
+AVERAGE_SQUAD_SIZE = 18  # Средний рейтинг - по первым 18 игрокам (основа + запас)
+
+# Коды позиций в составе из create_optimal_lineup -> линия
+LINEUP_LINES = {'В': 'GK', 'З': 'DEF', 'П': 'MID', 'Н': 'FWD'}
+LINES = ('GK', 'DEF', 'MID', 'FWD')
+
+
+def parse_formation(formation):
+    """'4-4-2' -> (1, 4, 4, 2); средние линии ('4-2-3-1') складываются в полузащиту"""
+    try:
+        lines = [int(part) for part in formation.split('-')]
+    except (AttributeError, ValueError):
+        raise ValueError(f"Неверная схема: {formation!r}")
+    if len(lines) < 2 or sum(lines) != 10 or min(lines) < 0:
+        raise ValueError(f"Неверная схема: {formation!r}")
+    return 1, lines[0], sum(lines[1:-1]), lines[-1]
+
+
+def player_rating(player_data):
+    """Рейтинг из записи состава: игрок реестра, (имя, рейтинг) или просто имя"""
+    if isinstance(player_data, tuple):
+        return player_data[1]
+    return getattr(player_data, 'rating', DEFAULT_RATING)
+
+
+def _average(ratings, default):
+    return sum(ratings) / len(ratings) if ratings else default
+
+
+class TeamStrengthCache:
+    """Сила команд по составам squad_of(команда) -> игроки (PlayerRegistry.squad).
+
+    build_lineup(squad, formation) - стартовый состав из переданного состава
+    (optimal_lineup): позиции берутся у самих игроков, поэтому сила
+    считается по тому же составу, что и составы команд ИИ.
+    """
+
+    def __init__(self, squad_of, build_lineup):
+        self.squad_of = squad_of
+        self.build_lineup = build_lineup
+        self._cache = {}  # (команда, схема) -> сила
+        self._vectors = {}  # (команды, поле, схема) -> массив NumPy
+
+    def get(self, team_name, formation=DEFAULT_FORMATION):
+        """Словарь {'xi', 'average', 'GK', 'DEF', 'MID', 'FWD'} для команды"""
+        strength = self._cache.get((team_name, formation))
+        if strength is None:
+            strength = self._compute(self.squad_of(team_name), formation)
+            self._cache[(team_name, formation)] = strength
+        return strength
+
+    def vector(self, teams, field='xi', formation=DEFAULT_FORMATION):
+        """Значения field для списка команд одним массивом NumPy (только для чтения)"""
+        key = (tuple(teams), field, formation)
+        values = self._vectors.get(key)
+        if values is None:
+            import numpy as np  # Только для прогнозов - не при импорте
+
+            values = np.array([self.get(team, formation)[field] for team in key[0]], dtype=float)
+            values.flags.writeable = False
+            self._vectors[key] = values
+        return values
+
+    def invalidate(self, team_name=None):
+        """Сбрасывает кэш команды (или всех команд) после изменения состава"""
+        if team_name is None:
+            self._cache.clear()
+            self._vectors.clear()
+        else:
+            for key in [key for key in self._cache if key[0] == team_name]:
+                del self._cache[key]
+            for key in [key for key in self._vectors if team_name in key[0]]:
+                del self._vectors[key]
+
+    def _compute(self, squad, formation):
+        if not squad:
+            return dict.fromkeys(('xi', 'average') + LINES, float(DEFAULT_RATING))
+        average = _average([player_rating(p) for p in squad[:AVERAGE_SQUAD_SIZE]], DEFAULT_RATING)
+
+        lineup = self.build_lineup(squad, formation)
+        xi = _average([player['rating'] for player in lineup], average)
+        strength = {'xi': xi, 'average': average}
+        for line in LINES:
+            strength[line] = _average(
+                [player['rating'] for player in lineup if LINEUP_LINES.get(player.get('position')) == line], xi
+            )
+        return strength